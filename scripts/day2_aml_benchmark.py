@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+AML Triage Benchmark for Day 2
+
+Generates synthetic transaction files (see src/day2/aml_triage/synthetic.py)
+and runs the batch pipeline (run_pipeline) on them with profiling on, so the
+stage timings are the pipeline's own (see src/day2/aml_triage/profiling.py):
+
+- load:   parse the CSV into TxRecords and sort them by timestamp
+- rules:  evaluate the AML rules (with --workers, also triage, in shards)
+- triage: score alerts into triage decisions
+- write:  write aml_alerts.json and triage_queue.csv
+
+Total time is the whole run_pipeline call, summary.json included.
+
+Each size runs in a fresh process, so the recorded peak RSS belongs to that
+run alone. Results (seconds and rows/sec per stage, peak RSS) are written to
+a JSON file; pass an earlier results file with --compare to print the
+throughput change per stage.
+
+Usage:
+    python scripts/day2_aml_benchmark.py
+    python scripts/day2_aml_benchmark.py --rows 10K 1M --accounts 50000
+    python scripts/day2_aml_benchmark.py --rows 1M --workers 4 --beneficiary-index
+    python scripts/day2_aml_benchmark.py --compare out/day2/benchmark/baseline.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import platform
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Make the src package importable when run as a script
+WORKSPACE_ROOT = Path(__file__).parent.parent.resolve()
+sys.path.insert(0, str(WORKSPACE_ROOT))
+
+from src.day2.aml_triage import pipeline
+from src.day2.aml_triage.synthetic import write_synthetic_csv
+
+
+STAGES = ("load", "rules", "triage", "write")
+SUFFIXES = {"K": 1_000, "M": 1_000_000}
+# Events arrive about once a second; enough accounts keeps chance
+# bursts (3 in a minute on one account) rare at every size
+MIN_ACCOUNTS = 10_000
+ROWS_PER_ACCOUNT = 50
+
+
+def parse_rows(value: str) -> int:
+    """Parse a row count such as 10000, 10K or 1.5M."""
+    text = value.strip().upper()
+    multiplier = SUFFIXES.get(text[-1:], 1)
+    if multiplier > 1:
+        text = text[:-1]
+    try:
+        rows = int(float(text) * multiplier)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid row count: {value}")
+    if rows < 1:
+        raise argparse.ArgumentTypeError(f"row count must be >= 1: {value}")
+    return rows
+
+
+def peak_rss_mb() -> float | None:
+    """Peak resident set size of this process in MiB (None if unavailable)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(peak / (1 << 20 if sys.platform == "darwin" else 1 << 10), 1)
+
+
+def time_pipeline(input_csv: Path, output_dir: Path, workers: int = 1,
+                  beneficiary_index: Path | None = None) -> dict:
+    """Run run_pipeline with profiling and collect its stage timings."""
+    if beneficiary_index is not None:
+        # Every pair is new on a fresh index, as on a first production run
+        shutil.rmtree(beneficiary_index, ignore_errors=True)
+
+    started = time.perf_counter()
+    summary = pipeline.run_pipeline(
+        input_csv,
+        output_dir,
+        workers=workers,
+        beneficiary_index=beneficiary_index,
+        profile=True
+    )
+    total = time.perf_counter() - started
+
+    rows = summary["total_transactions"]
+    perf_stages = summary["perf"]["stages"]
+    stages = {}
+    for stage in STAGES:
+        # Sharded runs report triage inside rules; runs without alerts stop early
+        seconds = perf_stages[stage]["wall_seconds"] if stage in perf_stages else None
+        stages[stage] = {
+            "seconds": round(seconds, 4) if seconds is not None else None,
+            "rows_per_sec": round(rows / seconds) if seconds else None,
+        }
+    return {
+        "rows": rows,
+        "alerts": summary["total_alerts"],
+        "stages": stages,
+        "rules": summary["perf"]["rules"],
+        "total_seconds": round(total, 4),
+        "rows_per_sec": round(rows / total) if total else None,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def run_size(rows: int, workdir: Path, options: dict, workers: int = 1,
+             beneficiary_index: bool = False) -> dict:
+    """Generate one input file and benchmark it (runs in a child process)."""
+    options = dict(options)
+    if options["accounts"] is None:
+        options["accounts"] = max(MIN_ACCOUNTS, rows // ROWS_PER_ACCOUNT)
+
+    # Inputs are reused across runs with the same generator options
+    tag = "_".join(str(options[name]) for name in sorted(options))
+    input_csv = workdir / f"transactions_{rows}_{tag}.csv"
+    if not input_csv.exists():
+        write_synthetic_csv(input_csv, rows, **options)
+
+    index_dir = workdir / f"beneficiaries_{rows}" if beneficiary_index else None
+    run = time_pipeline(input_csv, workdir / f"output_{rows}", workers, index_dir)
+    run["accounts"] = options["accounts"]
+    run["workers"] = workers
+    run["beneficiary_index"] = beneficiary_index
+    return run
+
+
+def compare(results: dict, baseline: dict) -> None:
+    """Print the rows/sec change per stage against a baseline results file."""
+    previous = {run["rows"]: run for run in baseline.get("runs", [])}
+    for run in results["runs"]:
+        before = previous.get(run["rows"])
+        if before is None:
+            print(f"{run['rows']:>10} rows: no baseline")
+            continue
+        changes = []
+        for stage in STAGES + ("total",):
+            now = run["rows_per_sec"] if stage == "total" else run["stages"][stage]["rows_per_sec"]
+            then = before["rows_per_sec"] if stage == "total" else before["stages"].get(stage, {}).get("rows_per_sec")
+            if now and then:
+                changes.append(f"{stage} {now / then - 1:+.1%}")
+        print(f"{run['rows']:>10} rows: " + ", ".join(changes))
+
+
+def main():
+    """Benchmark the AML pipeline on synthetic data."""
+    parser = argparse.ArgumentParser(description="Benchmark the AML triage pipeline on synthetic data")
+    parser.add_argument("--rows", type=parse_rows, nargs="+", default=[10_000, 100_000],
+                        help="Row counts to benchmark, e.g. 10K 100K 1M (default: 10K 100K)")
+    parser.add_argument("--accounts", type=int, default=None,
+                        help=f"Number of accounts (default: one per {ROWS_PER_ACCOUNT} rows, at least {MIN_ACCOUNTS})")
+    parser.add_argument("--burst-rate", type=float, default=0.001,
+                        help="Share of events that are rapid debit bursts (default: 0.001)")
+    parser.add_argument("--reversal-rate", type=float, default=0.002,
+                        help="Share of events that are reversed debits (default: 0.002)")
+    parser.add_argument("--beneficiary-churn", type=float, default=0.05,
+                        help="Probability a payment goes to a new beneficiary (default: 0.05)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes for account-sharded rule evaluation (default: 1)")
+    parser.add_argument("--beneficiary-index", action="store_true",
+                        help="Enable NEW_BENEFICIARY with a fresh on-disk beneficiary index per run")
+    parser.add_argument("--workdir", type=Path, default=WORKSPACE_ROOT / "out" / "day2" / "benchmark",
+                        help="Directory for generated inputs and outputs")
+    parser.add_argument("--output", type=Path, default=None,
+                        help="Results JSON path (default: WORKDIR/results.json)")
+    parser.add_argument("--compare", type=Path, default=None,
+                        help="Earlier results JSON to compare rows/sec against")
+    args = parser.parse_args()
+
+    options = {
+        "accounts": args.accounts,
+        "burst_rate": args.burst_rate,
+        "reversal_rate": args.reversal_rate,
+        "beneficiary_churn": args.beneficiary_churn,
+        "seed": args.seed,
+    }
+    args.workdir.mkdir(parents=True, exist_ok=True)
+    output = args.output or args.workdir / "results.json"
+
+    # A fresh process per size keeps peak RSS per run
+    context = multiprocessing.get_context("spawn")
+    runs = []
+    for rows in args.rows:
+        # Executor workers (unlike Pool's daemonic ones) may start the pipeline's own workers
+        with ProcessPoolExecutor(1, mp_context=context) as executor:
+            run = executor.submit(
+                run_size, rows, args.workdir, options, args.workers, args.beneficiary_index
+            ).result()
+        runs.append(run)
+        stages = "  ".join(
+            f"{stage} {run['stages'][stage]['seconds']:.3f}s"
+            for stage in STAGES if run["stages"][stage]["seconds"] is not None
+        )
+        print(f"{rows:>10} rows: {run['rows_per_sec']:>9} rows/sec  {stages}  peak {run['peak_rss_mb']} MiB")
+
+    results = {
+        "generated_at": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "options": options,
+        "runs": runs,
+    }
+    output.write_text(json.dumps(results, indent=2))
+    print(f"Results written to {output}")
+
+    if args.compare:
+        compare(results, json.loads(args.compare.read_text()))
+
+
+if __name__ == "__main__":
+    main()
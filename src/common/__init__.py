@@ -0,0 +1 @@
+"""Shared utilities used by several bootcamp packages."""
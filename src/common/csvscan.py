@@ -0,0 +1,246 @@
+"""Memory-mapped scanner for simple CSV transaction files.
+
+``csv.DictReader`` builds a dict for every row. The transaction layouts in
+``src/samples/`` are plain comma-separated text: one record per line, no
+quoting. For such files the scanner maps the file into memory, decodes it in
+large blocks that end on a line boundary and splits each line on commas, so
+a row is just a list of field strings.
+
+The data region can be split into byte-range chunks that start and end on
+line boundaries; each chunk can be scanned independently, e.g. by a worker
+process that reopens the file.
+
+Files that contain a double quote anywhere are scanned with the ``csv``
+module instead (quoted fields may hold commas or newlines), fed the same
+decoded blocks line by line, and are never split into more than one chunk.
+Either way, rows are the same as ``csv.reader`` produces for the file: blank
+lines are skipped and ``\\r\\n`` line endings are accepted.
+
+Example:
+    >>> with CsvScanner(Path("src/samples/sample_transactions.csv")) as scanner:
+    ...     amount = scanner.index("amount")
+    ...     for row in scanner.rows():
+    ...         print(row[amount])
+"""
+
+import csv
+import io
+import mmap
+from pathlib import Path
+from itertools import chain, repeat
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+
+DEFAULT_BLOCK_SIZE = 4 << 20
+
+
+class CsvScanner:
+    """Scan the rows of a CSV file without building a dict per row.
+    
+    Rows are lists of strings with exactly one entry per header column:
+    short rows are padded with None (as DictReader does) and rows with more
+    fields than the header raise ValueError.
+    """
+    
+    def __init__(self, path: Path, block_size: int = DEFAULT_BLOCK_SIZE):
+        """Open and map a CSV file.
+        
+        Args:
+            path: CSV file with a header row
+            block_size: Bytes decoded at a time while scanning
+            
+        Raises:
+            FileNotFoundError: If the file doesn't exist
+        """
+        self.path = path
+        self.block_size = block_size
+        self._file = open(path, 'rb')
+        size = self._file.seek(0, io.SEEK_END)
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self.size = size
+        
+        # Quoted fields need a real CSV parser
+        self.simple = self._data.find(b'"') == -1
+        
+        header_end = self._data.find(b"\n")
+        header_end = self.size if header_end == -1 else header_end
+        header = self._data[:header_end].decode('utf-8').rstrip("\r")
+        self.columns: List[str] = next(csv.reader([header]), []) if header else []
+        self.data_start = min(header_end + 1, self.size)
+    
+    def index(self, name: str) -> Optional[int]:
+        """Position of a column in each row, or None if the file lacks it."""
+        try:
+            return self.columns.index(name)
+        except ValueError:
+            return None
+    
+    def chunks(self, count: int) -> List[Tuple[int, int]]:
+        """Split the data rows into up to ``count`` byte ranges.
+        
+        Boundaries are moved forward to the next line start, so every row
+        belongs to exactly one chunk. Files with quoted fields are returned
+        as a single chunk.
+        
+        Args:
+            count: Desired number of chunks
+            
+        Returns:
+            Non-empty (start, end) byte ranges covering all data rows, in
+            file order
+        """
+        start, end = self.data_start, self.size
+        if start >= end:
+            return []
+        if not self.simple or count <= 1:
+            return [(start, end)]
+        
+        step = max(1, (end - start) // count)
+        bounds = [start]
+        for i in range(1, count):
+            newline = self._data.find(b"\n", start + i * step, end)
+            boundary = end if newline == -1 else newline + 1
+            if boundary > bounds[-1]:
+                bounds.append(boundary)
+        if bounds[-1] < end:
+            bounds.append(end)
+        return list(zip(bounds, bounds[1:]))
+    
+    def rows(self, start: Optional[int] = None, end: Optional[int] = None) -> Iterator[List[Optional[str]]]:
+        """Yield the rows in a byte range (default: all data rows).
+        
+        Args:
+            start: First byte of the range (a line start, e.g. from chunks())
+            end: End of the range (exclusive)
+            
+        Yields:
+            One list of field values per row, in file order
+            
+        Raises:
+            ValueError: If a row has more fields than the header
+        """
+        start = self.data_start if start is None else start
+        end = self.size if end is None else end
+        
+        if self.simple:
+            lines = (line.split(",") for text in self._blocks(start, end) for line in _split_lines(text))
+        else:
+            lines = self._quoted_rows(start, end)
+        return self._fitted(lines)
+    
+    def read_columns(self, start: Optional[int] = None, end: Optional[int] = None) -> List[List[Optional[str]]]:
+        """Read the rows in a byte range column by column.
+        
+        Equivalent to transposing ``rows(start, end)``, but for blocks in
+        which every line has one field per column the fields are split in a
+        single pass over the block and each column is a strided slice, so
+        no per-row lists are built.
+        
+        Args:
+            start: First byte of the range (a line start, e.g. from chunks())
+            end: End of the range (exclusive)
+            
+        Returns:
+            One list of values per header column, each with one entry per row
+            
+        Raises:
+            ValueError: If a row has more fields than the header
+            
+        Example:
+            >>> with CsvScanner(path) as scanner:
+            ...     amounts = scanner.read_columns()[scanner.index("amount")]
+        """
+        width = len(self.columns)
+        columns: List[List[Optional[str]]] = [[] for _ in range(width)]
+        if not width:
+            return columns
+        
+        start = self.data_start if start is None else start
+        end = self.size if end is None else end
+        blocks = (_split_lines(text) for text in self._blocks(start, end)) if self.simple else [None]
+        for lines in blocks:
+            if lines is not None and set(map(str.count, lines, repeat(",", len(lines)))) <= {width - 1}:
+                fields = ",".join(lines).split(",") if lines else []
+                for position, column in enumerate(columns):
+                    column.extend(fields[position::width])
+                continue
+            
+            # Short or long rows (or quoted fields): transpose fitted rows
+            if lines is None:
+                rows = self._fitted(self._quoted_rows(start, end))
+            else:
+                rows = self._fitted(line.split(",") for line in lines)
+            for column, values in zip(columns, zip(*rows)):
+                column.extend(values)
+        return columns
+    
+    def _fitted(self, lines: Iterable[List[str]]) -> Iterator[List[Optional[str]]]:
+        """Skip blank rows, pad short rows and reject long ones."""
+        width = len(self.columns)
+        for fields in lines:
+            if len(fields) != width:
+                if fields == [""] or not fields:
+                    continue
+                if len(fields) > width:
+                    raise ValueError(f"Row has {len(fields)} fields, expected {width}: {fields}")
+                fields = fields + [None] * (width - len(fields))
+            yield fields
+    
+    def _blocks(self, start: int, end: int) -> Iterator[str]:
+        """Decode a byte range in blocks that end on a line boundary."""
+        data = self._data
+        position = start
+        while position < end:
+            block_end = min(position + self.block_size, end)
+            if block_end < end:
+                newline = data.rfind(b"\n", position, block_end)
+                if newline == -1:
+                    newline = data.find(b"\n", block_end, end)
+                block_end = end if newline == -1 else newline + 1
+            
+            yield data[position:block_end].decode('utf-8')
+            position = block_end
+    
+    def _quoted_rows(self, start: int, end: int) -> Iterator[List[str]]:
+        """Parse a byte range with the csv module, one decoded block at a time.
+        
+        The reader pulls lines on demand, so a quoted field spanning lines
+        (or blocks) is joined by the csv module itself.
+        """
+        lines = chain.from_iterable(io.StringIO(text, newline='') for text in self._blocks(start, end))
+        yield from csv.reader(lines)
+    
+    def close(self) -> None:
+        """Unmap and close the file."""
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._data = b""
+        self._file.close()
+    
+    def __enter__(self) -> "CsvScanner":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+def _split_lines(text: str) -> List[str]:
+    """Non-blank lines of a decoded block, without line endings."""
+    lines = text.split("\n")
+    if "\r" in text:
+        lines = [line[:-1] if line.endswith("\r") else line for line in lines]
+    if "" in lines:
+        lines = [line for line in lines if line]
+    return lines
+
+
+def scan_rows(path: Path, start: Optional[int] = None, end: Optional[int] = None) -> List[List[Optional[str]]]:
+    """Read one byte range of a CSV file (for worker processes).
+    
+    Example:
+        >>> with CsvScanner(path) as scanner:
+        ...     chunks = scanner.chunks(4)
+        >>> parts = pool.starmap(scan_rows, [(path, s, e) for s, e in chunks])
+    """
+    with CsvScanner(path) as scanner:
+        return list(scanner.rows(start, end))
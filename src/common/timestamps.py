@@ -0,0 +1,102 @@
+"""Fast ISO 8601 timestamp parsing for transaction feeds.
+
+Transaction files carry timestamps as text, almost always in the fixed
+``YYYY-MM-DDTHH:MM:SSZ`` shape, and a busy feed repeats the same
+second-resolution value many times. Parsing each one with
+``datetime.fromisoformat(value.replace('Z', '+00:00'))`` allocates a new
+string and datetime per row.
+
+``epoch_micros`` turns the fixed shape into integer microseconds since the
+Unix epoch without building a timezone-aware datetime, and only takes the
+general path for other ISO variants (offsets, fractional seconds, naive
+values). Both functions are memoized with an LRU cache, so repeated values
+are parsed once.
+
+All functions accept exactly what ``fromisoformat`` accepts after the
+``Z`` -> ``+00:00`` replacement and raise the same ValueError otherwise.
+
+Example:
+    >>> epoch_micros("2024-01-15T10:00:00Z")
+    1705312800000000
+    >>> parse_datetime("2024-01-15T10:00:00Z")
+    datetime.datetime(2024, 1, 15, 10, 0, tzinfo=datetime.timezone.utc)
+"""
+
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+
+
+CACHE_SIZE = 1 << 16
+
+_EPOCH_AWARE = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_EPOCH_NAIVE = datetime(1970, 1, 1)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+
+def to_epoch_micros(timestamp: datetime) -> int:
+    """Convert a datetime to integer microseconds since the Unix epoch.
+    
+    Integer microseconds keep window comparisons exact, matching
+    ``timedelta.total_seconds()`` comparisons on the original datetimes.
+    
+    Args:
+        timestamp: Naive or timezone-aware datetime
+        
+    Returns:
+        Microseconds since 1970-01-01T00:00:00
+        
+    Example:
+        >>> to_epoch_micros(datetime(1970, 1, 1, 0, 0, 1, tzinfo=timezone.utc))
+        1000000
+    """
+    epoch = _EPOCH_NAIVE if timestamp.tzinfo is None else _EPOCH_AWARE
+    return (timestamp - epoch) // _ONE_MICROSECOND
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_datetime(text: str) -> datetime:
+    """Parse an ISO 8601 timestamp, accepting a trailing ``Z`` for UTC.
+    
+    Results are cached; datetimes are immutable, so callers may share them.
+    
+    Raises:
+        ValueError: If the text is not a valid ISO 8601 timestamp
+    """
+    return datetime.fromisoformat(text.replace('Z', '+00:00'))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def epoch_micros(text: str) -> int:
+    """Parse an ISO 8601 timestamp to microseconds since the Unix epoch.
+    
+    ``YYYY-MM-DDTHH:MM:SSZ`` is parsed as a naive wall-clock time (UTC and
+    naive values count from the same midnight), skipping the offset string
+    replacement and timezone arithmetic; anything else goes through
+    ``parse_datetime``. Results are cached, so a repeated value costs one
+    dictionary lookup.
+    
+    Args:
+        text: Timestamp text
+        
+    Returns:
+        Microseconds since 1970-01-01T00:00:00
+        
+    Raises:
+        ValueError: If the text is not a valid ISO 8601 timestamp
+    """
+    if len(text) == 20 and text[19] == "Z" and text[10] == "T" and text.count("Z") == 1:
+        parsed = datetime.fromisoformat(text[:19])
+        # A short time with its own offset (e.g. "T10+01:00Z") is not the
+        # plain UTC form; the general path rejects it with ValueError
+        if parsed.tzinfo is None:
+            return (parsed - _EPOCH_NAIVE) // _ONE_MICROSECOND
+    return to_epoch_micros(parse_datetime(text))
+
+
+def is_valid_timestamp(text: str) -> bool:
+    """Whether text is a valid ISO 8601 timestamp (see ``epoch_micros``)."""
+    try:
+        epoch_micros(text)
+    except (ValueError, TypeError, AttributeError):
+        return False
+    return True
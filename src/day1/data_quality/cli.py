@@ -4,7 +4,8 @@ import argparse
 import sys
 from pathlib import Path
 
-from .validator import run_validation
+from .rulespec import RuleSet
+from .validator import ENGINES, run_streaming_validation, run_validation
 
 
 def main():
@@ -27,20 +28,81 @@ def main():
         help='Path to output JSON report (default: out/day1/lab1/validation_report.json)'
     )
     
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Validate rows as they are read in constant memory; issues go to an NDJSON sidecar file'
+    )
+    
+    parser.add_argument(
+        '--issues',
+        type=Path,
+        default=None,
+        help='With --stream, path of the NDJSON issues file (default: <output>.issues.ndjson)'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Worker processes validating line-aligned chunks of the file in parallel (default: 1)'
+    )
+    
+    parser.add_argument(
+        '--engine',
+        choices=ENGINES,
+        default='row',
+        help='row: validate one Transaction at a time; columnar: evaluate rules over whole columns (default: row)'
+    )
+    
+    parser.add_argument(
+        '--rules',
+        type=Path,
+        default=None,
+        help='JSON or YAML rule spec to validate against instead of the built-in rules'
+    )
+    
     args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.issues and not args.stream:
+        parser.error("--issues requires --stream")
+    if args.stream and args.engine != 'row':
+        parser.error("--stream validates one row at a time; use --engine row")
     
     if not args.input.exists():
         print(f"Error: Input file not found: {args.input}", file=sys.stderr)
         return 1
     
+    rules = None
+    if args.rules:
+        try:
+            rules = RuleSet.from_file(args.rules)
+        except (OSError, ValueError, ImportError) as e:
+            print(f"Error: Invalid rule spec {args.rules}: {e}", file=sys.stderr)
+            return 1
+    
     print(f"Data Quality Validation")
     print(f"=" * 50)
     print(f"Input: {args.input}")
     print(f"Output: {args.output}")
+    if args.workers > 1:
+        print(f"Workers: {args.workers}")
+    if args.engine != 'row':
+        print(f"Engine: {args.engine}")
+    if rules:
+        print(f"Rules: {rules.name} ({len(rules.checks)} checks)")
     print()
     
     try:
-        report = run_validation(args.input, args.output)
+        if args.stream:
+            report = run_streaming_validation(
+                args.input, args.output, args.issues, workers=args.workers, rules=rules
+            )
+        else:
+            report = run_validation(
+                args.input, args.output, workers=args.workers, engine=args.engine, rules=rules
+            )
         
         print(f"✓ Validation completed!")
         print()
@@ -49,7 +111,7 @@ def main():
         print(f"Invalid transactions: {report.invalid_transactions}")
         print()
         
-        if report.issues:
+        if report.issues_by_rule:
             print("Issues by severity:")
             for severity, count in sorted(report.issues_by_severity.items()):
                 print(f"  {severity}: {count}")
@@ -61,9 +123,11 @@ def main():
             print()
         
         print(f"Report written to: {args.output}")
+        if args.stream:
+            print(f"Issues written to: {report.issues_file}")
         
         return 0
-        
+    
     except Exception as e:
         print(f"Error: Validation failed: {e}", file=sys.stderr)
         import traceback
@@ -0,0 +1,288 @@
+"""Column-wise data-quality validation.
+
+The row engine (``RuleSet.validate``) builds a Pydantic Transaction per row
+and then checks it field by field. This module reads a file column by
+column (``CsvScanner.read_columns``) and evaluates every check of a rule set
+as a mask over a whole column:
+
+- required checks: positions of missing values
+- amount comparisons (sign, zero, threshold): comparisons over a float column
+- value lists, timestamps, patterns and digit IDs: the check runs once per
+  distinct value, then the failing values are looked up per row
+
+Failing rows are recorded in an ``IssueStore``, in the same order and with
+the same values as the row engine's issues: amounts are compared as floats
+except where a float comparison could differ from the Decimal one (values
+equal to a comparison bound), which are compared as Decimals. Rows that
+the vectorized checks cannot handle exactly (an amount that is not a plain
+decimal number such as ``1e3`` or `` 10``, or a missing transaction ID) are
+validated by the row engine itself, and raise the same errors.
+
+NumPy is used for the amount column when installed; otherwise the same
+comparisons run in plain Python.
+
+Example:
+    >>> total, issues = validate_csv_columnar(Path("src/samples/sample_transactions.csv"))
+    >>> issues == [issue for t in load_transactions(path) for issue in validate_transaction(t)]
+    True
+"""
+
+from decimal import Decimal
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised when NumPy is absent
+    np = None
+
+from src.common.csvscan import CsvScanner
+
+from .issues import IssueStore
+from .rules import DEFAULT_RULES
+from .rulespec import COMPARE, DECIMAL, DECIMAL_FIELDS, FIELDS, OPERATORS, REQUIRED, Check, RuleSet
+from .schemas import Transaction
+
+# Characters of a plain decimal amount such as -12.50
+_PLAIN_AMOUNT_CHARS = "0123456789.-"
+
+
+class TransactionColumns:
+    """Transaction fields of a batch of rows, one list per field.
+    
+    Values are cleaned as the row engine cleans them: empty and
+    whitespace-only values are None. Fields missing from the file are all
+    None.
+    """
+    
+    def __init__(self, columns: Dict[str, Sequence[Optional[str]]], rows: int):
+        """Create a batch from cleaned columns.
+        
+        Args:
+            columns: Field name -> one value per row, for every name in FIELDS
+            rows: Number of rows
+        """
+        self.columns = columns
+        self.rows = rows
+    
+    @classmethod
+    def from_csv(cls, csv_path: Path, start: Optional[int] = None, end: Optional[int] = None) -> "TransactionColumns":
+        """Read a CSV file (or one byte-range chunk of it) column by column."""
+        with CsvScanner(csv_path) as scanner:
+            values = scanner.read_columns(start, end)
+            # The last of repeated header names wins, as in a row dict
+            positions = {name: position for position, name in enumerate(scanner.columns)}
+        
+        rows = len(values[0]) if values else 0
+        columns = {}
+        for field in FIELDS:
+            columns[field] = _cleaned(values[positions[field]]) if field in positions else (None,) * rows
+        return cls(columns, rows)
+    
+    def transaction(self, row: int) -> Transaction:
+        """Build the Transaction for one row, as the row engine does."""
+        return Transaction(**{field: column[row] for field, column in self.columns.items()})
+
+
+def _cleaned(values: List[Optional[str]]) -> Tuple[Optional[str], ...]:
+    """Column with empty and whitespace-only values replaced by None.
+    
+    Columns are tuples: once the garbage collector sees a tuple holds only
+    strings and None it stops traversing it, which matters with millions
+    of values alive.
+    """
+    if None not in values and "" not in values and not any(map(str.isspace, values)):
+        return tuple(values)
+    return tuple(value if value and not value.isspace() else None for value in values)
+
+
+def missing_rows(column: Sequence[Optional[str]]) -> List[int]:
+    """Positions of missing (None) values."""
+    if None not in column:
+        return []
+    return [row for row, value in enumerate(column) if value is None]
+
+
+def failing_rows(column: Sequence[Optional[str]], fails: Callable[[str], bool]) -> List[int]:
+    """Positions of present values for which ``fails`` is true.
+    
+    ``fails`` is called once per distinct value, so low-cardinality columns
+    (currency, category, timestamps) cost one set lookup per row.
+    """
+    failing = {value for value in set(column) if value is not None and fails(value)}
+    if not failing:
+        return []
+    return [row for row, value in enumerate(column) if value in failing]
+
+
+def amount_rows(
+    column: Sequence[Optional[str]],
+    compares: Sequence[Tuple[int, Check]]
+) -> Tuple[Dict[int, List[int]], List[int]]:
+    """Evaluate the compare checks of an amount column.
+    
+    Args:
+        column: Raw amount values (None where missing)
+        compares: (check number, compare check) pairs for the column
+        
+    Returns:
+        Tuple of (check number -> failing positions, positions whose amount
+        is not a plain decimal number and must go through the row engine)
+    """
+    present = [row for row, value in enumerate(column) if value is not None] if None in column else None
+    texts = [column[row] for row in present] if present is not None else column
+    
+    irregular = []
+    if "".join(texts).strip(_PLAIN_AMOUNT_CHARS):
+        irregular = [position for position, text in enumerate(texts) if text.strip(_PLAIN_AMOUNT_CHARS)]
+    try:
+        values = _floats(texts, irregular)
+    except ValueError:
+        # Malformed despite plain characters, e.g. "1.2.3" or "5-"
+        irregular = [position for position, text in enumerate(texts) if not _is_plain_amount(text)]
+        values = _floats(texts, irregular)
+    
+    bounds = {float(check.bound) for _, check in compares}
+    if np is not None:
+        rows = {
+            number: np.flatnonzero(OPERATORS[check.op](values, float(check.bound))).tolist()
+            for number, check in compares
+        }
+        boundary = np.flatnonzero(np.isin(values, list(bounds))).tolist() if bounds else []
+    else:
+        rows = {
+            number: [p for p, value in enumerate(values) if OPERATORS[check.op](value, float(check.bound))]
+            for number, check in compares
+        }
+        boundary = [p for p, value in enumerate(values) if value in bounds]
+    
+    # Floats can round a tiny or a just-over-bound amount onto a bound;
+    # decide those with the exact Decimal comparisons
+    skip = set(irregular)
+    exact = [(position, Decimal(texts[position])) for position in boundary if position not in skip]
+    if exact or skip:
+        overrides = dict(exact)
+        rows = {number: _adjusted(rows[number], overrides, check.fails, skip) for number, check in compares}
+    
+    if present is not None:
+        rows = {number: [present[p] for p in positions] for number, positions in rows.items()}
+        irregular = [present[p] for p in irregular]
+    return rows, irregular
+
+
+def _is_plain_amount(text: str) -> bool:
+    if text.strip(_PLAIN_AMOUNT_CHARS):
+        return False
+    try:
+        float(text)
+    except ValueError:
+        return False
+    return True
+
+
+def _floats(texts: Sequence[str], irregular: List[int]):
+    """Amounts as floats (an array with NumPy), 0.0 at irregular positions."""
+    if irregular:
+        skip = set(irregular)
+        texts = ["0" if position in skip else text for position, text in enumerate(texts)]
+    values = list(map(float, texts))
+    return np.array(values, dtype=np.float64) if np is not None else values
+
+
+def _adjusted(
+    positions: List[int],
+    overrides: Dict[int, Decimal],
+    fails: Callable[[Decimal], bool],
+    skip: Set[int]
+) -> List[int]:
+    """Replace the float result with the Decimal one where it is known."""
+    kept = {p for p in positions if p not in overrides and p not in skip}
+    kept.update(p for p, amount in overrides.items() if fails(amount))
+    return sorted(kept)
+
+
+def validate_columns(batch: TransactionColumns, rules: Optional[RuleSet] = None) -> IssueStore:
+    """Validate a batch column by column.
+    
+    Args:
+        batch: Cleaned transaction columns
+        rules: Rule set to check (default: the built-in rules)
+        
+    Returns:
+        The issues ``rules.validate`` reports for each row, in row order
+        
+    Raises:
+        pydantic.ValidationError: If a row cannot be built into a
+            Transaction (the row engine's error for the first such row)
+    """
+    rules = rules or DEFAULT_RULES
+    columns = batch.columns
+    failing: Dict[int, List[int]] = {}
+    
+    # Rows the vectorized checks can't decide go through the row engine.
+    # Every amount that is not a valid decimal is irregular, so decimal
+    # checks only ever fail there.
+    fallback = set(missing_rows(columns["transaction_id"]))
+    for field in DECIMAL_FIELDS:
+        compares = [
+            (number, check) for number, check in enumerate(rules.checks)
+            if check.field == field and check.kind == COMPARE
+        ]
+        rows, irregular = amount_rows(columns[field], compares)
+        failing.update(rows)
+        fallback.update(irregular)
+    
+    for number, check in enumerate(rules.checks):
+        if check.kind == REQUIRED:
+            failing[number] = missing_rows(columns[check.field])
+        elif check.kind not in (DECIMAL, COMPARE):
+            failing[number] = failing_rows(columns[check.field], check.fails)
+    
+    fallback = sorted(fallback)
+    transactions = {row: batch.transaction(row) for row in fallback}
+    
+    count = len(rules.checks)
+    keys = [
+        row * count + number
+        for number, rows in failing.items()
+        for row in rows
+        if row not in transactions
+    ]
+    keys.sort()
+    
+    store = IssueStore(rules)
+    checks = rules.checks
+    transaction_ids = columns["transaction_id"]
+    pending = iter(fallback)
+    next_fallback = next(pending, None)
+    for key in keys:
+        row, number = divmod(key, count)
+        while next_fallback is not None and next_fallback < row:
+            store.add_transaction(next_fallback, transactions[next_fallback])
+            next_fallback = next(pending, None)
+        store.add(row, number, transaction_ids[row], columns[checks[number].field][row])
+    while next_fallback is not None:
+        store.add_transaction(next_fallback, transactions[next_fallback])
+        next_fallback = next(pending, None)
+    return store
+
+
+def validate_csv_columnar(
+    csv_path: Path,
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    rules: Optional[RuleSet] = None
+) -> Tuple[int, IssueStore]:
+    """Validate a CSV file, or one byte-range chunk of it, column by column.
+    
+    Args:
+        csv_path: Path to CSV file
+        start: First byte of a chunk to read (see ``CsvScanner.chunks``)
+        end: End of the chunk (default: all rows)
+        rules: Rule set to check (default: the built-in rules)
+        
+    Returns:
+        Tuple of (number of rows, issues in row order)
+    """
+    batch = TransactionColumns.from_csv(csv_path, start, end)
+    return batch.rows, validate_columns(batch, rules)
@@ -0,0 +1,195 @@
+"""Compact storage for validation issues.
+
+A ``ValidationIssue`` is a Pydantic model with six fields; building one per
+rule hit dominates validation time on dirty files, and holding millions of
+them dominates memory. ``IssueStore`` records each hit as a row number, a
+check number and a value slot in typed arrays. Two side tables hold the
+objects: one transaction ID per row with issues (a row's issues are
+consecutive), and one entry per distinct raw value, so repeated values
+(a missing field, an unknown currency) are kept once. Everything else
+(field, rule, severity, message) comes from the store's ``RuleSet``, whose
+messages are rendered once.
+
+``ValidationIssue`` objects are built only when issues are read (iterating
+or indexing the store). A report holding a store serializes it straight
+from the arrays, without building them at all.
+
+Example:
+    >>> store = IssueStore()
+    >>> store.add_transaction(0, transaction)
+    2
+    >>> report = ValidationReport.model_construct(issues=store, ...)
+    >>> report.model_dump(mode='json')["issues"][0]["message"]
+    'Account ID is required'
+"""
+
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from itertools import chain, repeat
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union, overload
+
+from .rules import DEFAULT_RULES
+from .rulespec import RuleSet
+from .schemas import Transaction, ValidationIssue
+
+
+class IssueStore(Sequence[ValidationIssue]):
+    """Validation issues as (row, check, value slot) records in arrays.
+    
+    A read-only sequence of ValidationIssue, in the order issues were added.
+    """
+    
+    def __init__(self, rules: Optional[RuleSet] = None):
+        """Create an empty store.
+        
+        Args:
+            rules: Rule set whose check numbers are recorded (default: the
+                built-in rules)
+        """
+        self.rules = rules or DEFAULT_RULES
+        self.rows = array('q')
+        self.checks = array('B')
+        self.value_slots = array('I')
+        # Side tables: the transaction ID of each run of issues with the
+        # same row (and the position of its first issue), and distinct values
+        self.transaction_ids: List[str] = []
+        self.row_starts = array('q')
+        self.values: List[object] = []
+        self._slots: Dict[object, int] = {}
+    
+    def add(self, row: int, check: int, transaction_id: str, raw: object) -> None:
+        """Record a failed check.
+        
+        Args:
+            row: Row number of the transaction in the file
+            check: Number of the check in the rule set
+            transaction_id: ID of the transaction
+            raw: Raw value of the check's field
+        """
+        if not self.rows or self.rows[-1] != row:
+            self.row_starts.append(len(self.checks))
+            self.transaction_ids.append(transaction_id)
+        self.rows.append(row)
+        self.checks.append(check)
+        self.value_slots.append(self._slot(raw))
+    
+    def _slot(self, raw: object) -> int:
+        """Slot of a raw value in the value table, adding it if new."""
+        # Equal values can render differently (Decimal("1E+4") and
+        # Decimal("10000")), so only strings and None are keyed as is
+        key = raw if raw is None or type(raw) is str else (type(raw), str(raw))
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = self._slots[key] = len(self.values)
+            self.values.append(raw)
+        return slot
+    
+    def add_transaction(self, row: int, transaction: Transaction) -> int:
+        """Run all rules on a transaction and record what it fails.
+        
+        Returns:
+            Number of issues recorded
+        """
+        failed = self.rules.evaluate(transaction)
+        checks = self.rules.checks
+        for number in failed:
+            self.add(row, number, transaction.transaction_id, getattr(transaction, checks[number].field))
+        return len(failed)
+    
+    def extend(self, other: "IssueStore", row_offset: int = 0) -> None:
+        """Append another store's issues, e.g. from the next chunk of rows.
+        
+        Both stores must record checks of the same rule set.
+        
+        Args:
+            other: Store to append
+            row_offset: Added to the other store's row numbers
+        """
+        slots = [self._slot(raw) for raw in other.values]
+        issues = len(self.checks)
+        self.row_starts.extend(array('q', (start + issues for start in other.row_starts)))
+        self.transaction_ids.extend(other.transaction_ids)
+        self.rows.extend(other.rows if not row_offset else array('q', (row + row_offset for row in other.rows)))
+        self.checks.extend(other.checks)
+        self.value_slots.extend(array('I', map(slots.__getitem__, other.value_slots)))
+    
+    def __len__(self) -> int:
+        return len(self.checks)
+    
+    @overload
+    def __getitem__(self, index: int) -> ValidationIssue: ...
+    
+    @overload
+    def __getitem__(self, index: slice) -> List[ValidationIssue]: ...
+    
+    def __getitem__(self, index: Union[int, slice]) -> Union[ValidationIssue, List[ValidationIssue]]:
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("issue index out of range")
+        transaction_id = self.transaction_ids[bisect_right(self.row_starts, index) - 1]
+        raw = self.values[self.value_slots[index]]
+        return self.rules.checks[self.checks[index]].issue(transaction_id, raw)
+    
+    def _fields(self) -> Iterator[Tuple[int, str, object]]:
+        """(check number, transaction ID, raw value) of each issue, in order."""
+        ends = self.row_starts[1:]
+        ends.append(len(self.checks))
+        transaction_ids = chain.from_iterable(
+            repeat(transaction_id, end - start)
+            for transaction_id, start, end in zip(self.transaction_ids, self.row_starts, ends)
+        )
+        return zip(self.checks, transaction_ids, map(self.values.__getitem__, self.value_slots))
+    
+    def __iter__(self) -> Iterator[ValidationIssue]:
+        checks = self.rules.checks
+        for number, transaction_id, raw in self._fields():
+            yield checks[number].issue(transaction_id, raw)
+    
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (IssueStore, list, tuple)):
+            return len(self) == len(other) and all(mine == theirs for mine, theirs in zip(self, other))
+        return NotImplemented
+    
+    def records(self, json: bool = False) -> List[dict]:
+        """Issues as dicts, equal to ``ValidationIssue.model_dump`` of each.
+        
+        Args:
+            json: Severity as its string value (``model_dump(mode='json')``)
+        """
+        checks = self.rules.checks
+        records = []
+        for number, transaction_id, raw in self._fields():
+            check = checks[number]
+            records.append({
+                "transaction_id": transaction_id,
+                "field": check.field,
+                "rule": check.rule,
+                "severity": check.severity.value if json else check.severity,
+                "message": check.message,
+                "value": check.value(raw),
+            })
+        return records
+    
+    def count_by_severity(self) -> Dict[str, int]:
+        """Issue count per severity value, in order of first occurrence."""
+        counts: Dict[str, int] = {}
+        for number, count in Counter(self.checks).items():
+            severity = self.rules.checks[number].severity.value
+            counts[severity] = counts.get(severity, 0) + count
+        return counts
+    
+    def count_by_rule(self) -> Dict[str, int]:
+        """Issue count per rule name, in order of first occurrence."""
+        counts: Dict[str, int] = {}
+        for number, count in Counter(self.checks).items():
+            rule = self.rules.checks[number].rule
+            counts[rule] = counts.get(rule, 0) + count
+        return counts
+    
+    def transactions_with_issues(self) -> int:
+        """Number of distinct transaction IDs with at least one issue."""
+        return len(set(self.transaction_ids))
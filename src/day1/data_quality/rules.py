@@ -1,14 +1,31 @@
-"""Validation rules for data quality checks."""
+"""Validation rules for data quality checks.
 
-from decimal import Decimal, InvalidOperation
-from datetime import datetime
-from typing import List, Optional
+The built-in checks are declared in ``specs/default.json`` and compiled by
+``rulespec``; custom rule sets (e.g. per tenant) are loaded with
+``RuleSet.from_file`` and passed to the validator instead.
+"""
 
-from .schemas import Transaction, ValidationIssue, Severity
+from pathlib import Path
+from typing import List
 
+from .rulespec import RuleSet
+from .schemas import Transaction, ValidationIssue
 
-VALID_CURRENCIES = {"USD", "EUR", "GBP", "JPY", "CAD", "AUD", "CHF"}
-VALID_CATEGORIES = {"dining", "shopping", "transport", "automotive", "groceries", "travel", "entertainment", "healthcare"}
+
+DEFAULT_SPEC = Path(__file__).parent / "specs" / "default.json"
+DEFAULT_RULES = RuleSet.from_file(DEFAULT_SPEC)
+
+# Every check, in the order validate_transaction reports issues for a row
+CHECKS = {check.name: check for check in DEFAULT_RULES.checks}
+
+# Compact check numbers, e.g. for IssueStore
+CHECK_IDS = DEFAULT_RULES.ids
+CHECK_LIST = DEFAULT_RULES.checks
+
+VALID_CURRENCIES = set(CHECKS["invalid_currency"].values)
+VALID_CATEGORIES = set(CHECKS["unknown_category"].values)
+
+AMOUNT_THRESHOLD = CHECKS["amount_over_threshold"].bound
 
 
 def check_completeness(transaction: Transaction) -> List[ValidationIssue]:
@@ -22,28 +39,7 @@ def check_completeness(transaction: Transaction) -> List[ValidationIssue]:
     Returns:
         List of validation issues for missing fields
     """
-    issues = []
-    
-    required_fields = {
-        "account_id": "Account ID is required",
-        "amount": "Amount is required",
-        "currency": "Currency is required",
-        "timestamp": "Timestamp is required"
-    }
-    
-    for field, message in required_fields.items():
-        value = getattr(transaction, field)
-        if value is None or (isinstance(value, str) and value.strip() == ""):
-            issues.append(ValidationIssue(
-                transaction_id=transaction.transaction_id,
-                field=field,
-                rule="completeness",
-                severity=Severity.HIGH,
-                message=message,
-                value=str(value) if value is not None else "null"
-            ))
-    
-    return issues
+    return DEFAULT_RULES.validate(transaction, rule="completeness")
 
 
 def check_format(transaction: Transaction) -> List[ValidationIssue]:
@@ -61,79 +57,7 @@ def check_format(transaction: Transaction) -> List[ValidationIssue]:
     Returns:
         List of validation issues for format errors
     """
-    issues = []
-    
-    # Check amount format and positivity
-    if transaction.amount is not None:
-        try:
-            amount_val = Decimal(str(transaction.amount))
-            if amount_val < 0:
-                issues.append(ValidationIssue(
-                    transaction_id=transaction.transaction_id,
-                    field="amount",
-                    rule="format",
-                    severity=Severity.HIGH,
-                    message="Amount cannot be negative",
-                    value=str(transaction.amount)
-                ))
-            if amount_val == 0:
-                issues.append(ValidationIssue(
-                    transaction_id=transaction.transaction_id,
-                    field="amount",
-                    rule="format",
-                    severity=Severity.MEDIUM,
-                    message="Amount is zero",
-                    value=str(transaction.amount)
-                ))
-        except (InvalidOperation, ValueError):
-            issues.append(ValidationIssue(
-                transaction_id=transaction.transaction_id,
-                field="amount",
-                rule="format",
-                severity=Severity.HIGH,
-                message="Invalid amount format",
-                value=str(transaction.amount)
-            ))
-    
-    # Check currency format
-    if transaction.currency is not None:
-        if transaction.currency not in VALID_CURRENCIES:
-            issues.append(ValidationIssue(
-                transaction_id=transaction.transaction_id,
-                field="currency",
-                rule="format",
-                severity=Severity.MEDIUM,
-                message=f"Invalid currency code. Valid codes: {', '.join(VALID_CURRENCIES)}",
-                value=transaction.currency
-            ))
-    
-    # Check timestamp format
-    if transaction.timestamp is not None:
-        try:
-            datetime.fromisoformat(transaction.timestamp.replace('Z', '+00:00'))
-        except (ValueError, AttributeError):
-            issues.append(ValidationIssue(
-                transaction_id=transaction.transaction_id,
-                field="timestamp",
-                rule="format",
-                severity=Severity.HIGH,
-                message="Invalid timestamp format. Expected ISO 8601 format",
-                value=str(transaction.timestamp)
-            ))
-    
-    # Check category format (if present)
-    if transaction.category is not None and transaction.category.strip() != "":
-        if transaction.category.lower() not in VALID_CATEGORIES:
-            issues.append(ValidationIssue(
-                transaction_id=transaction.transaction_id,
-                field="category",
-                rule="format",
-                severity=Severity.LOW,
-                message=f"Unknown category. Valid categories: {', '.join(VALID_CATEGORIES)}",
-                value=transaction.category
-            ))
-    
-    return issues
+    return DEFAULT_RULES.validate(transaction, rule="format")
 
 
 def check_range(transaction: Transaction) -> List[ValidationIssue]:
@@ -149,49 +73,20 @@ def check_range(transaction: Transaction) -> List[ValidationIssue]:
     Returns:
         List of validation issues for out-of-range values
     """
-    issues = []
-    
-    # Check amount range
-    if transaction.amount is not None:
-        try:
-            amount_val = Decimal(str(transaction.amount))
-            if amount_val > 100000:
-                issues.append(ValidationIssue(
-                    transaction_id=transaction.transaction_id,
-                    field="amount",
-                    rule="range",
-                    severity=Severity.MEDIUM,
-                    message="Amount exceeds maximum threshold of 100,000",
-                    value=str(transaction.amount)
-                ))
-        except (InvalidOperation, ValueError):
-            pass  # Already caught by format check
-    
-    # Check account ID format
-    if transaction.account_id is not None:
-        acc_id = str(transaction.account_id).strip()
-        if not acc_id.startswith("ACC") or not acc_id[3:].isdigit():
-            issues.append(ValidationIssue(
-                transaction_id=transaction.transaction_id,
-                field="account_id",
-                rule="range",
-                severity=Severity.MEDIUM,
-                message="Account ID must start with 'ACC' followed by digits",
-                value=transaction.account_id
-            ))
-    
-    # Check merchant name presence
-    if transaction.merchant_name is None or transaction.merchant_name.strip() == "":
-        issues.append(ValidationIssue(
-            transaction_id=transaction.transaction_id,
-            field="merchant_name",
-            rule="range",
-            severity=Severity.LOW,
-            message="Merchant name is missing or empty",
-            value=str(transaction.merchant_name)
-        ))
+    return DEFAULT_RULES.validate(transaction, rule="range")
+
+
+def failed_checks(transaction: Transaction) -> List[str]:
+    """Names of all checks a transaction fails, in the order they are reported.
     
-    return issues
+    Args:
+        transaction: Transaction to validate
+        
+    Returns:
+        Keys of CHECKS
+    """
+    checks = DEFAULT_RULES.checks
+    return [checks[number].name for number in DEFAULT_RULES.evaluate(transaction)]
 
 
 def validate_transaction(transaction: Transaction) -> List[ValidationIssue]:
@@ -203,10 +98,4 @@ def validate_transaction(transaction: Transaction) -> List[ValidationIssue]:
     Returns:
         List of all validation issues found
     """
-    issues = []
-    
-    issues.extend(check_completeness(transaction))
-    issues.extend(check_format(transaction))
-    issues.extend(check_range(transaction))
-    
-    return issues
+    return DEFAULT_RULES.validate(transaction)
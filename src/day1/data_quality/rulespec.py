@@ -0,0 +1,405 @@
+"""Declarative data-quality rule specs, compiled into one validator per spec.
+
+A rule spec is a JSON (or, with PyYAML installed, YAML) document listing
+field checks. Each check names the Transaction field it looks at, the issue
+it reports and one of these kinds:
+
+- ``required``: fails when the value is missing or blank
+- ``decimal``: fails when a present amount is not a valid decimal number
+- ``compare``: fails when a present, valid amount satisfies ``op``
+  (``<``, ``<=``, ``==``, ``!=``, ``>``, ``>=``) against ``bound``
+- ``one_of``: fails when a present value is not in ``values``;
+  ``ignore_case`` compares lowercased values and ``allow_blank`` skips
+  whitespace-only values
+- ``timestamp``: fails when a present value is not an ISO 8601 timestamp
+- ``pattern``: fails when a present value, stripped, does not fully match
+  the regular expression ``pattern``
+- ``digits``: fails when a present value, stripped, is not ``prefix``
+  (default empty) followed by one or more characters for which
+  ``str.isdigit`` holds
+
+``decimal`` and ``compare`` apply to decimal fields (``amount``), the other
+value checks to text fields. In a message, ``{values}`` is replaced with the
+``one_of`` values joined by commas. Issue values are the field value as
+text, or ``null_text`` (default ``null``) when it is missing.
+
+Example spec::
+    
+    {
+      "name": "tenant-eu",
+      "checks": [
+        {"name": "missing_amount", "field": "amount", "kind": "required",
+         "rule": "completeness", "severity": "HIGH", "message": "Amount is required"},
+        {"name": "eu_currency", "field": "currency", "kind": "one_of",
+         "values": ["EUR", "CHF"], "rule": "format", "severity": "MEDIUM",
+         "message": "Currency must be one of {values}"}
+      ]
+    }
+
+``RuleSet`` compiles the checks once into a single generated Python function
+that reads each field once, parses each amount once and evaluates every
+check inline, so a spec with many tenant rules costs no call per rule. Checks
+are reported in spec order.
+
+Example:
+    >>> rules = RuleSet.from_file(Path("rules/tenant-eu.json"))
+    >>> [issue.message for issue in rules.validate(transaction)]
+    ['Currency must be one of EUR, CHF']
+"""
+
+import json
+import operator
+import re
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import yaml
+except ImportError:  # pragma: no cover - exercised when PyYAML is absent
+    yaml = None
+
+from src.common.timestamps import is_valid_timestamp
+
+from .schemas import Severity, Transaction, ValidationIssue
+
+
+REQUIRED = "required"
+DECIMAL = "decimal"
+COMPARE = "compare"
+ONE_OF = "one_of"
+TIMESTAMP = "timestamp"
+PATTERN = "pattern"
+DIGITS = "digits"
+
+KINDS = (REQUIRED, DECIMAL, COMPARE, ONE_OF, TIMESTAMP, PATTERN, DIGITS)
+
+OPERATORS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+FIELDS = tuple(Transaction.model_fields)
+DECIMAL_FIELDS = tuple(
+    name for name, info in Transaction.model_fields.items() if info.annotation == Optional[Decimal]
+)
+
+# Keys of a check entry in a spec
+_REQUIRED_KEYS = ("name", "field", "rule", "severity", "message")
+_OPTIONAL_KEYS = ("kind", "values", "ignore_case", "allow_blank", "op", "bound", "pattern", "prefix", "null_text")
+
+# Marks an amount that is present but not a valid decimal
+_INVALID = object()
+
+
+class Check:
+    """One declared field check and the issue it reports.
+    
+    The message is rendered when the check is created; an issue's ``value``
+    is formatted from the raw field value only when the issue is built.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        field: str,
+        rule: str,
+        severity: Severity,
+        message: str,
+        kind: str = REQUIRED,
+        values: Sequence[str] = (),
+        ignore_case: bool = False,
+        allow_blank: bool = False,
+        op: Optional[str] = None,
+        bound: Optional[Decimal] = None,
+        pattern: Optional[str] = None,
+        prefix: str = "",
+        null_text: str = "null"
+    ):
+        """Create a check.
+        
+        Args:
+            name: Unique name of the check within its rule set
+            field: Transaction field the check looks at
+            rule: Rule name reported on issues (e.g. completeness)
+            severity: Issue severity
+            message: Issue message (``{values}`` is replaced for one_of)
+            kind: One of KINDS
+            values: Allowed values (one_of)
+            ignore_case: Compare lowercased values (one_of)
+            allow_blank: Skip whitespace-only values (one_of)
+            op: Comparison operator, a key of OPERATORS (compare)
+            bound: Right-hand side of the comparison (compare)
+            pattern: Regular expression a valid value fully matches (pattern)
+            prefix: Text a valid value starts with, before its digits (digits)
+            null_text: Issue value when the field is missing
+            
+        Raises:
+            ValueError: If the kind, field or kind options are invalid
+        """
+        if kind not in KINDS:
+            raise ValueError(f"Check {name!r}: unknown kind {kind!r}. Expected one of {', '.join(KINDS)}")
+        if field not in FIELDS:
+            raise ValueError(f"Check {name!r}: unknown field {field!r}. Expected one of {', '.join(FIELDS)}")
+        if kind in (DECIMAL, COMPARE) and field not in DECIMAL_FIELDS:
+            raise ValueError(f"Check {name!r}: {kind} checks apply to {', '.join(DECIMAL_FIELDS)}, not {field!r}")
+        if kind in (ONE_OF, TIMESTAMP, PATTERN, DIGITS) and field in DECIMAL_FIELDS:
+            raise ValueError(f"Check {name!r}: {kind} checks apply to text fields, not {field!r}")
+        if kind == COMPARE and (op not in OPERATORS or bound is None):
+            raise ValueError(f"Check {name!r}: compare needs an op ({', '.join(OPERATORS)}) and a bound")
+        if kind == ONE_OF and (not values or isinstance(values, str)):
+            raise ValueError(f"Check {name!r}: one_of needs a list of values")
+        if kind == PATTERN and not pattern:
+            raise ValueError(f"Check {name!r}: pattern needs a pattern")
+        if not isinstance(prefix, str):
+            raise ValueError(f"Check {name!r}: prefix must be text, not {prefix!r}")
+        
+        self.bound = parse_decimal(bound) if bound is not None else None
+        if self.bound is _INVALID or (self.bound is not None and not self.bound.is_finite()):
+            raise ValueError(f"Check {name!r}: bound must be a finite number, not {bound!r}")
+        try:
+            self.severity = Severity(severity)
+            self._fullmatch = re.compile(pattern).fullmatch if pattern else None
+        except (ValueError, re.error) as e:
+            raise ValueError(f"Check {name!r}: {e}") from None
+        
+        self.name = name
+        self.field = field
+        self.rule = rule
+        self.kind = kind
+        self.values = tuple(str(value) for value in values)
+        self.ignore_case = ignore_case
+        self.allow_blank = allow_blank
+        self.op = op
+        self.pattern = pattern
+        self.prefix = prefix
+        self.null_text = null_text
+        self.message = message.replace("{values}", ", ".join(self.values)) if kind == ONE_OF else message
+        
+        self.members = frozenset(value.lower() for value in self.values) if ignore_case else frozenset(self.values)
+    
+    @classmethod
+    def from_dict(cls, entry: dict) -> "Check":
+        """Create a check from its spec entry.
+        
+        Raises:
+            ValueError: If a required key is missing or the entry is invalid
+        """
+        if not isinstance(entry, dict):
+            raise ValueError(f"A check must be a mapping, not {entry!r}")
+        missing = [key for key in _REQUIRED_KEYS if key not in entry]
+        if missing:
+            raise ValueError(f"Check {entry.get('name', '?')!r} is missing {', '.join(missing)}")
+        unknown = set(entry) - set(_REQUIRED_KEYS) - set(_OPTIONAL_KEYS)
+        if unknown:
+            raise ValueError(f"Check {entry['name']!r} has unknown keys: {', '.join(sorted(unknown))}")
+        return cls(**entry)
+    
+    def fails(self, value: object) -> bool:
+        """Whether a field value fails this check.
+        
+        The compiled validator inlines the same tests; this form is used
+        where a check is evaluated on its own, e.g. once per distinct value
+        of a column.
+        """
+        if self.kind == REQUIRED:
+            return value is None or (isinstance(value, str) and not value.strip())
+        if value is None:
+            return False
+        if self.kind in (DECIMAL, COMPARE):
+            amount = parse_decimal(value)
+            if self.kind == DECIMAL:
+                return amount is _INVALID
+            return amount is not _INVALID and OPERATORS[self.op](amount, self.bound)
+        if self.kind == ONE_OF:
+            if self.allow_blank and not value.strip():
+                return False
+            return (value.lower() if self.ignore_case else value) not in self.members
+        if self.kind == TIMESTAMP:
+            return not is_valid_timestamp(value)
+        if self.kind == DIGITS:
+            text = str(value).strip()
+            return not (text.startswith(self.prefix) and text[len(self.prefix):].isdigit())
+        return self._fullmatch(str(value).strip()) is None
+    
+    def value(self, raw: object) -> str:
+        """The issue's ``value`` for a raw field value."""
+        if raw is None:
+            return self.null_text
+        if self.kind == COMPARE and isinstance(raw, str):
+            # Columnar validation passes amounts as CSV text
+            return str(Decimal(raw))
+        return str(raw)
+    
+    def issue(self, transaction_id: str, raw: object) -> ValidationIssue:
+        """The issue for a transaction that fails this check."""
+        return ValidationIssue(
+            transaction_id=transaction_id,
+            field=self.field,
+            rule=self.rule,
+            severity=self.severity,
+            message=self.message,
+            value=self.value(raw)
+        )
+
+
+def parse_decimal(value: object) -> object:
+    """An amount as a Decimal, or _INVALID if it is not a valid decimal."""
+    if isinstance(value, Decimal):
+        return value
+    try:
+        return Decimal(str(value))
+    except (InvalidOperation, ValueError):
+        return _INVALID
+
+
+class RuleSet:
+    """A named list of checks, compiled into one validator function.
+    
+    Rule sets can be pickled (e.g. to send to worker processes); the
+    validator is compiled again when unpickled.
+    """
+    
+    def __init__(self, name: str, checks: Sequence[Check]):
+        """Create and compile a rule set.
+        
+        Args:
+            name: Name of the rule set (e.g. the tenant)
+            checks: Checks, in the order their issues are reported
+            
+        Raises:
+            ValueError: If check names repeat or there are more than 256 checks
+        """
+        self.name = name
+        self.checks = list(checks)
+        self.ids = {check.name: number for number, check in enumerate(self.checks)}
+        if len(self.ids) != len(self.checks):
+            raise ValueError(f"Rule set {name!r} has repeated check names")
+        if len(self.checks) > 256:
+            raise ValueError(f"Rule set {name!r} has more than 256 checks")
+        self.source, self.evaluate = _compile(self.checks)
+    
+    @classmethod
+    def from_dict(cls, spec: dict) -> "RuleSet":
+        """Create a rule set from a parsed spec (``name`` and ``checks``).
+        
+        Raises:
+            ValueError: If the spec is invalid
+        """
+        if not isinstance(spec, dict) or not isinstance(spec.get("checks"), list):
+            raise ValueError("A rule spec must be a mapping with a list of checks")
+        return cls(spec.get("name", "custom"), [Check.from_dict(entry) for entry in spec["checks"]])
+    
+    @classmethod
+    def from_file(cls, path: Path) -> "RuleSet":
+        """Load and compile a JSON or YAML rule spec.
+        
+        Raises:
+            ValueError: If the spec is invalid
+            ImportError: If the spec is YAML and PyYAML is not installed
+        """
+        return cls.from_dict(load_spec(path))
+    
+    def check(self, name: str) -> Check:
+        """A check by name."""
+        return self.checks[self.ids[name]]
+    
+    def validate(self, transaction: Transaction, rule: Optional[str] = None) -> List[ValidationIssue]:
+        """Run the checks on a transaction.
+        
+        Args:
+            transaction: Transaction to validate
+            rule: Only report checks of this rule (e.g. completeness)
+            
+        Returns:
+            Issues for the failed checks, in spec order
+        """
+        checks = self.checks
+        return [
+            checks[number].issue(transaction.transaction_id, getattr(transaction, checks[number].field))
+            for number in self.evaluate(transaction)
+            if rule is None or checks[number].rule == rule
+        ]
+    
+    def __getstate__(self) -> dict:
+        return {"name": self.name, "checks": self.checks}
+    
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state["name"], state["checks"])
+
+
+def load_spec(path: Path) -> dict:
+    """Read a rule spec file: ``.yaml``/``.yml`` as YAML, anything else as JSON.
+    
+    Raises:
+        ValueError: If the file cannot be parsed
+        ImportError: If the spec is YAML and PyYAML is not installed
+    """
+    text = Path(path).read_text(encoding='utf-8')
+    if Path(path).suffix.lower() in (".yaml", ".yml"):
+        if yaml is None:
+            raise ImportError(f"Reading {Path(path).suffix} rule specs requires PyYAML (pip install pyyaml)")
+        try:
+            return yaml.safe_load(text)
+        except yaml.YAMLError as e:
+            raise ValueError(f"Invalid YAML in {path}: {e}") from None
+    return json.loads(text)
+
+
+def _compile(checks: Sequence[Check]) -> Tuple[str, Callable[[Transaction], List[int]]]:
+    """Generate the validator: returns (source, function).
+    
+    The function takes a Transaction and returns the numbers of the checks
+    it fails. Field names are validated against the Transaction model, and
+    every spec value (sets, bounds, patterns) is bound as a constant rather
+    than written into the source.
+    """
+    namespace: Dict[str, object] = {
+        "parse_decimal": parse_decimal,
+        "INVALID": _INVALID,
+        "is_valid_timestamp": is_valid_timestamp,
+    }
+    fields = [field for field in FIELDS if any(check.field == field for check in checks)]
+    lines = ["def evaluate(transaction):", "    failed = []"]
+    lines += [f"    {field} = transaction.{field}" for field in fields]
+    for field in fields:
+        if any(check.field == field and check.kind in (DECIMAL, COMPARE) for check in checks):
+            lines.append(f"    {field}_decimal = parse_decimal({field}) if {field} is not None else None")
+        if any(check.field == field and check.kind == DIGITS for check in checks):
+            lines.append(f"    {field}_text = str({field}).strip() if {field} is not None else None")
+    
+    for number, check in enumerate(checks):
+        value = check.field
+        if check.kind == REQUIRED:
+            condition = f"{value} is None or (isinstance({value}, str) and not {value}.strip())"
+        elif check.kind == DECIMAL:
+            condition = f"{value}_decimal is INVALID"
+        elif check.kind == COMPARE:
+            namespace[f"BOUND_{number}"] = check.bound
+            condition = (f"{value}_decimal is not None and {value}_decimal is not INVALID"
+                         f" and {value}_decimal {check.op} BOUND_{number}")
+        elif check.kind == ONE_OF:
+            namespace[f"MEMBERS_{number}"] = check.members
+            condition = f"{value} is not None"
+            if check.allow_blank:
+                condition += f" and {value}.strip() != ''"
+            condition += f" and {value}{'.lower()' if check.ignore_case else ''} not in MEMBERS_{number}"
+        elif check.kind == TIMESTAMP:
+            condition = f"{value} is not None and not is_valid_timestamp({value})"
+        elif check.kind == DIGITS:
+            namespace[f"PREFIX_{number}"] = check.prefix
+            condition = (f"{value}_text is not None and not ({value}_text.startswith(PREFIX_{number})"
+                         f" and {value}_text[{len(check.prefix)}:].isdigit())")
+        else:
+            namespace[f"FULLMATCH_{number}"] = check._fullmatch
+            condition = f"{value} is not None and FULLMATCH_{number}(str({value}).strip()) is None"
+        lines += [f"    # {check.name!r}", f"    if {condition}:", f"        failed.append({number})"]
+    
+    lines.append("    return failed")
+    source = "\n".join(lines) + "\n"
+    exec(compile(source, "<data-quality rules>", "exec"), namespace)
+    return source, namespace["evaluate"]
@@ -2,8 +2,8 @@
 
 from datetime import datetime
 from decimal import Decimal
-from typing import List, Optional
-from pydantic import BaseModel, Field
+from typing import Optional, Sequence
+from pydantic import BaseModel, Field, field_serializer
 from enum import Enum
 
 
@@ -36,11 +36,28 @@ class ValidationIssue(BaseModel):
 
 
 class ValidationReport(BaseModel):
-    """Aggregated validation report."""
+    """Aggregated validation report.
+    
+    ``issues`` is a list, or an ``IssueStore`` (see issues.py) when the
+    report is built by run_validation; a store is serialized from its
+    compact records without building ValidationIssue objects.
+    """
     total_transactions: int
     valid_transactions: int
     invalid_transactions: int
-    issues: List[ValidationIssue]
+    issues: Sequence[ValidationIssue]
     issues_by_severity: dict
     issues_by_rule: dict
     timestamp: datetime = Field(default_factory=datetime.now)
+    
+    @field_serializer("issues", mode="wrap")
+    def _serialize_issues(self, issues, handler, info):
+        records = getattr(issues, "records", None)
+        if records is None:
+            return handler(issues)
+        return records(json=info.mode == "json")
+
+
+class StreamingValidationReport(ValidationReport):
+    """Report from streaming validation: issues live in an NDJSON file."""
+    issues_file: str
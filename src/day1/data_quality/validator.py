@@ -1,13 +1,58 @@
 """Main validation orchestrator."""
 
-import csv
 import json
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import Dict, Iterator, List, Optional, Tuple
 from collections import defaultdict
 
-from .schemas import Transaction, ValidationIssue, ValidationReport, Severity
-from .rules import validate_transaction
+from src.common.csvscan import CsvScanner
+
+from .schemas import (
+    StreamingValidationReport,
+    Transaction,
+    ValidationIssue,
+    ValidationReport,
+)
+from .rules import DEFAULT_RULES
+from .rulespec import RuleSet
+from .columnar import validate_csv_columnar
+from .issues import IssueStore
+
+
+# Issues are written through a small buffer; nothing else is kept per row
+_ISSUE_BUFFER_SIZE = 1 << 16
+
+# Chunks per worker process in parallel validation
+_CHUNKS_PER_WORKER = 4
+
+# Validation engines: per-row Transaction objects, or column-wise masks
+ENGINES = ("row", "columnar")
+
+
+def iter_transactions(
+    csv_path: Path,
+    start: Optional[int] = None,
+    end: Optional[int] = None
+) -> Iterator[Transaction]:
+    """Stream transactions from CSV file, one row at a time.
+    
+    Args:
+        csv_path: Path to CSV file
+        start: First byte of a chunk to read (see ``CsvScanner.chunks``)
+        end: End of the chunk (default: all rows)
+        
+    Yields:
+        Transaction objects in file order
+    """
+    with CsvScanner(csv_path) as scanner:
+        columns = scanner.columns
+        for fields in scanner.rows(start, end):
+            # Convert empty strings to None
+            cleaned_row = {k: (v if v and v.strip() else None) for k, v in zip(columns, fields)}
+            yield Transaction(**cleaned_row)
 
 
 def load_transactions(csv_path: Path) -> List[Transaction]:
@@ -19,16 +64,53 @@ def load_transactions(csv_path: Path) -> List[Transaction]:
     Returns:
         List of Transaction objects
     """
-    transactions = []
+    return list(iter_transactions(csv_path))
+
+
+class ValidationStats:
+    """Report counters updated one validated transaction at a time.
     
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            # Convert empty strings to None
-            cleaned_row = {k: (v if v.strip() else None) for k, v in row.items()}
-            transactions.append(Transaction(**cleaned_row))
+    Used by streaming validation, which never holds all transactions or
+    issues. Invalid transactions are counted per row; generate_report counts
+    distinct transaction IDs instead, which only differs when IDs repeat.
+    """
+    
+    def __init__(self):
+        """Create empty counters."""
+        self.total_transactions = 0
+        self.invalid_transactions = 0
+        self.issues_by_severity: Dict[str, int] = defaultdict(int)
+        self.issues_by_rule: Dict[str, int] = defaultdict(int)
     
-    return transactions
+    def merge(self, other: "ValidationStats") -> None:
+        """Add the counters of another chunk of rows."""
+        self.total_transactions += other.total_transactions
+        self.invalid_transactions += other.invalid_transactions
+        for mine, theirs in ((self.issues_by_severity, other.issues_by_severity),
+                             (self.issues_by_rule, other.issues_by_rule)):
+            for key, count in theirs.items():
+                mine[key] += count
+    
+    def add(self, issues: List[ValidationIssue]) -> None:
+        """Count one transaction and its validation issues."""
+        self.total_transactions += 1
+        if issues:
+            self.invalid_transactions += 1
+        for issue in issues:
+            self.issues_by_severity[issue.severity.value] += 1
+            self.issues_by_rule[issue.rule] += 1
+    
+    def to_report(self, issues_file: Path) -> "StreamingValidationReport":
+        """Report with the counters; issues are in ``issues_file``."""
+        return StreamingValidationReport(
+            total_transactions=self.total_transactions,
+            valid_transactions=self.total_transactions - self.invalid_transactions,
+            invalid_transactions=self.invalid_transactions,
+            issues=[],
+            issues_by_severity=dict(self.issues_by_severity),
+            issues_by_rule=dict(self.issues_by_rule),
+            issues_file=str(issues_file)
+        )
 
 
 def generate_report(
@@ -44,6 +126,10 @@ def generate_report(
     Returns:
         ValidationReport with aggregated statistics
     """
+    return _build_report(len(transactions), all_issues)
+
+
+def _build_report(total_transactions: int, all_issues: List[ValidationIssue]) -> ValidationReport:
     # Count transactions with issues
     transactions_with_issues = set(issue.transaction_id for issue in all_issues)
     
@@ -58,8 +144,8 @@ def generate_report(
         issues_by_rule[issue.rule] += 1
     
     return ValidationReport(
-        total_transactions=len(transactions),
-        valid_transactions=len(transactions) - len(transactions_with_issues),
+        total_transactions=total_transactions,
+        valid_transactions=total_transactions - len(transactions_with_issues),
         invalid_transactions=len(transactions_with_issues),
         issues=all_issues,
         issues_by_severity=dict(issues_by_severity),
@@ -67,6 +153,21 @@ def generate_report(
     )
 
 
+def _store_report(total_transactions: int, store: IssueStore) -> ValidationReport:
+    """Report over an IssueStore; issues stay compact until serialized."""
+    invalid = store.transactions_with_issues()
+    # Every field is computed here, so skip validation (which would build
+    # a ValidationIssue per stored issue)
+    return ValidationReport.model_construct(
+        total_transactions=total_transactions,
+        valid_transactions=total_transactions - invalid,
+        invalid_transactions=invalid,
+        issues=store,
+        issues_by_severity=store.count_by_severity(),
+        issues_by_rule=store.count_by_rule()
+    )
+
+
 def write_report(report: ValidationReport, output_path: Path) -> None:
     """Write validation report to JSON file.
     
@@ -80,29 +181,153 @@ def write_report(report: ValidationReport, output_path: Path) -> None:
         json.dump(report.model_dump(mode='json'), f, indent=2, default=str)
 
 
-def run_validation(input_csv: Path, output_json: Path) -> ValidationReport:
+def _validate_chunk(chunk: Tuple[Path, int, int, str, RuleSet]) -> Tuple[int, IssueStore]:
+    """Validate one byte range of the file (executed in a worker process)."""
+    csv_path, start, end, engine, rules = chunk
+    if engine == "columnar":
+        return validate_csv_columnar(csv_path, start, end, rules)
+    
+    total = 0
+    store = IssueStore(rules)
+    for total, transaction in enumerate(iter_transactions(csv_path, start, end), start=1):
+        store.add_transaction(total - 1, transaction)
+    return total, store
+
+
+def _chunks(csv_path: Path, workers: int) -> List[Tuple[Path, int, int]]:
+    """Line-aligned byte ranges, a few per worker to even out the load."""
+    with CsvScanner(csv_path) as scanner:
+        return [(csv_path, start, end) for start, end in scanner.chunks(workers * _CHUNKS_PER_WORKER)]
+
+
+def run_validation(
+    input_csv: Path,
+    output_json: Path,
+    workers: int = 1,
+    engine: str = "row",
+    rules: Optional[RuleSet] = None
+) -> ValidationReport:
     """Run complete validation pipeline.
     
+    All rules are per-row, so with workers > 1 the file is split into
+    byte-range chunks aligned on line boundaries and the chunks are
+    validated in a process pool. Issues are merged in chunk (file) order,
+    so the report is identical to a single-process run.
+    
+    The ``columnar`` engine (see ``columnar``) reads each chunk column by
+    column and evaluates the rules as masks over whole columns instead of
+    building a Transaction per row; it reports the same issues.
+    
     Args:
         input_csv: Path to input CSV file
         output_json: Path to output JSON report
-        
+        workers: Number of worker processes (default 1)
+        engine: ``row`` (default) or ``columnar``
+        rules: Rule set to check, e.g. a tenant's spec loaded with
+            ``RuleSet.from_file`` (default: the built-in rules)
+            
     Returns:
         ValidationReport with results
+        
+    Raises:
+        ValueError: If the engine is unknown
     """
-    # Load transactions
-    transactions = load_transactions(input_csv)
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown validation engine: {engine!r}. Expected one of {', '.join(ENGINES)}")
+    rules = rules or DEFAULT_RULES
+    
+    if workers > 1:
+        total = 0
+        store = IssueStore(rules)
+        chunks = [(csv_path, start, end, engine, rules) for csv_path, start, end in _chunks(input_csv, workers)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for chunk_total, chunk_store in executor.map(_validate_chunk, chunks):
+                store.extend(chunk_store, row_offset=total)
+                total += chunk_total
+    else:
+        total, store = _validate_chunk((input_csv, None, None, engine, rules))
+    
+    # Issues are recorded compactly and only rendered when the report is written
+    report = _store_report(total, store)
+    write_report(report, output_json)
     
-    # Validate all transactions
-    all_issues = []
-    for transaction in transactions:
-        issues = validate_transaction(transaction)
-        all_issues.extend(issues)
+    return report
+
+
+def default_issues_path(output_json: Path) -> Path:
+    """Sidecar path for streamed issues: ``<report>.issues.ndjson``."""
+    return output_json.with_name(f"{output_json.stem}.issues.ndjson")
+
+
+def _stream_chunk(chunk: Tuple[Path, int, int, Path, RuleSet]) -> ValidationStats:
+    """Validate one byte range, writing its issues to a part file."""
+    csv_path, start, end, part_path, rules = chunk
+    stats = ValidationStats()
+    with open(part_path, 'w', encoding='utf-8', buffering=_ISSUE_BUFFER_SIZE) as issues_file:
+        for transaction in iter_transactions(csv_path, start, end):
+            issues = rules.validate(transaction)
+            stats.add(issues)
+            for issue in issues:
+                issues_file.write(issue.model_dump_json())
+                issues_file.write("\n")
+    return stats
+
+
+def run_streaming_validation(
+    input_csv: Path,
+    output_json: Path,
+    issues_path: Optional[Path] = None,
+    workers: int = 1,
+    rules: Optional[RuleSet] = None
+) -> StreamingValidationReport:
+    """Run validation in constant memory.
+    
+    Rows are validated as they are read and only counters are kept; each
+    issue is written to an NDJSON sidecar as soon as it is found (one
+    ``ValidationIssue`` object per line, in the order run_validation lists
+    them). The JSON report has the same counters as run_validation's, an
+    empty ``issues`` list and the sidecar path in ``issues_file``.
+    
+    Args:
+        input_csv: Path to input CSV file
+        output_json: Path to output JSON report
+        issues_path: Path of the NDJSON issues file
+            (default: ``<report>.issues.ndjson`` next to the report)
+        workers: Number of worker processes (default 1). Each validates
+            byte-range chunks into its own part file; parts are appended
+            to the sidecar in file order
+        rules: Rule set to check (default: the built-in rules)
+        
+    Returns:
+        StreamingValidationReport with the counters
+        
+    Example:
+        >>> report = run_streaming_validation(Path("extract.csv"), Path("out/report.json"))
+        >>> report.issues_file
+        'out/report.issues.ndjson'
+    """
+    issues_path = issues_path or default_issues_path(output_json)
+    rules = rules or DEFAULT_RULES
+    issues_path.parent.mkdir(parents=True, exist_ok=True)
     
-    # Generate report
-    report = generate_report(transactions, all_issues)
+    if workers > 1:
+        stats = ValidationStats()
+        with tempfile.TemporaryDirectory(dir=issues_path.parent) as parts_dir:
+            chunks = [
+                (csv_path, start, end, Path(parts_dir) / f"part-{number:05d}.ndjson", rules)
+                for number, (csv_path, start, end) in enumerate(_chunks(input_csv, workers))
+            ]
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for chunk_stats in executor.map(_stream_chunk, chunks):
+                    stats.merge(chunk_stats)
+            with open(issues_path, 'wb') as issues_file:
+                for chunk in chunks:
+                    with open(chunk[3], 'rb') as part:
+                        shutil.copyfileobj(part, issues_file)
+    else:
+        stats = _stream_chunk((input_csv, None, None, issues_path, rules))
     
-    # Write report
+    report = stats.to_report(issues_path)
     write_report(report, output_json)
     
     return report
@@ -0,0 +1,113 @@
+"""Persistent index of (account_id, beneficiary_id) pairs already paid.
+
+Backs the NEW_BENEFICIARY rule. Known pairs are kept in an on-disk SQLite
+table keyed on the pair (stdlib ``sqlite3``), so the history survives
+between runs and only SQLite's page cache is held in memory.
+``check_and_add`` is a single ``INSERT OR IGNORE`` into the primary-key
+B-tree whose row count tells whether the pair was new, so it stays fast
+with tens of millions of pairs.
+
+An index directory holds ``pairs.sqlite3``, the SQLite database of known
+pairs. New pairs are committed every ``_COMMIT_EVERY`` inserts and on close.
+"""
+
+import contextlib
+import sqlite3
+from pathlib import Path
+from typing import ContextManager, Optional, Tuple
+
+
+# Commit batch size: new pairs inserted per SQLite transaction (a crash
+# loses at most the pairs of the current batch)
+_COMMIT_EVERY = 50_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pairs (
+    account_id TEXT NOT NULL,
+    beneficiary_id TEXT NOT NULL,
+    PRIMARY KEY (account_id, beneficiary_id)
+) WITHOUT ROWID
+"""
+
+
+class BeneficiaryIndex:
+    """On-disk set of (account_id, beneficiary_id) pairs in SQLite.
+    
+    Example:
+        >>> with BeneficiaryIndex(Path("state/beneficiaries")) as index:
+        ...     index.check_and_add("ACC001", "BEN123")
+        ...     index.check_and_add("ACC001", "BEN123")
+        True
+        False
+    """
+    
+    def __init__(self, path: Path):
+        """Open (or create) an index directory.
+        
+        Args:
+            path: Index directory
+        """
+        self.path = path
+        path.mkdir(parents=True, exist_ok=True)
+        
+        self._store = sqlite3.connect(str(path / "pairs.sqlite3"))
+        self._store.execute("PRAGMA journal_mode=WAL")
+        self._store.execute("PRAGMA synchronous=NORMAL")
+        self._store.execute(_SCHEMA)
+        self._store.commit()
+        self._pending = 0
+    
+    def __contains__(self, pair: Tuple[str, str]) -> bool:
+        return self._store.execute(
+            "SELECT 1 FROM pairs WHERE account_id = ? AND beneficiary_id = ?", pair
+        ).fetchone() is not None
+    
+    def add(self, account_id: str, beneficiary_id: str) -> None:
+        """Record a pair as seen (e.g. when seeding from historical data)."""
+        self.check_and_add(account_id, beneficiary_id)
+    
+    def check_and_add(self, account_id: str, beneficiary_id: str) -> bool:
+        """Record a pair, returning True if it had not been seen before."""
+        cursor = self._store.execute(
+            "INSERT OR IGNORE INTO pairs (account_id, beneficiary_id) VALUES (?, ?)",
+            (account_id, beneficiary_id)
+        )
+        if cursor.rowcount == 0:
+            return False
+        
+        self._pending += 1
+        if self._pending >= _COMMIT_EVERY:
+            self._store.commit()
+            self._pending = 0
+        return True
+    
+    def __len__(self) -> int:
+        (count,) = self._store.execute("SELECT COUNT(*) FROM pairs").fetchone()
+        return count
+    
+    def close(self) -> None:
+        """Commit and close the store."""
+        if self._store is None:
+            return
+        
+        self._store.commit()
+        self._store.close()
+        self._store = None
+    
+    def __enter__(self) -> "BeneficiaryIndex":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+def open_beneficiary_index(path: Optional[Path]) -> ContextManager[Optional[BeneficiaryIndex]]:
+    """Open the index at ``path``, or yield None when the rule is disabled.
+    
+    Example:
+        >>> with open_beneficiary_index(args.beneficiary_index) as beneficiaries:
+        ...     alerts = generate_alerts(transactions, beneficiaries)
+    """
+    if path is None:
+        return contextlib.nullcontext()
+    return BeneficiaryIndex(path)
@@ -2,13 +2,32 @@
 
 Usage:
     python -m src.day2.aml_triage.cli --input <csv_path> --outdir <output_directory>
+    python -m src.day2.aml_triage.cli --input <csv_path> --outdir <output_directory> --stream
+    python -m src.day2.aml_triage.cli --input <csv_path> --outdir <output_directory> --external-sort
+    python -m src.day2.aml_triage.cli --input <csv_path> --outdir <output_directory> --state <state_file>
+    python -m src.day2.aml_triage.cli --input <csv_path> --outdir <output_directory> --profile --cprofile <stats_file>
 """
 
 import argparse
+import cProfile
 import sys
 from pathlib import Path
 
-from . import pipeline
+from . import io, pipeline, state, streaming
+from .extsort import DEFAULT_RUN_SIZE
+
+
+def print_perf(perf: dict) -> None:
+    """Print the per-stage and per-rule profiling counters."""
+    print("Stage timings:")
+    for name, counters in perf['stages'].items():
+        print(f"  {name:<8} {counters['wall_seconds']:>9.3f}s wall {counters['cpu_seconds']:>9.3f}s cpu "
+              f"{counters['rows']:>10} rows")
+    print("Rule timings:")
+    for code, counters in perf['rules'].items():
+        print(f"  {code:<16} {counters['wall_seconds']:>9.3f}s wall {counters['evaluations']:>10} evaluated "
+              f"{counters['hits']:>8} hits")
+    print()
 
 
 def main():
@@ -21,7 +40,8 @@ def main():
         '--input',
         type=Path,
         required=True,
-        help='Path to input CSV file containing transactions'
+        help='Path to input file containing transactions: CSV, or NDJSON (.ndjson/.jsonl), '
+             'Arrow IPC (.arrow/.feather) or Parquet (.parquet, needs pyarrow) by extension'
     )
     
     parser.add_argument(
@@ -31,7 +51,101 @@ def main():
         help='Output directory for results (default: out/day2/lab3)'
     )
     
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Process time-ordered input row by row with bounded memory. HIGH_VELOCITY only flags '
+             'transactions inside a burst window, so alerts differ from the default batch mode'
+    )
+    
+    parser.add_argument(
+        '--external-sort',
+        action='store_true',
+        help='Sort out-of-order input on disk, then process it in streaming mode (implies --stream; '
+             'alerts differ from batch mode)'
+    )
+    
+    parser.add_argument(
+        '--sort-run-size',
+        type=int,
+        default=DEFAULT_RUN_SIZE,
+        help=f'Rows held in memory per external sort run (default: {DEFAULT_RUN_SIZE})'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Worker processes for account-sharded rule evaluation in batch mode (default: 1)'
+    )
+    
+    parser.add_argument(
+        '--state',
+        type=Path,
+        default=None,
+        help='Checkpoint file carrying rule state between runs on consecutive files (implies --stream; '
+             'alerts differ from batch mode)'
+    )
+    
+    parser.add_argument(
+        '--finalize',
+        action='store_true',
+        help='With --state, emit alerts for all pending transactions instead of carrying them over'
+    )
+    
+    parser.add_argument(
+        '--beneficiary-index',
+        type=Path,
+        default=None,
+        help='Directory of the persistent beneficiary index; enables the NEW_BENEFICIARY rule'
+    )
+    
+    parser.add_argument(
+        '--alerts-format',
+        choices=io.ALERT_FORMATS,
+        default='json',
+        help='aml_alerts.json layout: indented JSON array (default), compact array, or NDJSON'
+    )
+    
+    parser.add_argument(
+        '--top-k',
+        type=int,
+        default=None,
+        help='Only write the first N rows of triage_queue.csv (bounded heap instead of a full sort)'
+    )
+    
+    parser.add_argument(
+        '--queue-buckets',
+        action='store_true',
+        help='Also write one triage queue file per assigned queue (HIGH_RISK/MEDIUM_RISK/LOW_RISK)'
+    )
+    
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Record wall/CPU time and row counts per stage and per rule in summary.json under "perf" (batch mode)'
+    )
+    
+    parser.add_argument(
+        '--cprofile',
+        type=Path,
+        default=None,
+        help='Also run under cProfile and write the statistics (pstats format) to this file'
+    )
+    
     args = parser.parse_args()
+    if args.external_sort or args.state:
+        args.stream = True
+    if args.finalize and not args.state:
+        parser.error("--finalize requires --state")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.stream and args.workers > 1:
+        parser.error("--workers is only supported in batch mode")
+    if args.top_k is not None and args.top_k < 1:
+        parser.error("--top-k must be at least 1")
+    if args.stream and args.profile:
+        parser.error("--profile is only supported in batch mode")
     
     # Validate input file exists
     if not args.input.exists():
@@ -42,17 +156,70 @@ def main():
     print(f"=" * 50)
     print(f"Input file: {args.input}")
     print(f"Output directory: {args.outdir}")
+    if args.stream:
+        print(f"Mode: streaming{' (external sort)' if args.external_sort else ''}")
+        if args.state:
+            print(f"State file: {args.state}")
+    elif args.workers > 1:
+        print(f"Workers: {args.workers}")
+    if args.beneficiary_index:
+        print(f"Beneficiary index: {args.beneficiary_index}")
     print()
     
+    profiler = cProfile.Profile() if args.cprofile else None
     try:
+        if profiler is not None:
+            profiler.enable()
+        
         # Run pipeline
-        summary = pipeline.run_pipeline(args.input, args.outdir)
+        if args.state:
+            summary = state.run_incremental_pipeline(
+                args.input,
+                args.outdir,
+                args.state,
+                finalize=args.finalize,
+                presorted=not args.external_sort,
+                run_size=args.sort_run_size,
+                beneficiary_index=args.beneficiary_index,
+                alerts_format=args.alerts_format,
+                top_k=args.top_k,
+                queue_buckets=args.queue_buckets
+            )
+        elif args.stream:
+            summary = streaming.run_streaming_pipeline(
+                args.input,
+                args.outdir,
+                presorted=not args.external_sort,
+                run_size=args.sort_run_size,
+                beneficiary_index=args.beneficiary_index,
+                alerts_format=args.alerts_format,
+                top_k=args.top_k,
+                queue_buckets=args.queue_buckets
+            )
+        else:
+            summary = pipeline.run_pipeline(
+                args.input,
+                args.outdir,
+                workers=args.workers,
+                beneficiary_index=args.beneficiary_index,
+                alerts_format=args.alerts_format,
+                top_k=args.top_k,
+                queue_buckets=args.queue_buckets,
+                profile=args.profile
+            )
+        
+        if profiler is not None:
+            profiler.disable()
+            args.cprofile.parent.mkdir(parents=True, exist_ok=True)
+            profiler.dump_stats(str(args.cprofile))
         
         # Print summary
         print(f"✓ Pipeline completed successfully!")
         print()
         print(f"Processed {summary['total_transactions']} transactions")
         print(f"Generated {summary['total_alerts']} alerts")
+        if args.state:
+            print(f"Pending for next run: {summary['pending_transactions']} transactions")
         print()
         
         if summary['total_alerts'] > 0:
@@ -63,13 +230,21 @@ def main():
             print(f"  P3 (Medium):   {by_priority.get('P3', 0)}")
             print()
         
+        if 'perf' in summary:
+            print_perf(summary['perf'])
+        
         print(f"Outputs written to: {args.outdir}/")
         print(f"  - aml_alerts.json")
-        print(f"  - triage_queue.csv")
+        print(f"  - triage_queue.csv{f' (top {args.top_k})' if args.top_k else ''}")
+        if args.queue_buckets:
+            for filename in io.QUEUE_BUCKET_FILES.values():
+                print(f"  - {filename}")
         print(f"  - summary.json")
+        if args.cprofile:
+            print(f"cProfile statistics written to: {args.cprofile}")
         
         return 0
-        
+    
     except Exception as e:
         print(f"Error: Pipeline failed: {e}", file=sys.stderr)
         return 1
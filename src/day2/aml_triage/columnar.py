@@ -0,0 +1,192 @@
+"""Columnar batch evaluation of stateless AML rules.
+
+ROUND_AMOUNT and HIGH_AMOUNT only look at a single transaction's amount, so
+they can be evaluated for a whole batch at once. Amounts are converted to
+fixed-point integer cents and each rule becomes a vectorized mask over the
+batch.
+
+NumPy is used when installed; otherwise the same integer arithmetic runs in
+plain Python. Results are identical to the per-transaction Decimal rules in
+``rules``: amounts that cannot be represented exactly as int64 cents (more
+than two decimal places, NaN/Infinity, or out of range) are evaluated with
+the Decimal rule itself.
+"""
+
+from decimal import Decimal, ROUND_CEILING
+from typing import TYPE_CHECKING, Dict, List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised when NumPy is absent
+    np = None
+
+if TYPE_CHECKING:
+    from .records import TxRecord
+
+
+INT64_MAX = 2 ** 63 - 1
+
+
+def to_cents(amount: Decimal) -> Tuple[int, bool]:
+    """Convert a Decimal amount to integer cents.
+    
+    Args:
+        amount: Amount to convert
+        
+    Returns:
+        Tuple of (cents, exact). ``exact`` is False when the amount has more
+        than two decimal places, is not finite, or does not fit in int64;
+        cents is 0 in that case.
+        
+    Example:
+        >>> to_cents(Decimal("5000.00"))
+        (500000, True)
+        >>> to_cents(Decimal("0.005"))
+        (0, False)
+    """
+    if not amount.is_finite() or amount.as_tuple().exponent < -2:
+        return 0, False
+    
+    cents = int(amount.scaleb(2))
+    if abs(cents) > INT64_MAX:
+        return 0, False
+    return cents, True
+
+
+def threshold_to_cents(threshold: Decimal) -> int:
+    """Convert a ``>=`` threshold to the smallest integer cents that satisfy it.
+    
+    For integer cents ``c``, ``c / 100 >= threshold`` is equivalent to
+    ``c >= ceil(threshold * 100)``.
+    
+    Example:
+        >>> threshold_to_cents(Decimal("10000"))
+        1000000
+    """
+    return int((threshold * 100).to_integral_value(rounding=ROUND_CEILING))
+
+
+class AmountColumn:
+    """Fixed-point cents for a batch of amounts.
+    
+    Example:
+        >>> column = AmountColumn.from_amounts([Decimal("5000.00"), Decimal("12.345")])
+        >>> column.round_amount_mask()
+        [True, False]
+    """
+    
+    def __init__(self, cents: List[int], inexact: Dict[int, Decimal]):
+        """Create a column from precomputed cents.
+        
+        Args:
+            cents: Integer cents per amount (ignored where inexact)
+            inexact: Position -> Decimal amount for amounts that are not
+                exactly representable as int64 cents
+        """
+        self.cents = np.array(cents, dtype=np.int64) if np is not None else cents
+        self.inexact = inexact
+    
+    @classmethod
+    def from_amounts(cls, amounts: Sequence[Decimal]) -> "AmountColumn":
+        """Build a column by converting Decimal amounts to cents."""
+        cents = []
+        inexact = {}
+        
+        for position, amount in enumerate(amounts):
+            value, exact = to_cents(amount)
+            cents.append(value)
+            if not exact:
+                inexact[position] = amount
+        
+        return cls(cents, inexact)
+    
+    @classmethod
+    def from_records(cls, records: Sequence["TxRecord"]) -> "AmountColumn":
+        """Build a column from records, which already carry integer cents."""
+        inexact = {
+            position: record.amount
+            for position, record in enumerate(records)
+            if not record.cents_exact
+        }
+        return cls([record.amount_cents for record in records], inexact)
+    
+    def round_amount_mask(self) -> List[bool]:
+        """Mask of amounts divisible by 100 (ROUND_AMOUNT).
+        
+        Returns:
+            One bool per amount, equal to ``amount % 100 == 0``
+        """
+        if np is not None:
+            mask = (self.cents % 10000 == 0).tolist()
+        else:
+            mask = [c % 10000 == 0 for c in self.cents]
+        
+        for position, amount in self.inexact.items():
+            mask[position] = amount % 100 == 0
+        return mask
+    
+    def threshold_mask(self, threshold: Decimal) -> List[bool]:
+        """Mask of amounts at or above a threshold (HIGH_AMOUNT and friends).
+        
+        Args:
+            threshold: Inclusive lower bound
+            
+        Returns:
+            One bool per amount, equal to ``amount >= threshold``
+        """
+        threshold_cents = threshold_to_cents(threshold)
+        if np is not None and abs(threshold_cents) <= INT64_MAX:
+            mask = (self.cents >= threshold_cents).tolist()
+        else:
+            mask = [c >= threshold_cents for c in self.cents]
+        
+        for position, amount in self.inexact.items():
+            mask[position] = amount >= threshold
+        return mask
+
+
+def evaluate_stateless(
+    amounts: Sequence[Decimal],
+    high_amount_threshold: Decimal = Decimal("10000")
+) -> Tuple[List[bool], List[bool]]:
+    """Evaluate ROUND_AMOUNT and HIGH_AMOUNT for a batch of amounts.
+    
+    Args:
+        amounts: Transaction amounts
+        high_amount_threshold: HIGH_AMOUNT threshold (default 10000)
+        
+    Returns:
+        Tuple of (round_amount mask, high_amount mask)
+        
+    Example:
+        >>> evaluate_stateless([Decimal("15000.00"), Decimal("99.99")])
+        ([True, False], [True, False])
+    """
+    column = AmountColumn.from_amounts(amounts)
+    return column.round_amount_mask(), column.threshold_mask(high_amount_threshold)
+
+
+def evaluate_stateless_records(
+    records: Sequence["TxRecord"],
+    high_amount_threshold: Decimal = Decimal("10000")
+) -> Tuple[List[bool], List[bool]]:
+    """Evaluate ROUND_AMOUNT and HIGH_AMOUNT for a batch of records.
+    
+    Same as evaluate_stateless, without converting amounts back to Decimal.
+    """
+    column = AmountColumn.from_records(records)
+    return column.round_amount_mask(), column.threshold_mask(high_amount_threshold)
+
+
+def is_round_amount(record: "TxRecord") -> bool:
+    """ROUND_AMOUNT for a single record (streaming path)."""
+    if record.cents_exact:
+        return record.amount_cents % 10000 == 0
+    return record.amount % 100 == 0
+
+
+def meets_threshold(record: "TxRecord", threshold: Decimal) -> bool:
+    """``amount >= threshold`` for a single record (streaming path)."""
+    if record.cents_exact:
+        return record.amount_cents >= threshold_to_cents(threshold)
+    return record.amount >= threshold
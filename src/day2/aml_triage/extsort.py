@@ -0,0 +1,195 @@
+"""External merge sort for inputs larger than memory.
+
+Items are collected into runs of at most ``run_size`` items. Each run is
+sorted in memory and spilled to a temporary file; the runs are then
+k-way merged with ``heapq.merge``. At most ``fan_in`` runs are open at a
+time: with more runs, consecutive groups are first merged into
+intermediate run files, in as many passes as needed. Sorting is stable, so
+the result is identical to ``sorted(items, key=key)``.
+
+Used to order out-of-order transaction files before streaming triage and to
+build the triage queue without holding every row in memory.
+"""
+
+import heapq
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, List, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+DEFAULT_RUN_SIZE = 100_000
+
+# Run files open at once while merging; well below the usual 1024 file limit
+DEFAULT_FAN_IN = 256
+
+
+class ExternalSorter:
+    """Accumulate items and return them sorted, spilling runs to disk.
+    
+    Inputs that fit in a single run are sorted in memory without touching
+    disk. Otherwise every full run is sorted and written to a temporary file
+    as pickled ``(key, item)`` pairs, and the runs are merged lazily when
+    the sorted output is read, after merging groups of ``fan_in`` runs
+    into longer runs until at most ``fan_in`` remain. Run files are removed
+    by ``close()``.
+    
+    Example:
+        >>> with ExternalSorter(key=lambda row: row[0], run_size=2) as sorter:
+        ...     for row in [(3, "c"), (1, "a"), (2, "b")]:
+        ...         sorter.add(row)
+        ...     list(sorter.sorted())
+        [(1, 'a'), (2, 'b'), (3, 'c')]
+    """
+    
+    def __init__(
+        self,
+        key: Callable[[T], Any],
+        run_size: int = DEFAULT_RUN_SIZE,
+        tmp_dir: Optional[Path] = None,
+        fan_in: int = DEFAULT_FAN_IN
+    ):
+        if run_size < 1:
+            raise ValueError(f"run_size must be positive, got {run_size}")
+        if fan_in < 2:
+            raise ValueError(f"fan_in must be at least 2, got {fan_in}")
+        self.key = key
+        self.run_size = run_size
+        self.fan_in = fan_in
+        self.tmp_dir = tmp_dir
+        self.count = 0
+        self._buffer: List[tuple] = []
+        self._run_paths: List[Path] = []
+        self._runs_written = 0
+        self._work_dir: Optional[tempfile.TemporaryDirectory] = None
+    
+    def add(self, item: T) -> None:
+        """Add one item, spilling a sorted run if the buffer is full."""
+        self._buffer.append((self.key(item), item))
+        self.count += 1
+        if len(self._buffer) >= self.run_size:
+            self._spill()
+    
+    def sorted(self) -> Iterator[T]:
+        """Yield all added items in ascending key order, ties in add order."""
+        if not self._run_paths:
+            self._buffer.sort(key=lambda pair: pair[0])
+            for _, item in self._buffer:
+                yield item
+            return
+        
+        if self._buffer:
+            self._spill()
+        while len(self._run_paths) > self.fan_in:
+            self._merge_pass()
+        
+        for _, item in _merge_runs(self._run_paths):
+            yield item
+    
+    def close(self) -> None:
+        """Remove any run files."""
+        self._buffer = []
+        self._run_paths = []
+        if self._work_dir is not None:
+            self._work_dir.cleanup()
+            self._work_dir = None
+    
+    def __enter__(self) -> "ExternalSorter":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+    
+    def _spill(self) -> None:
+        """Sort the buffered run and write it to a temporary file."""
+        if self._work_dir is None:
+            self._work_dir = tempfile.TemporaryDirectory(dir=self.tmp_dir, prefix="aml_sort_")
+        
+        _write_run(self._buffer, self._new_run_path())
+        self._buffer = []
+    
+    def _new_run_path(self) -> Path:
+        """Register the path of the next run file."""
+        self._runs_written += 1
+        path = Path(self._work_dir.name) / f"run_{self._runs_written:06d}.pkl"
+        self._run_paths.append(path)
+        return path
+    
+    def _merge_pass(self) -> None:
+        """Merge consecutive groups of ``fan_in`` runs into longer runs.
+        
+        Groups keep their order, so ties stay in add order.
+        """
+        paths, self._run_paths = self._run_paths, []
+        for start in range(0, len(paths), self.fan_in):
+            group = paths[start:start + self.fan_in]
+            if len(group) == 1:
+                self._run_paths.append(group[0])
+                continue
+            with open(self._new_run_path(), 'wb') as f:
+                for pair in _merge_runs(group):
+                    pickle.dump(pair, f, protocol=pickle.HIGHEST_PROTOCOL)
+            for path in group:
+                path.unlink()
+
+
+def external_sort(
+    items: Iterable[T],
+    key: Callable[[T], Any],
+    run_size: int = DEFAULT_RUN_SIZE,
+    tmp_dir: Optional[Path] = None,
+    fan_in: int = DEFAULT_FAN_IN
+) -> Iterator[T]:
+    """Sort items with memory bounded by ``run_size``.
+    
+    Args:
+        items: Items to sort (must be picklable)
+        key: Sort key function
+        run_size: Maximum number of items held in memory at once
+        tmp_dir: Directory for run files (default: system temp dir)
+        fan_in: Maximum number of run files open at once while merging
+        
+    Yields:
+        Items in ascending key order, ties in input order
+        
+    Raises:
+        ValueError: If run_size is not positive or fan_in is below 2
+        
+    Example:
+        >>> list(external_sort([3, 1, 2], key=lambda x: x, run_size=2))
+        [1, 2, 3]
+    """
+    with ExternalSorter(key, run_size, tmp_dir, fan_in) as sorter:
+        for item in items:
+            sorter.add(item)
+        yield from sorter.sorted()
+
+
+def _write_run(buffer: List[tuple], path: Path) -> None:
+    """Sort one run in memory and write it to a file."""
+    buffer.sort(key=lambda pair: pair[0])
+    with open(path, 'wb') as f:
+        for pair in buffer:
+            pickle.dump(pair, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _merge_runs(paths: List[Path]) -> Iterator[tuple]:
+    """Merge run files into one stream of ``(key, item)`` pairs."""
+    runs = [_read_run(path) for path in paths]
+    try:
+        yield from heapq.merge(*runs, key=lambda pair: pair[0])
+    finally:
+        for run in runs:
+            run.close()
+
+
+def _read_run(path: Path) -> Iterator[tuple]:
+    """Stream ``(key, item)`` pairs back from a run file."""
+    with open(path, 'rb') as f:
+        while True:
+            try:
+                yield pickle.load(f)
+            except EOFError:
+                return
@@ -0,0 +1,166 @@
+"""Per-account transaction index for windowed AML rules.
+
+Windowed rules (HIGH_VELOCITY, RAPID_REVERSAL) only ever compare
+transactions that belong to the same account. Instead of re-filtering the
+full transaction list for every transaction, the pipeline builds this index
+once and evaluates each window with a sliding two-pointer pass over the
+account's timestamp-sorted array, or a binary search over the CREDITs sent
+between an (account_id, beneficiary_id) pair.
+"""
+
+from bisect import bisect_right
+from typing import TYPE_CHECKING, Dict, List, Sequence, Tuple
+
+from src.common.timestamps import to_epoch_micros
+
+if TYPE_CHECKING:
+    from .records import TxRecord
+
+
+def sliding_window_counts(
+    times: List[int],
+    window: int,
+    min_count: int = 3
+) -> Tuple[bool, List[int]]:
+    """Evaluate a velocity window over a sorted timestamp array in one pass.
+    
+    Two pointers track the window around each element, so the whole array
+    is processed in O(n):
+    - ``lo`` is the first element at or after ``times[i] - window``
+    - ``hi`` is the first element after ``times[i] + window``
+    
+    Args:
+        times: Timestamps sorted ascending (any integer unit)
+        window: Window size in the same unit as ``times``
+        min_count: Number of elements within a forward window that counts as a burst
+        
+    Returns:
+        Tuple of (burst detected anywhere in the array, per-element count of
+        elements within ``window`` on either side, inclusive)
+        
+    Example:
+        >>> sliding_window_counts([0, 10, 20, 200], window=60)
+        (True, [3, 3, 3, 1])
+    """
+    n = len(times)
+    counts = [0] * n
+    burst = False
+    lo = 0
+    hi = 0
+    
+    for i, current in enumerate(times):
+        while times[lo] < current - window:
+            lo += 1
+        while hi < n and times[hi] <= current + window:
+            hi += 1
+        
+        counts[i] = hi - lo
+        if hi - i >= min_count:
+            burst = True
+    
+    return burst, counts
+
+
+class AccountIndex:
+    """Account-partitioned index over a list of transaction records.
+    
+    Maps each account_id to the positions of its records in the input
+    list, sorted by timestamp, alongside a parallel array of epoch
+    microseconds. CREDIT transactions are additionally grouped by
+    (account_id, beneficiary_id) so reversal candidates can be found by
+    binary search. Built once in a single pass over the input.
+    
+    Example:
+        >>> index = AccountIndex(records)
+        >>> bursts, counts = index.velocity(window_seconds=60)
+        >>> bursts[0], counts[0]
+        (True, 4)
+    """
+    
+    def __init__(self, records: Sequence["TxRecord"]):
+        self.records = records
+        self.positions: Dict[str, List[int]] = {}
+        self.times: Dict[str, List[int]] = {}
+        self.credit_positions: Dict[Tuple[str, str], List[int]] = {}
+        self.credit_times: Dict[Tuple[str, str], List[int]] = {}
+        
+        micros = [r.timestamp_us for r in records]
+        for position, record in enumerate(records):
+            self.positions.setdefault(record.account_id, []).append(position)
+        
+        for account_id, positions in self.positions.items():
+            # Stable sort keeps input order for identical timestamps; it is a
+            # linear pass when the input is already sorted by timestamp.
+            positions.sort(key=lambda p: micros[p])
+            self.times[account_id] = [micros[p] for p in positions]
+            
+            for position in positions:
+                record = records[position]
+                if record.transaction_type == "CREDIT":
+                    pair = (account_id, record.beneficiary_id)
+                    self.credit_positions.setdefault(pair, []).append(position)
+                    self.credit_times.setdefault(pair, []).append(micros[position])
+    
+    def credits_between(
+        self,
+        account_id: str,
+        beneficiary_id: str,
+        after_us: int,
+        window_seconds: int
+    ) -> List["TxRecord"]:
+        """Find CREDITs for an account/beneficiary pair in a time window.
+        
+        Args:
+            account_id: Account to search
+            beneficiary_id: Beneficiary the credit must come from
+            after_us: Window start in epoch microseconds (exclusive)
+            window_seconds: Window length in seconds (end is inclusive)
+            
+        Returns:
+            Matching CREDIT records in timestamp order
+            
+        Example:
+            >>> index.credits_between("ACC004", "BEN130", debit.timestamp_us, 300)
+            [TxRecord('TX009', 'ACC004', ...)]
+        """
+        pair = (account_id, beneficiary_id)
+        times = self.credit_times.get(pair)
+        if not times:
+            return []
+        
+        lo = bisect_right(times, after_us)
+        hi = bisect_right(times, after_us + window_seconds * 1_000_000, lo)
+        
+        return [self.records[p] for p in self.credit_positions[pair][lo:hi]]
+    
+    def velocity(
+        self,
+        window_seconds: int = 60,
+        min_count: int = 3
+    ) -> Tuple[List[bool], List[int]]:
+        """Evaluate the velocity window for every transaction.
+        
+        Args:
+            window_seconds: Time window in seconds
+            min_count: Transactions within a window that constitute a burst
+            
+        Returns:
+            Two lists aligned with the input records:
+            - whether the transaction's account has a burst anywhere
+            - number of account transactions within ``window_seconds``
+              of the transaction (either direction, inclusive)
+        """
+        total = len(self.records)
+        bursts = [False] * total
+        counts = [0] * total
+        window = window_seconds * 1_000_000
+        
+        for account_id, positions in self.positions.items():
+            burst, account_counts = sliding_window_counts(
+                self.times[account_id], window, min_count
+            )
+            for position, count in zip(positions, account_counts):
+                bursts[position] = burst
+                counts[position] = count
+        
+        return bursts, counts
@@ -1,14 +1,26 @@
 """Input/output handlers for AML Triage Pipeline.
 
 This module handles reading transaction data and writing alert outputs.
+Transactions are read from CSV by default; NDJSON, Arrow IPC and Parquet
+inputs are recognized by file extension (see ``readers``).
 """
 
+import contextlib
 import csv
 import json
 from pathlib import Path
-from typing import List
+from typing import Iterable, Iterator, List, Optional
 
+from src.common.csvscan import CsvScanner
+from src.common.timestamps import epoch_micros
+
+from .extsort import DEFAULT_RUN_SIZE, ExternalSorter, external_sort
+from .profiling import PerfRecorder
+from .readers import iter_row_records, reader_for
+from .records import TxRecord
 from .schemas import Alert, Transaction, TriageDecision
+from .stats import TriageStats
+from .triage_queue import TopK, TriageQueueBuilder, split_by_queue
 
 
 def load_transactions(csv_path: Path) -> List[Transaction]:
@@ -29,49 +41,460 @@ def load_transactions(csv_path: Path) -> List[Transaction]:
         >>> len(transactions)
         20
     """
+    transactions = list(iter_transactions(csv_path))
+    
+    # Sort by timestamp to ensure deterministic processing
+    transactions.sort(key=lambda t: t.timestamp)
+    
+    return transactions
+
+
+def iter_transactions(csv_path: Path) -> Iterator[Transaction]:
+    """Stream transactions from CSV file one row at a time, in file order.
+    
+    Unlike load_transactions, rows are not sorted and only one row is held
+    in memory at a time.
+    
+    Args:
+        csv_path: Path to CSV file
+        
+    Yields:
+        Transaction objects in file order
+        
+    Raises:
+        FileNotFoundError: If CSV file doesn't exist
+        ValueError: If CSV format is invalid
+        
+    Example:
+        >>> for transaction in iter_transactions(Path("sample_transactions.csv")):
+        ...     print(transaction.transaction_id)
+    """
+    if not csv_path.exists():
+        raise FileNotFoundError(f"Transaction file not found: {csv_path}")
+    
+    reader = reader_for(csv_path)
+    if reader is not None:
+        for record in reader(csv_path):
+            yield record.to_transaction()
+        return
+    
+    with CsvScanner(csv_path) as scanner:
+        columns = scanner.columns
+        for fields in scanner.rows():
+            yield _parse_row(dict(zip(columns, fields)))
+
+
+def iter_sorted_transactions(
+    csv_path: Path,
+    run_size: int = DEFAULT_RUN_SIZE,
+    tmp_dir: Optional[Path] = None
+) -> Iterator[Transaction]:
+    """Stream transactions sorted by timestamp using an external merge sort.
+    
+    Rows are spilled to temporary files in sorted runs of ``run_size`` and
+    k-way merged, so memory is bounded regardless of file size. The order is
+    identical to load_transactions (stable sort on timestamp).
+    
+    Args:
+        csv_path: Path to CSV file (any row order)
+        run_size: Maximum number of rows held in memory while sorting
+        tmp_dir: Directory for sort run files (default: system temp dir)
+        
+    Yields:
+        Transaction objects in timestamp order
+        
+    Raises:
+        FileNotFoundError: If CSV file doesn't exist
+        ValueError: If CSV format is invalid
+        
+    Example:
+        >>> for transaction in iter_sorted_transactions(Path("backfill.csv")):
+        ...     print(transaction.timestamp)
+    """
     if not csv_path.exists():
         raise FileNotFoundError(f"Transaction file not found: {csv_path}")
     
-    transactions = []
+    if reader_for(csv_path) is not None:
+        for record in iter_sorted_records(csv_path, run_size=run_size, tmp_dir=tmp_dir):
+            yield record.to_transaction()
+        return
     
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
+    with CsvScanner(csv_path) as scanner:
+        columns = scanner.columns
+        timestamp = scanner.index('timestamp')
+        
+        def sort_key(fields: List[Optional[str]]) -> int:
             try:
-                transaction = Transaction(**row)
-                transactions.append(transaction)
+                if timestamp is None:
+                    raise KeyError('timestamp')
+                return epoch_micros(fields[timestamp])
             except Exception as e:
-                raise ValueError(f"Invalid transaction data in row: {row}. Error: {e}")
+                raise ValueError(f"Invalid transaction data in row: {dict(zip(columns, fields))}. Error: {e}")
+        
+        for fields in external_sort(scanner.rows(), key=sort_key, run_size=run_size, tmp_dir=tmp_dir):
+            yield _parse_row(dict(zip(columns, fields)))
+
+
+def _parse_row(row: dict) -> Transaction:
+    """Build a Transaction from a CSV row, reporting the row on failure."""
+    try:
+        return Transaction(**row)
+    except Exception as e:
+        raise ValueError(f"Invalid transaction data in row: {row}. Error: {e}")
+
+
+def load_records(csv_path: Path) -> List[TxRecord]:
+    """Load compact transaction records from CSV file.
     
-    # Sort by timestamp to ensure deterministic processing
-    transactions.sort(key=lambda t: t.timestamp)
+    Same validation and ordering as load_transactions, but rows are parsed
+    into TxRecords instead of Pydantic Transactions (see ``records``).
     
-    return transactions
+    Args:
+        csv_path: Path to CSV file
+        
+    Returns:
+        List of TxRecord objects sorted by timestamp
+        
+    Raises:
+        FileNotFoundError: If CSV file doesn't exist
+        ValueError: If CSV format is invalid
+        
+    Example:
+        >>> records = load_records(Path("sample_transactions.csv"))
+        >>> len(records)
+        20
+    """
+    records = list(iter_records(csv_path))
+    
+    # Stable sort on the integer timestamp, same order as load_transactions
+    records.sort(key=lambda r: r.timestamp_us)
+    
+    return records
 
 
-def write_alerts_json(alerts: List[Alert], output_path: Path) -> None:
+def iter_records(csv_path: Path) -> Iterator[TxRecord]:
+    """Stream compact transaction records from CSV file, in file order.
+    
+    Files with an NDJSON, Arrow IPC or Parquet extension are read with the
+    matching reader from ``readers`` instead.
+    
+    Args:
+        csv_path: Path to CSV (or NDJSON/Arrow/Parquet) file
+        
+    Yields:
+        TxRecord objects in file order
+        
+    Raises:
+        FileNotFoundError: If CSV file doesn't exist
+        ValueError: If CSV format is invalid
+        ImportError: If an Arrow/Parquet file is given without pyarrow
+    """
+    if not csv_path.exists():
+        raise FileNotFoundError(f"Transaction file not found: {csv_path}")
+    
+    reader = reader_for(csv_path)
+    if reader is not None:
+        yield from reader(csv_path)
+        return
+    
+    with CsvScanner(csv_path) as scanner:
+        yield from iter_row_records(scanner.columns, scanner.rows())
+
+
+def iter_sorted_records(
+    csv_path: Path,
+    run_size: int = DEFAULT_RUN_SIZE,
+    tmp_dir: Optional[Path] = None
+) -> Iterator[TxRecord]:
+    """Stream compact transaction records sorted by timestamp.
+    
+    Records are validated as they are read, then ordered with an external
+    merge sort (see iter_sorted_transactions).
+    
+    Args:
+        csv_path: Path to CSV file (any row order)
+        run_size: Maximum number of records held in memory while sorting
+        tmp_dir: Directory for sort run files (default: system temp dir)
+        
+    Yields:
+        TxRecord objects in timestamp order
+        
+    Raises:
+        FileNotFoundError: If CSV file doesn't exist
+        ValueError: If CSV format is invalid
+    """
+    yield from external_sort(
+        iter_records(csv_path),
+        key=lambda r: r.timestamp_us,
+        run_size=run_size,
+        tmp_dir=tmp_dir
+    )
+
+
+ALERT_FORMATS = ("json", "compact", "ndjson")
+
+# Large write buffer: alerts are small and written one at a time
+_WRITE_BUFFER_SIZE = 1 << 20
+
+
+def write_alerts_json(alerts: Iterable[Alert], output_path: Path, format: str = "json") -> None:
     """Write alerts to JSON file.
     
+    Alerts are serialized one at a time (see AlertJsonWriter), so memory
+    does not grow with the number of alerts.
+    
     Args:
-        alerts: List of Alert objects
+        alerts: Alert objects (any iterable)
         output_path: Path to output JSON file
-        
+        format: "json" (indented array, default), "compact" (array without
+            whitespace) or "ndjson" (one alert per line)
+            
     Example:
         >>> write_alerts_json(alerts, Path("out/aml_alerts.json"))
     """
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with AlertJsonWriter(output_path, format=format) as writer:
+        for alert in alerts:
+            writer.write(alert)
+
+
+class AlertJsonWriter:
+    """Incrementally write alerts as a JSON array (or NDJSON).
     
-    # Convert to dictionaries with proper serialization
-    alerts_data = []
-    for alert in alerts:
-        alert_dict = alert.model_dump(mode='json')
-        alerts_data.append(alert_dict)
+    Alerts are serialized one at a time into a buffered file as they are
+    written, so memory does not grow with the number of alerts. The default
+    "json" format is byte-identical to ``json.dump(alerts, f, indent=2)``
+    over the alerts' ``model_dump(mode='json')`` dicts.
     
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(alerts_data, f, indent=2, default=str)
+    Example:
+        >>> with AlertJsonWriter(Path("out/aml_alerts.json")) as writer:
+        ...     for alert in alerts:
+        ...         writer.write(alert)
+    """
+    
+    def __init__(self, output_path: Path, format: str = "json"):
+        if format not in ALERT_FORMATS:
+            raise ValueError(f"format must be one of {ALERT_FORMATS}, got {format!r}")
+        
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        self.format = format
+        self.count = 0
+        self._file = open(output_path, 'w', encoding='utf-8', buffering=_WRITE_BUFFER_SIZE)
+        if format != "ndjson":
+            self._file.write("[")
+    
+    def write(self, alert: Alert) -> None:
+        """Append one alert."""
+        if self.format == "json":
+            text = _indented_json(alert)
+            self._file.write(",\n  " if self.count else "\n  ")
+            self._file.write(text.replace("\n", "\n  "))
+        elif self.format == "compact":
+            if self.count:
+                self._file.write(",")
+            self._file.write(alert.model_dump_json())
+        else:
+            self._file.write(alert.model_dump_json())
+            self._file.write("\n")
+        self.count += 1
+    
+    def flush(self) -> None:
+        """Flush written alerts to disk (the array stays open)."""
+        self._file.flush()
+    
+    def close(self) -> None:
+        """Close the array and the underlying file."""
+        if self._file.closed:
+            return
+        if self.format == "json":
+            self._file.write("\n]" if self.count else "]")
+        elif self.format == "compact":
+            self._file.write("]")
+        self._file.close()
+    
+    def __enter__(self) -> "AlertJsonWriter":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+def _indented_json(alert: Alert) -> str:
+    """Serialize an alert exactly like ``json.dumps(..., indent=2)``.
+    
+    Pydantic's serializer is several times faster than the indenting
+    ``json`` encoder and produces the same text, except that ``json`` escapes
+    non-ASCII characters and DEL. Those (rare) alerts use ``json`` itself.
+    """
+    text = alert.model_dump_json(indent=2)
+    if text.isascii() and "\x7f" not in text:
+        return text
+    return json.dumps(alert.model_dump(mode='json'), indent=2, default=str)
+
+
+class TriageOutputWriter:
+    """Incrementally write aml_alerts.json, triage_queue.csv and summary.json.
+    
+    For pipelines that produce decisions one at a time (streaming mode, the
+    alert service). Alerts are appended to aml_alerts.json as they are
+    written; queue rows go through an external sort and summary counts are
+    accumulated, and both files are written by ``close()``. The three files
+    are identical to what write_alerts_json, write_triage_queue_csv and
+    write_summary produce for the same decisions.
+    
+    Example:
+        >>> with TriageOutputWriter(Path("out/day2/lab3")) as outputs:
+        ...     for decision in decisions:
+        ...         outputs.write(decision)
+    """
+    
+    def __init__(
+        self,
+        output_dir: Path,
+        run_size: int = DEFAULT_RUN_SIZE,
+        tmp_dir: Optional[Path] = None,
+        alerts_format: str = "json",
+        top_k: Optional[int] = None,
+        queue_buckets: bool = False
+    ):
+        """Open the outputs in a directory.
+        
+        Args:
+            output_dir: Directory for output files
+            run_size: Queue rows held in memory per sort run
+            tmp_dir: Directory for sort run files (default: system temp dir)
+            alerts_format: Format of aml_alerts.json (see AlertJsonWriter)
+            top_k: Only write the first top_k rows of triage_queue.csv
+            queue_buckets: Also write one queue file per assigned queue
+                (see write_triage_queue_buckets)
+        """
+        output_dir.mkdir(parents=True, exist_ok=True)
+        self.output_dir = output_dir
+        self.top_k = top_k
+        self.queue_buckets = queue_buckets
+        self.stats = TriageStats()
+        # Same ordering as write_triage_queue_csv: score descending, then
+        # alert_id. A top-k queue only needs a bounded heap; the full queue
+        # (or the per-queue files) goes through an external sort
+        self._top_rows = TopK(top_k) if top_k is not None and not queue_buckets else None
+        self._queue_rows = None
+        if self._top_rows is None:
+            self._queue_rows = ExternalSorter(key=lambda row: (row[0], row[1]), run_size=run_size, tmp_dir=tmp_dir)
+        self._alerts = AlertJsonWriter(output_dir / "aml_alerts.json", format=alerts_format)
+    
+    @property
+    def count(self) -> int:
+        """Number of decisions written so far."""
+        return self._alerts.count
+    
+    def write(self, decision: TriageDecision) -> None:
+        """Write one decision's alert, queue row and counts."""
+        alert = decision.alert
+        self._alerts.write(alert)
+        
+        self.stats.add(decision)
+        
+        row = _queue_row(decision)
+        if self._top_rows is not None:
+            self._top_rows.add(decision.triage_score, alert.alert_id, row)
+        else:
+            self._queue_rows.add((-decision.triage_score,) + row)
+    
+    def flush(self) -> None:
+        """Flush alerts written so far to aml_alerts.json."""
+        self._alerts.flush()
+    
+    def close(self) -> dict:
+        """Finish aml_alerts.json and write triage_queue.csv and summary.json.
+        
+        Returns:
+            The summary written to summary.json
+        """
+        self._alerts.close()
+        
+        if self._top_rows is not None:
+            _write_queue_rows(self.output_dir / "triage_queue.csv", self._top_rows.items())
+        else:
+            with self._queue_rows:
+                self._write_sorted_queues(self._queue_rows.sorted())
+        
+        return write_stats_summary(self.stats, self.output_dir / "summary.json")
+    
+    def __enter__(self) -> "TriageOutputWriter":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            # Leave no partial queue or summary behind a failed run
+            self._alerts.close()
+            if self._queue_rows is not None:
+                self._queue_rows.close()
+    
+    def _write_sorted_queues(self, rows: Iterator[tuple]) -> None:
+        """Write triage_queue.csv (and the per-queue files) from sorted rows."""
+        with contextlib.ExitStack() as stack:
+            queue_file = stack.enter_context(
+                open(self.output_dir / "triage_queue.csv", 'w', encoding='utf-8', newline='')
+            )
+            queue_writer = csv.writer(queue_file)
+            queue_writer.writerow(QUEUE_FIELDS)
+            
+            bucket_writers = {}
+            if self.queue_buckets:
+                for queue, filename in QUEUE_BUCKET_FILES.items():
+                    bucket_file = stack.enter_context(
+                        open(self.output_dir / filename, 'w', encoding='utf-8', newline='')
+                    )
+                    bucket_writers[queue] = csv.writer(bucket_file)
+                    bucket_writers[queue].writerow(QUEUE_FIELDS)
+            
+            for position, row in enumerate(rows):
+                if self.top_k is None or position < self.top_k:
+                    queue_writer.writerow(row[1:])
+                if bucket_writers:
+                    bucket_writers[row[-1]].writerow(row[1:])
+
+
+QUEUE_FIELDS = [
+    'alert_id', 'account_id', 'amount', 'priority',
+    'triage_score', 'reason_codes', 'queue'
+]
+
+QUEUE_BUCKET_FILES = {
+    "HIGH_RISK": "triage_queue_high_risk.csv",
+    "MEDIUM_RISK": "triage_queue_medium_risk.csv",
+    "LOW_RISK": "triage_queue_low_risk.csv"
+}
 
 
-def write_triage_queue_csv(decisions: List[TriageDecision], output_path: Path) -> None:
+def _queue_row(decision: TriageDecision) -> tuple:
+    """One triage_queue.csv row, in QUEUE_FIELDS order."""
+    alert = decision.alert
+    return (
+        alert.alert_id,
+        alert.transaction.account_id,
+        str(alert.transaction.amount),
+        decision.priority,
+        decision.triage_score,
+        ','.join(code.value for code in alert.reason_codes),
+        decision.assigned_queue
+    )
+
+
+def _write_queue_rows(output_path: Path, rows: Iterable[tuple]) -> None:
+    """Write queue rows (already in triage order) with the CSV header."""
+    with open(output_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(QUEUE_FIELDS)
+        writer.writerows(rows)
+
+
+def write_triage_queue_csv(
+    decisions: Iterable[TriageDecision],
+    output_path: Path,
+    top_k: Optional[int] = None
+) -> None:
     """Write triage queue to CSV file.
     
     CSV columns:
@@ -83,44 +506,89 @@ def write_triage_queue_csv(decisions: List[TriageDecision], output_path: Path) -
     - reason_codes (comma-separated)
     - queue
     
-    Rows are sorted by triage_score descending (highest priority first).
+    Rows are sorted by triage_score descending (highest priority first),
+    then by alert_id for determinism.
     
     Args:
-        decisions: List of TriageDecision objects
+        decisions: TriageDecision objects
         output_path: Path to output CSV file
+        top_k: Only write the first top_k rows (bounded heap, no full sort)
         
     Example:
         >>> write_triage_queue_csv(decisions, Path("out/triage_queue.csv"))
+        >>> write_triage_queue_csv(decisions, Path("out/triage_queue.csv"), top_k=100)
     """
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
-    # Sort by triage_score descending, then by alert_id for determinism
-    sorted_decisions = sorted(
-        decisions,
-        key=lambda d: (-d.triage_score, d.alert.alert_id)
-    )
+    builder = TriageQueueBuilder(top_k=top_k)
+    for decision in decisions:
+        builder.add(decision)
     
-    with open(output_path, 'w', encoding='utf-8', newline='') as f:
-        fieldnames = [
-            'alert_id', 'account_id', 'amount', 'priority',
-            'triage_score', 'reason_codes', 'queue'
-        ]
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        
-        for decision in sorted_decisions:
-            writer.writerow({
-                'alert_id': decision.alert.alert_id,
-                'account_id': decision.alert.transaction.account_id,
-                'amount': str(decision.alert.transaction.amount),
-                'priority': decision.priority,
-                'triage_score': decision.triage_score,
-                'reason_codes': ','.join(code.value for code in decision.alert.reason_codes),
-                'queue': decision.assigned_queue
-            })
-
-
-def write_summary(decisions: List[TriageDecision], output_path: Path) -> None:
+    _write_queue_rows(output_path, (_queue_row(d) for d in builder.ordered()))
+
+
+def write_triage_queue_buckets(decisions: Iterable[TriageDecision], output_dir: Path) -> None:
+    """Write one triage queue CSV per assigned queue.
+    
+    Files are named as in QUEUE_BUCKET_FILES and have the same columns as
+    triage_queue.csv. Each is in triage order; all three are written, with
+    only a header when a queue is empty.
+    
+    Args:
+        decisions: TriageDecision objects
+        output_dir: Directory for the queue files
+        
+    Example:
+        >>> write_triage_queue_buckets(decisions, Path("out/day2/lab3"))
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    
+    builder = TriageQueueBuilder()
+    for decision in decisions:
+        builder.add(decision)
+    
+    for queue, bucket in builder.by_queue().items():
+        _write_queue_rows(output_dir / QUEUE_BUCKET_FILES[queue], (_queue_row(d) for d in bucket))
+
+
+def write_triage_queues(
+    decisions: Iterable[TriageDecision],
+    output_dir: Path,
+    top_k: Optional[int] = None,
+    queue_buckets: bool = False
+) -> None:
+    """Write triage_queue.csv and, optionally, the per-queue files.
+    
+    The queue is ordered once and every file is written from that order,
+    so the output equals write_triage_queue_csv followed by
+    write_triage_queue_buckets without sorting twice. Without
+    ``queue_buckets``, a top_k queue only keeps a bounded heap.
+    
+    Args:
+        decisions: TriageDecision objects
+        output_dir: Directory for the queue files
+        top_k: Only write the first top_k rows of triage_queue.csv
+        queue_buckets: Also write one queue file per assigned queue (every
+            decision, even with top_k)
+            
+    Example:
+        >>> write_triage_queues(decisions, Path("out/day2/lab3"), top_k=100, queue_buckets=True)
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    
+    builder = TriageQueueBuilder(top_k=None if queue_buckets else top_k)
+    for decision in decisions:
+        builder.add(decision)
+    ordered = builder.ordered()
+    
+    head = ordered[:top_k] if top_k is not None else ordered
+    _write_queue_rows(output_dir / "triage_queue.csv", (_queue_row(d) for d in head))
+    if queue_buckets:
+        for queue, bucket in split_by_queue(ordered).items():
+            _write_queue_rows(output_dir / QUEUE_BUCKET_FILES[queue], (_queue_row(d) for d in bucket))
+
+
+def write_summary(decisions: Iterable[TriageDecision], output_path: Path) -> None:
     """Write summary statistics to JSON file.
     
     Summary includes:
@@ -130,36 +598,39 @@ def write_summary(decisions: List[TriageDecision], output_path: Path) -> None:
     - by_queue: {HIGH_RISK: count, ...}
     
     Args:
-        decisions: List of TriageDecision objects
+        decisions: TriageDecision objects
         output_path: Path to output JSON file
         
     Example:
         >>> write_summary(decisions, Path("out/summary.json"))
     """
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    # Count by priority
-    by_priority = {"P1": 0, "P2": 0, "P3": 0}
-    for decision in decisions:
-        by_priority[decision.priority] += 1
-    
-    # Count by reason code
-    by_reason_code = {}
-    for decision in decisions:
-        for code in decision.alert.reason_codes:
-            by_reason_code[code.value] = by_reason_code.get(code.value, 0) + 1
-    
-    # Count by queue
-    by_queue = {}
-    for decision in decisions:
-        by_queue[decision.assigned_queue] = by_queue.get(decision.assigned_queue, 0) + 1
+    write_stats_summary(TriageStats.from_decisions(decisions), output_path)
+
+
+def write_stats_summary(
+    stats: TriageStats,
+    output_path: Path,
+    perf: Optional[PerfRecorder] = None
+) -> dict:
+    """Write summary.json from counts accumulated while triaging.
     
-    summary = {
-        "total_alerts": len(decisions),
-        "by_priority": by_priority,
-        "by_reason_code": by_reason_code,
-        "by_queue": by_queue
-    }
+    Args:
+        stats: Accumulated TriageStats
+        output_path: Path to output JSON file
+        perf: Profiling counters, added under ``perf`` (optional)
+        
+    Returns:
+        The summary written
+        
+    Example:
+        >>> write_stats_summary(stats, Path("out/summary.json"))
+    """
+    output_path.parent.mkdir(parents=True, exist_ok=True)
     
+    summary = stats.to_summary()
+    if perf is not None:
+        summary["perf"] = perf.to_dict()
     with open(output_path, 'w', encoding='utf-8') as f:
         json.dump(summary, f, indent=2)
+    
+    return summary
@@ -3,15 +3,63 @@
 This module ties together all components into an end-to-end pipeline.
 """
 
-from datetime import datetime
+import zlib
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Tuple
 
-from . import io, rules, triage
-from .schemas import Alert, Transaction, TriageDecision
+from . import io, registry, rules, triage
+from .beneficiaries import BeneficiaryIndex, open_beneficiary_index
+from .profiling import PerfRecorder, stage
+from .records import TxRecord
+from .schemas import Alert, ReasonCode, Transaction, TriageDecision
+from .stats import TriageStats
 
 
-def generate_alerts(transactions: List[Transaction]) -> List[Alert]:
+def evaluate_transaction(
+    record: TxRecord,
+    velocity_count: Optional[int],
+    reversal_result: Optional[ReasonCode],
+    round_amount: Optional[bool] = None,
+    high_amount: Optional[bool] = None,
+    new_beneficiary: bool = False
+) -> Optional[Alert]:
+    """Apply the stateless rules and build an Alert if anything triggered.
+    
+    Windowed rules need other transactions, so their results are computed by
+    the caller (streaming window or real-time scorer) and passed in.
+    Stateless rule results may also be passed in when they were evaluated
+    for a whole batch (see ``columnar``); otherwise they are evaluated here,
+    along with any other stateless rule in ``registry.RULES``.
+    
+    The Pydantic Transaction is only built when an alert is raised.
+    
+    Args:
+        record: Transaction record to evaluate
+        velocity_count: Account transactions within the velocity window if
+            HIGH_VELOCITY triggered, None otherwise
+        reversal_result: Result of the RAPID_REVERSAL rule
+        round_amount: Precomputed ROUND_AMOUNT result, if any
+        high_amount: Precomputed HIGH_AMOUNT result, if any
+        new_beneficiary: Result of the NEW_BENEFICIARY rule (needs the
+            persistent beneficiary index, so it is computed by the caller)
+            
+    Returns:
+        Alert if any rule triggered, None otherwise
+    """
+    return registry.build_alert(record, {
+        ReasonCode.HIGH_VELOCITY: velocity_count,
+        ReasonCode.ROUND_AMOUNT: round_amount,
+        ReasonCode.HIGH_AMOUNT: high_amount,
+        ReasonCode.RAPID_REVERSAL: reversal_result,
+        ReasonCode.NEW_BENEFICIARY: new_beneficiary
+    })
+
+
+def generate_alerts(
+    transactions: List[Transaction],
+    beneficiaries: Optional[BeneficiaryIndex] = None
+) -> List[Alert]:
     """Generate alerts by applying all AML rules to transactions.
     
     For each transaction:
@@ -23,7 +71,9 @@ def generate_alerts(transactions: List[Transaction]) -> List[Alert]:
     
     Args:
         transactions: List of Transaction objects (should be sorted by timestamp)
-        
+        beneficiaries: Index of known (account, beneficiary) pairs; enables
+            the NEW_BENEFICIARY rule and records the pairs paid in this batch
+            
     Returns:
         List of Alert objects sorted by timestamp
         
@@ -32,91 +82,202 @@ def generate_alerts(transactions: List[Transaction]) -> List[Alert]:
         >>> len(alerts)
         8
     """
-    alerts = []
+    records = [TxRecord.from_transaction(t) for t in transactions]
+    alerts = generate_alerts_from_records(records, beneficiaries)
     
-    for transaction in transactions:
-        reason_codes = []
-        context = {}
-        
-        # Check HIGH_VELOCITY rule
-        velocity_result = rules.check_high_velocity(
-            transactions,
-            transaction.account_id,
-            window_seconds=60
-        )
-        if velocity_result:
-            reason_codes.append(velocity_result)
-            # Count transactions in window for context
-            account_txns = [t for t in transactions if t.account_id == transaction.account_id]
-            context['velocity_count'] = len([
-                t for t in account_txns
-                if abs((t.timestamp - transaction.timestamp).total_seconds()) <= 60
-            ])
-        
-        # Check ROUND_AMOUNT rule
-        round_result = rules.check_round_amount(transaction)
-        if round_result:
-            reason_codes.append(round_result)
-            context['amount'] = str(transaction.amount)
+    # Sort by transaction timestamp for determinism
+    alerts.sort(key=lambda a: a.transaction.timestamp)
+    
+    return alerts
+
+
+def generate_alerts_from_records(
+    records: List[TxRecord],
+    beneficiaries: Optional[BeneficiaryIndex] = None,
+    perf: Optional[PerfRecorder] = None
+) -> List[Alert]:
+    """Generate alerts for records sorted by timestamp (see generate_alerts).
+    
+    Args:
+        records: List of TxRecord objects sorted by timestamp
+        beneficiaries: Index of known pairs for NEW_BENEFICIARY (optional)
+        perf: Recorder for per-rule counters (optional)
         
-        # Check HIGH_AMOUNT rule
-        high_amount_result = rules.check_high_amount(transaction)
-        if high_amount_result:
-            reason_codes.append(high_amount_result)
-            context['amount'] = str(transaction.amount)
-            context['threshold'] = "10000"
+    Returns:
+        List of Alert objects sorted by timestamp
+    """
+    new_beneficiary = None
+    if beneficiaries is not None:
+        new_beneficiary = new_beneficiary_flags(records, beneficiaries)
+    
+    return [alert for _, alert in _generate_positioned_alerts(records, new_beneficiary, perf)]
+
+
+def new_beneficiary_flags(records: List[TxRecord], beneficiaries: BeneficiaryIndex) -> List[bool]:
+    """Evaluate NEW_BENEFICIARY for a batch, in order, recording every pair.
+    
+    Args:
+        records: List of TxRecord objects sorted by timestamp
+        beneficiaries: Index of known (account, beneficiary) pairs
         
-        # Check RAPID_REVERSAL rule
-        reversal_result = rules.check_rapid_reversal(
-            transactions,
-            transaction,
-            window_seconds=300
-        )
-        if reversal_result:
-            reason_codes.append(reversal_result)
-            context['window'] = 300
+    Returns:
+        One bool per record, True for the first payment to a beneficiary
+    """
+    return [
+        rules.check_new_beneficiary(record, beneficiaries) is not None
+        for record in records
+    ]
+
+
+def _generate_positioned_alerts(
+    records: List[TxRecord],
+    new_beneficiary: Optional[List[bool]] = None,
+    perf: Optional[PerfRecorder] = None
+) -> List[Tuple[int, Alert]]:
+    """Generate alerts paired with the position of their record in the input."""
+    return registry.evaluate_batch(records, new_beneficiary, perf=perf)
+
+
+def shard_for_account(account_id: str, shards: int) -> int:
+    """Assign an account to a shard with a hash that is stable across processes.
+    
+    Args:
+        account_id: Account to place
+        shards: Number of shards
         
-        # Create alert if any rules triggered
-        if reason_codes:
-            # Generate explanations for all triggered codes
-            explanations = [
-                rules.get_explanation(code, context)
-                for code in reason_codes
-            ]
+    Returns:
+        Shard number in [0, shards)
+    """
+    return zlib.crc32(account_id.encode('utf-8')) % shards
+
+
+def _triage_shard(
+    shard: Tuple[List[int], List[TxRecord], Optional[List[bool]], bool]
+) -> Tuple[List[Tuple[int, TriageDecision]], TriageStats, Optional[PerfRecorder]]:
+    """Run rules and triage for one shard (executed in a worker process)."""
+    sequence, records, new_beneficiary, profile = shard
+    perf = PerfRecorder() if profile else None
+    stats = TriageStats()
+    results = []
+    for position, alert in _generate_positioned_alerts(records, new_beneficiary, perf):
+        decision = triage.create_triage_decision(alert)
+        stats.add(decision, sequence[position])
+        results.append((sequence[position], decision))
+    return results, stats, perf
+
+
+def generate_decisions_sharded(
+    records: List[TxRecord],
+    workers: int,
+    beneficiaries: Optional[BeneficiaryIndex] = None,
+    stats: Optional[TriageStats] = None,
+    perf: Optional[PerfRecorder] = None
+) -> List[TriageDecision]:
+    """Generate alerts and triage decisions across a process pool.
+    
+    All AML rules only compare transactions of the same account, so
+    transactions are hash-partitioned by account_id and each shard is
+    evaluated independently. Results are merged back into input order, which
+    is the order generate_alerts produces for timestamp-sorted input.
+    
+    Records are compact and cheap to pickle, so shards are sent to workers
+    as TxRecords. The beneficiary index is a single on-disk store, so
+    NEW_BENEFICIARY is evaluated in this process before sharding (one O(1)
+    lookup per transaction) and the flags are shipped with each shard.
+    
+    Args:
+        records: List of TxRecord objects sorted by timestamp
+        workers: Number of worker processes
+        beneficiaries: Index of known pairs for NEW_BENEFICIARY (optional)
+        stats: Accumulator the per-shard summary counts are merged into
+            (optional)
+        perf: Recorder the per-shard rule counters are merged into
+            (optional)
             
-            alert = Alert(
-                alert_id=f"ALERT-{transaction.transaction_id}",
-                transaction=transaction,
-                reason_codes=reason_codes,
-                explanation="; ".join(explanations),
-                timestamp_detected=datetime.now()
-            )
-            alerts.append(alert)
+    Returns:
+        TriageDecision objects ordered like generate_alerts' alerts
+        
+    Example:
+        >>> decisions = generate_decisions_sharded(records, workers=4)
+        >>> [d.alert for d in decisions] == generate_alerts_from_records(records)
+        True
+    """
+    flags = None
+    if beneficiaries is not None:
+        flags = new_beneficiary_flags(records, beneficiaries)
     
-    # Sort by transaction timestamp for determinism
-    alerts.sort(key=lambda a: a.transaction.timestamp)
+    shards = [([], [], [] if flags else None, perf is not None) for _ in range(workers)]
+    for position, record in enumerate(records):
+        sequence, shard_records, shard_flags, _ = shards[shard_for_account(record.account_id, workers)]
+        sequence.append(position)
+        shard_records.append(record)
+        if flags:
+            shard_flags.append(flags[position])
     
-    return alerts
+    shards = [shard for shard in shards if shard[0]]
+    with ProcessPoolExecutor(max_workers=min(workers, len(shards) or 1)) as executor:
+        results = list(executor.map(_triage_shard, shards))
+    
+    merged = []
+    for shard_results, shard_stats, shard_perf in results:
+        merged.extend(shard_results)
+        if stats is not None:
+            stats.merge(shard_stats)
+        if perf is not None:
+            perf.merge(shard_perf)
+    merged.sort(key=lambda item: item[0])
+    
+    return [decision for _, decision in merged]
 
 
-def run_pipeline(input_csv: Path, output_dir: Path) -> dict:
+def run_pipeline(
+    input_csv: Path,
+    output_dir: Path,
+    workers: int = 1,
+    state_path: Optional[Path] = None,
+    finalize_state: bool = False,
+    beneficiary_index: Optional[Path] = None,
+    alerts_format: str = "json",
+    top_k: Optional[int] = None,
+    queue_buckets: bool = False,
+    profile: bool = False
+) -> dict:
     """Run the complete AML triage pipeline.
     
     Steps:
     1. Load transactions from CSV
     2. Generate alerts by applying rules
     3. Create triage decisions for all alerts
+       (sharded by account across ``workers`` processes if workers > 1)
     4. Write outputs:
        - aml_alerts.json
-       - triage_queue.csv
+       - triage_queue.csv (optionally only the first top_k rows)
+       - triage_queue_{high,medium,low}_risk.csv (with queue_buckets)
        - summary.json
-    
+       
     Args:
         input_csv: Path to input CSV file
         output_dir: Directory for output files
-        
+        workers: Number of worker processes for rule evaluation (default 1)
+        state_path: Checkpoint file for incremental runs. When given, the
+            file is processed as the next micro-batch after the checkpoint
+            (see ``state.run_incremental_pipeline``) and workers is ignored
+        finalize_state: With state_path, emit alerts for every pending
+            transaction instead of carrying them over to the next run
+        beneficiary_index: Directory of the persistent beneficiary index.
+            Enables the NEW_BENEFICIARY rule; pairs paid in this file are
+            added to the index
+        alerts_format: Format of aml_alerts.json: "json" (indented array),
+            "compact" or "ndjson" (see ``io.AlertJsonWriter``)
+        top_k: Only write the first top_k rows of triage_queue.csv, selected
+            with a bounded heap instead of sorting every decision
+        queue_buckets: Also write one triage queue file per assigned queue
+        profile: Record wall/CPU time and row counts per stage and per rule,
+            written to summary.json under ``perf`` (see ``profiling``).
+            Batch mode only: ignored with state_path
+            
     Returns:
-        Summary dictionary with statistics
+        Summary dictionary with statistics (and ``perf`` when profiling)
         
     Example:
         >>> summary = run_pipeline(
@@ -126,50 +287,85 @@ def run_pipeline(input_csv: Path, output_dir: Path) -> dict:
         >>> print(summary['total_alerts'])
         8
     """
+    if state_path is not None:
+        # Imported here: the streaming engine itself builds on this module
+        from .state import run_incremental_pipeline
+        return run_incremental_pipeline(
+            input_csv,
+            output_dir,
+            state_path,
+            finalize=finalize_state,
+            beneficiary_index=beneficiary_index,
+            alerts_format=alerts_format,
+            top_k=top_k,
+            queue_buckets=queue_buckets
+        )
+    
     # Create output directory
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    # Load transactions
-    transactions = io.load_transactions(input_csv)
+    perf = PerfRecorder() if profile else None
+    
+    # Load transactions as compact records
+    with stage(perf, "load") as counters:
+        records = io.load_records(input_csv)
+        counters["rows"] = len(records)
     
     # Handle edge case: no transactions
-    if not transactions:
+    if not records:
         return {
             "total_alerts": 0,
             "total_transactions": 0,
             "message": "No transactions to process"
         }
     
-    # Generate alerts
-    alerts = generate_alerts(transactions)
+    # Generate alerts (and decisions, when sharded)
+    stats = TriageStats()
+    with stage(perf, "rules") as counters, open_beneficiary_index(beneficiary_index) as beneficiaries:
+        if workers > 1:
+            decisions = generate_decisions_sharded(records, workers, beneficiaries, stats, perf)
+            alerts = [decision.alert for decision in decisions]
+        else:
+            alerts = generate_alerts_from_records(records, beneficiaries, perf)
+            decisions = None
+        counters["rows"] = len(records)
     
     # Handle edge case: no alerts generated
     if not alerts:
         summary = {
             "total_alerts": 0,
-            "total_transactions": len(transactions),
+            "total_transactions": len(records),
             "message": "No alerts generated"
         }
         # Still write summary
-        io.write_summary([], output_dir / "summary.json")
+        io.write_stats_summary(stats, output_dir / "summary.json", perf)
+        if perf is not None:
+            summary["perf"] = perf.to_dict()
         return summary
     
-    # Create triage decisions
-    decisions = [triage.create_triage_decision(alert) for alert in alerts]
-    
-    # Write outputs
-    io.write_alerts_json(alerts, output_dir / "aml_alerts.json")
-    io.write_triage_queue_csv(decisions, output_dir / "triage_queue.csv")
-    io.write_summary(decisions, output_dir / "summary.json")
+    # Create triage decisions, counting them for the summary as they are made
+    if decisions is None:
+        with stage(perf, "triage") as counters:
+            decisions = []
+            for alert in alerts:
+                decision = triage.create_triage_decision(alert)
+                stats.add(decision)
+                decisions.append(decision)
+            counters["rows"] = len(alerts)
     
-    # Return summary
-    by_priority = {}
-    for decision in decisions:
-        by_priority[decision.priority] = by_priority.get(decision.priority, 0) + 1
+    # Write outputs (summary.json last, so it can carry the write timings)
+    with stage(perf, "write") as counters:
+        io.write_alerts_json(alerts, output_dir / "aml_alerts.json", format=alerts_format)
+        io.write_triage_queues(decisions, output_dir, top_k=top_k, queue_buckets=queue_buckets)
+        counters["rows"] = len(decisions)
+    io.write_stats_summary(stats, output_dir / "summary.json", perf)
     
-    return {
+    summary = {
         "total_alerts": len(alerts),
-        "total_transactions": len(transactions),
-        "by_priority": by_priority,
+        "total_transactions": len(records),
+        "by_priority": stats.priority_counts(),
         "output_dir": str(output_dir)
     }
+    if perf is not None:
+        summary["perf"] = perf.to_dict()
+    return summary
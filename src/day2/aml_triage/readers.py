@@ -0,0 +1,269 @@
+"""Transaction readers for non-CSV input formats.
+
+The reader is chosen by file extension; anything not listed here is read
+as CSV (see ``io.iter_records``):
+
+- ``.ndjson`` / ``.jsonl``: one JSON object per line. Numbers are kept as
+  their literal text, so ``5000.00`` stays exactly ``5000.00``.
+- ``.arrow`` / ``.arrows`` / ``.feather`` / ``.ipc``: Arrow IPC (file or
+  stream format)
+- ``.parquet`` / ``.pq``: Parquet
+
+Arrow and Parquet are read one record batch at a time and converted column
+by column with pyarrow compute: timestamp columns become int64 epoch
+microseconds, decimal and integer amounts become int64 cents, and records
+are built straight from those arrays, with no per-value Decimal or datetime.
+Other column types (string timestamps, float amounts) and batches with
+invalid values go through ``TxRecord.from_values`` row by row, which names
+the offending row. They need pyarrow; the other formats do not.
+
+Columns are the CSV columns (transaction_id, account_id, timestamp,
+amount, transaction_type, beneficiary_id, optional currency).
+"""
+
+import json
+import sys
+from decimal import Decimal
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from .records import REQUIRED_FIELDS, TRANSACTION_TYPES, TxRecord
+
+try:
+    import pyarrow
+    import pyarrow.compute
+except ImportError:  # pragma: no cover - exercised when pyarrow is absent
+    pyarrow = None
+
+
+_COLUMNS = REQUIRED_FIELDS + ("currency",)
+
+# Time zones whose datetimes render with a "+00:00" offset
+_UTC_ZONES = {"UTC", "Etc/UTC", "+00:00", "Z"}
+
+
+def iter_ndjson_records(path: Path) -> Iterator[TxRecord]:
+    """Stream records from an NDJSON file, in file order.
+    
+    Args:
+        path: Path to NDJSON file
+        
+    Yields:
+        TxRecord objects in file order
+        
+    Raises:
+        ValueError: If a line is not a valid transaction
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = TxRecord.from_row(json.loads(line, parse_float=str, parse_int=str))
+            except Exception as e:
+                raise ValueError(f"Invalid transaction data in line {line_number}: {line.strip()}. Error: {e}")
+            yield record
+
+
+def _require_pyarrow(path: Path) -> None:
+    if pyarrow is None:
+        raise ImportError(f"Reading {path.suffix} files requires pyarrow (pip install pyarrow)")
+
+
+def iter_row_records(columns: Sequence[str], rows: Iterable[Sequence]) -> Iterator[TxRecord]:
+    """Build records from rows of values, one value per named column.
+    
+    Shared by the CSV scanner (rows of strings) and the Arrow readers (rows
+    of typed column values). Columns the input lacks are treated as empty.
+    
+    Args:
+        columns: Column name for each position in a row
+        rows: Rows of field values
+        
+    Yields:
+        TxRecord objects in row order
+        
+    Raises:
+        ValueError: If a row is not a valid transaction, naming the row
+    """
+    positions = [columns.index(name) if name in columns else None for name in _COLUMNS]
+    required = len(REQUIRED_FIELDS)
+    for row in rows:
+        values = [row[i] if i is not None else None for i in positions]
+        try:
+            if None in values[:required]:
+                raise ValueError(f"Field required: {REQUIRED_FIELDS[values.index(None)]}")
+            record = TxRecord.from_values(*values)
+        except Exception as e:
+            raise ValueError(f"Invalid transaction data in row: {dict(zip(columns, row))}. Error: {e}")
+        yield record
+
+
+def _timestamp_columns(column: "pyarrow.Array") -> Optional[tuple]:
+    """Epoch microseconds and ISO text for a timestamp column.
+    
+    The text matches ``datetime.isoformat()`` of each value, so records equal
+    those read from CSV. Returns None for other column types and for time
+    zones other than UTC.
+    """
+    compute = pyarrow.compute
+    column_type = column.type
+    if not pyarrow.types.is_timestamp(column_type):
+        return None
+    if column_type.tz is not None and column_type.tz not in _UTC_ZONES:
+        return None
+    
+    micros = column.cast(pyarrow.timestamp("us", tz=column_type.tz))
+    text = compute.strftime(micros, format="%Y-%m-%dT%H:%M:%S")
+    text = compute.replace_substring_regex(text, pattern=r"\.000000$", replacement="")
+    if column_type.tz is not None:
+        text = compute.binary_join_element_wise(text, "+00:00", "")
+    return micros.cast(pyarrow.int64()).to_pylist(), text.to_pylist()
+
+
+def _amount_columns(column: "pyarrow.Array") -> Optional[tuple]:
+    """Integer cents and decimal text for a decimal or integer amount column.
+    
+    Scales up to two places convert to cents exactly. Returns None for other
+    column types, finer scales and cents outside int64.
+    """
+    column_type = column.type
+    if pyarrow.types.is_integer(column_type):
+        hundred = pyarrow.scalar(100, pyarrow.int64())
+    elif pyarrow.types.is_decimal(column_type) and column_type.scale <= 2:
+        hundred = pyarrow.scalar(Decimal(100), pyarrow.decimal128(3, 0))
+        if pyarrow.types.is_decimal128(column_type) and column_type.precision > 35:
+            # Leave room for the product's three extra digits
+            column = column.cast(pyarrow.decimal256(column_type.precision, column_type.scale))
+    else:
+        return None
+    
+    try:
+        cents = pyarrow.compute.multiply_checked(column, hundred).cast(pyarrow.int64())
+    except pyarrow.ArrowInvalid:
+        return None
+    return cents.to_pylist(), column.cast(pyarrow.string()).to_pylist()
+
+
+def _batch_records(batch: "pyarrow.RecordBatch") -> Optional[List[TxRecord]]:
+    """Records for one batch, converted column-wise.
+    
+    Returns None when a column has an unsupported type or a value is
+    invalid, so the caller can fall back to row-wise parsing.
+    """
+    compute = pyarrow.compute
+    names = batch.schema.names
+    fields = {name: batch.column(names.index(name)) for name in _COLUMNS if name in names}
+    for name in REQUIRED_FIELDS:
+        if fields[name].null_count:
+            return None
+    for name in ("transaction_id", "account_id", "transaction_type", "beneficiary_id", "currency"):
+        if name in fields and not pyarrow.types.is_string(fields[name].type):
+            return None
+    if not compute.all(compute.is_in(fields["transaction_type"], pyarrow.array(sorted(TRANSACTION_TYPES)))).as_py():
+        return None
+    
+    timestamps = _timestamp_columns(fields["timestamp"])
+    amounts = _amount_columns(fields["amount"])
+    if timestamps is None or amounts is None:
+        return None
+    
+    if "currency" in fields:
+        currencies = map(sys.intern, compute.fill_null(fields["currency"], "USD").to_pylist())
+    else:
+        currencies = ["USD"] * batch.num_rows
+    return [
+        TxRecord(
+            transaction_id, sys.intern(account_id), sys.intern(beneficiary_id),
+            sys.intern(transaction_type), currency, timestamp_us, timestamp_text,
+            amount_cents, amount_text, True
+        )
+        for transaction_id, account_id, beneficiary_id, transaction_type, currency,
+            timestamp_us, timestamp_text, amount_cents, amount_text in zip(
+            fields["transaction_id"].to_pylist(),
+            fields["account_id"].to_pylist(),
+            fields["beneficiary_id"].to_pylist(),
+            fields["transaction_type"].to_pylist(),
+            currencies,
+            *timestamps,
+            *amounts
+        )
+    ]
+
+
+def _iter_batch_records(batches: Iterator["pyarrow.RecordBatch"]) -> Iterator[TxRecord]:
+    """Build records column-wise from Arrow record batches."""
+    for batch in batches:
+        names = batch.schema.names
+        for field in REQUIRED_FIELDS:
+            if field not in names:
+                raise ValueError(f"Field required: {field}")
+        
+        records = _batch_records(batch)
+        if records is not None:
+            yield from records
+            continue
+        
+        columns: List[list] = [
+            batch.column(names.index(name)).to_pylist() if name in names else [None] * batch.num_rows
+            for name in _COLUMNS
+        ]
+        yield from iter_row_records(_COLUMNS, zip(*columns))
+
+
+def iter_arrow_records(path: Path) -> Iterator[TxRecord]:
+    """Stream records from an Arrow IPC file (file or stream format).
+    
+    Raises:
+        ImportError: If pyarrow is not installed
+        ValueError: If a column is missing or a row is invalid
+    """
+    _require_pyarrow(path)
+    import pyarrow.ipc
+    
+    with pyarrow.memory_map(str(path), 'r') as source:
+        try:
+            reader = pyarrow.ipc.open_file(source)
+            batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+        except pyarrow.ArrowInvalid:
+            source.seek(0)
+            batches = iter(pyarrow.ipc.open_stream(source))
+        yield from _iter_batch_records(batches)
+
+
+def iter_parquet_records(path: Path) -> Iterator[TxRecord]:
+    """Stream records from a Parquet file, one row group batch at a time.
+    
+    Raises:
+        ImportError: If pyarrow is not installed
+        ValueError: If a column is missing or a row is invalid
+    """
+    _require_pyarrow(path)
+    import pyarrow.parquet
+    
+    parquet_file = pyarrow.parquet.ParquetFile(str(path))
+    yield from _iter_batch_records(parquet_file.iter_batches())
+
+
+READERS: Dict[str, Callable[[Path], Iterator[TxRecord]]] = {
+    ".ndjson": iter_ndjson_records,
+    ".jsonl": iter_ndjson_records,
+    ".arrow": iter_arrow_records,
+    ".arrows": iter_arrow_records,
+    ".feather": iter_arrow_records,
+    ".ipc": iter_arrow_records,
+    ".parquet": iter_parquet_records,
+    ".pq": iter_parquet_records,
+}
+
+
+def reader_for(path: Path) -> Optional[Callable[[Path], Iterator[TxRecord]]]:
+    """Reader for a file's extension, or None for CSV (the default).
+    
+    Example:
+        >>> reader_for(Path("day.parquet")).__name__
+        'iter_parquet_records'
+        >>> reader_for(Path("day.csv")) is None
+        True
+    """
+    return READERS.get(path.suffix.lower())
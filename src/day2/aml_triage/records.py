@@ -0,0 +1,222 @@
+"""Compact transaction records for the AML hot path.
+
+Building a Pydantic ``Transaction`` (with its ``datetime`` and ``Decimal``
+fields) for every input row dominates load time and memory on large files.
+Rules and triage only need a handful of primitive values, so rows are
+parsed into ``TxRecord`` objects instead:
+
+- ``__slots__`` (no per-instance ``__dict__``)
+- epoch-microsecond timestamps and integer-cent amounts
+- interned account, beneficiary, type and currency strings
+
+Pydantic ``Transaction`` objects are only built at the output boundary, for
+transactions that actually raise an alert.
+"""
+
+import sys
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from typing import Dict, Optional, Union
+
+from src.common.timestamps import epoch_micros
+
+from .columnar import to_cents
+from .index import to_epoch_micros
+from .schemas import Transaction
+
+
+TRANSACTION_TYPES = {"DEBIT", "CREDIT"}
+REQUIRED_FIELDS = (
+    "transaction_id", "account_id", "timestamp", "amount",
+    "transaction_type", "beneficiary_id"
+)
+
+
+class TxRecord:
+    """Lightweight, validated transaction record.
+    
+    ``timestamp_text`` and ``amount_text`` keep the original values so the
+    output ``Transaction`` is identical to one parsed directly from the row.
+    
+    Example:
+        >>> record = TxRecord.from_row({
+        ...     "transaction_id": "TX001", "account_id": "ACC001",
+        ...     "timestamp": "2024-01-15T10:00:00Z", "amount": "5000.00",
+        ...     "transaction_type": "DEBIT", "beneficiary_id": "BEN123",
+        ...     "currency": "USD"
+        ... })
+        >>> record.amount_cents, record.timestamp_us
+        (500000, 1705312800000000)
+    """
+    
+    __slots__ = (
+        "transaction_id", "account_id", "beneficiary_id", "transaction_type",
+        "currency", "timestamp_us", "timestamp_text", "amount_cents",
+        "amount_text", "cents_exact"
+    )
+    
+    def __init__(
+        self,
+        transaction_id: str,
+        account_id: str,
+        beneficiary_id: str,
+        transaction_type: str,
+        currency: str,
+        timestamp_us: int,
+        timestamp_text: str,
+        amount_cents: int,
+        amount_text: str,
+        cents_exact: bool
+    ):
+        self.transaction_id = transaction_id
+        self.account_id = account_id
+        self.beneficiary_id = beneficiary_id
+        self.transaction_type = transaction_type
+        self.currency = currency
+        self.timestamp_us = timestamp_us
+        self.timestamp_text = timestamp_text
+        self.amount_cents = amount_cents
+        self.amount_text = amount_text
+        self.cents_exact = cents_exact
+    
+    @property
+    def amount(self) -> Decimal:
+        """Exact Decimal amount (built on demand)."""
+        return Decimal(self.amount_text)
+    
+    @property
+    def timestamp(self) -> datetime:
+        """Timestamp as a datetime (built on demand)."""
+        return Transaction.parse_timestamp(self.timestamp_text)
+    
+    @classmethod
+    def from_row(cls, row: Dict[str, Optional[str]]) -> "TxRecord":
+        """Parse and validate a CSV row (same rules as ``Transaction``).
+        
+        Args:
+            row: Mapping of column name to raw string value
+            
+        Returns:
+            TxRecord for the row
+            
+        Raises:
+            ValueError: If a field is missing or invalid
+        """
+        for field in REQUIRED_FIELDS:
+            if row.get(field) is None:
+                raise ValueError(f"Field required: {field}")
+        
+        return cls.from_values(
+            row["transaction_id"],
+            row["account_id"],
+            row["timestamp"],
+            row["amount"],
+            row["transaction_type"],
+            row["beneficiary_id"],
+            row.get("currency")
+        )
+    
+    @classmethod
+    def from_values(
+        cls,
+        transaction_id: str,
+        account_id: str,
+        timestamp: Union[str, datetime],
+        amount: Union[str, Decimal, int, float],
+        transaction_type: str,
+        beneficiary_id: str,
+        currency: Optional[str] = None
+    ) -> "TxRecord":
+        """Parse and validate one transaction's field values.
+        
+        Used by columnar readers (see ``readers``), which already hold typed
+        values per column: timestamps may be datetimes and amounts may be
+        Decimals or numbers, converted the same way ``Transaction`` does.
+        
+        Raises:
+            ValueError: If a field is invalid
+        """
+        if transaction_type not in TRANSACTION_TYPES:
+            raise ValueError(f"transaction_type must be 'DEBIT' or 'CREDIT', got {transaction_type!r}")
+        
+        try:
+            value = amount if isinstance(amount, Decimal) else Decimal(str(amount))
+        except InvalidOperation:
+            raise ValueError(f"Invalid amount: {amount!r}")
+        if not value.is_finite():
+            raise ValueError(f"Amount must be finite, got {amount!r}")
+        
+        if isinstance(timestamp, datetime):
+            timestamp_text = timestamp.isoformat()
+            timestamp_us = to_epoch_micros(timestamp)
+        else:
+            timestamp_text = timestamp
+            timestamp_us = epoch_micros(timestamp_text)
+        
+        amount_cents, cents_exact = to_cents(value)
+        
+        return cls(
+            transaction_id=str(transaction_id),
+            account_id=sys.intern(str(account_id)),
+            beneficiary_id=sys.intern(str(beneficiary_id)),
+            transaction_type=sys.intern(transaction_type),
+            currency=sys.intern(currency) if currency is not None else "USD",
+            timestamp_us=timestamp_us,
+            timestamp_text=timestamp_text,
+            amount_cents=amount_cents,
+            amount_text=str(value),
+            cents_exact=cents_exact
+        )
+    
+    @classmethod
+    def from_transaction(cls, transaction: Transaction) -> "TxRecord":
+        """Build a record from an existing Pydantic Transaction.
+        
+        Example:
+            >>> TxRecord.from_transaction(transaction).to_transaction() == transaction
+            True
+        """
+        amount_cents, cents_exact = to_cents(transaction.amount)
+        
+        return cls(
+            transaction_id=transaction.transaction_id,
+            account_id=sys.intern(transaction.account_id),
+            beneficiary_id=sys.intern(transaction.beneficiary_id),
+            transaction_type=sys.intern(transaction.transaction_type),
+            currency=sys.intern(transaction.currency),
+            timestamp_us=to_epoch_micros(transaction.timestamp),
+            timestamp_text=transaction.timestamp.isoformat(),
+            amount_cents=amount_cents,
+            amount_text=str(transaction.amount),
+            cents_exact=cents_exact
+        )
+    
+    def to_row(self) -> Dict[str, str]:
+        """Raw row values, as accepted by ``from_row``."""
+        return {
+            "transaction_id": self.transaction_id,
+            "account_id": self.account_id,
+            "timestamp": self.timestamp_text,
+            "amount": self.amount_text,
+            "transaction_type": self.transaction_type,
+            "beneficiary_id": self.beneficiary_id,
+            "currency": self.currency
+        }
+    
+    def to_transaction(self) -> Transaction:
+        """Build the Pydantic Transaction for output."""
+        return Transaction(
+            transaction_id=self.transaction_id,
+            account_id=self.account_id,
+            timestamp=self.timestamp_text,
+            amount=self.amount_text,
+            transaction_type=self.transaction_type,
+            beneficiary_id=self.beneficiary_id,
+            currency=self.currency
+        )
+    
+    def __repr__(self) -> str:
+        return (
+            f"TxRecord({self.transaction_id!r}, {self.account_id!r}, "
+            f"{self.timestamp_text!r}, {self.amount_text!r}, {self.transaction_type!r})"
+        )
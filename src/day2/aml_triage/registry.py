@@ -0,0 +1,429 @@
+"""Declarative registry of AML rules and the batch rule engine.
+
+Each rule declares its reason code, what it needs to be evaluated and how
+it is evaluated for a whole batch:
+- stateless rules only look at the transaction itself
+- windowed rules look at the account's other transactions within
+  ``window_seconds``, and can only trigger for accounts with at least
+  ``min_transactions`` transactions
+- history rules depend on state kept outside the batch (the persistent
+  beneficiary index)
+
+The batch engine plans a single pass from these declarations: stateless
+rules share one columnar view of the amounts, windowed rules share one
+AccountIndex (built only if a windowed rule is enabled) and skip accounts
+that are too small to trigger, and alerts are assembled once from the
+positions that triggered anything. Reason codes are listed in registry
+order.
+
+Adding a typology means adding a ReasonCode and registering a Rule; the
+engine evaluates it in the same pass as the built-in rules. The per-
+transaction engines (streaming, incremental state and the real-time
+service) apply registered stateless rules too, but evaluate windowed and
+history rules with their own code, so they refuse to start when a rule of
+those kinds has been registered (see ``require_per_transaction_rules``).
+
+Example:
+    >>> [rule.code.value for rule in RULES]
+    ['HIGH_VELOCITY', 'ROUND_AMOUNT', 'HIGH_AMOUNT', 'RAPID_REVERSAL', 'NEW_BENEFICIARY']
+"""
+
+from contextlib import nullcontext
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from . import columnar, rules
+from .columnar import AmountColumn
+from .index import AccountIndex, sliding_window_counts
+from .profiling import PerfRecorder
+from .records import TxRecord
+from .rules import (
+    HIGH_AMOUNT_THRESHOLD,
+    REVERSAL_WINDOW_SECONDS,
+    VELOCITY_MIN_COUNT,
+    VELOCITY_WINDOW_SECONDS,
+)
+from .schemas import Alert, ReasonCode
+
+
+STATELESS = "stateless"
+WINDOWED = "windowed"
+HISTORY = "history"
+
+# Evaluation order when planning a batch
+_KIND_ORDER = {STATELESS: 0, WINDOWED: 1, HISTORY: 2}
+
+
+class RuleBatch:
+    """Shared state for evaluating every rule over one batch of records.
+    
+    The account index and the amount column are built on first use, so a
+    batch with only stateless rules never partitions by account.
+    """
+    
+    def __init__(self, records: Sequence[TxRecord], new_beneficiary: Optional[List[bool]] = None):
+        """Create a batch.
+        
+        Args:
+            records: TxRecord objects sorted by timestamp
+            new_beneficiary: Precomputed NEW_BENEFICIARY flags, one per
+                record (the beneficiary index is evaluated by the caller)
+        """
+        self.records = records
+        self.new_beneficiary = new_beneficiary
+        self._index: Optional[AccountIndex] = None
+        self._amounts: Optional[AmountColumn] = None
+    
+    @property
+    def index(self) -> AccountIndex:
+        """Per-account index shared by all windowed rules."""
+        if self._index is None:
+            self._index = AccountIndex(self.records)
+        return self._index
+    
+    @property
+    def amounts(self) -> AmountColumn:
+        """Fixed-point amount column shared by all stateless amount rules."""
+        if self._amounts is None:
+            self._amounts = AmountColumn.from_records(self.records)
+        return self._amounts
+    
+    def accounts(self, min_transactions: int) -> Iterator[Tuple[str, List[int]]]:
+        """Accounts with at least ``min_transactions`` records.
+        
+        Yields:
+            Tuples of (account_id, positions of its records in time order)
+        """
+        for account_id, positions in self.index.positions.items():
+            if len(positions) >= min_transactions:
+                yield account_id, positions
+
+
+class Rule:
+    """Declaration of one AML rule.
+    
+    A rule's result for a transaction is None (or False) when it did not
+    trigger, and otherwise a value passed to ``context`` to build the
+    explanation context (e.g. the velocity count).
+    
+    Example:
+        A new typology needs its reason code first: add the member to
+        ``schemas.ReasonCode`` (``NEAR_THRESHOLD = "NEAR_THRESHOLD"``), its
+        score to ``triage.compute_triage_score`` and its template to
+        ``rules.EXPLANATION_TEMPLATES``; then register the rule:
+        
+        >>> register_rule(Rule(
+        ...     ReasonCode.NEAR_THRESHOLD,
+        ...     STATELESS,
+        ...     evaluate_batch=lambda rule, batch: (
+        ...         (position, True)
+        ...         for position, record in enumerate(batch.records)
+        ...         if rule.evaluate_record(rule, record)
+        ...     ),
+        ...     context=lambda rule, record, result: {"amount": record.amount_text},
+        ...     evaluate_record=lambda rule, record: rule.threshold <= record.amount < HIGH_AMOUNT_THRESHOLD,
+        ...     threshold=Decimal("9000")
+        ... ))
+    """
+    
+    def __init__(
+        self,
+        code: ReasonCode,
+        kind: str,
+        evaluate_batch: Callable[["Rule", RuleBatch], Iterable[Tuple[int, Any]]],
+        context: Callable[["Rule", TxRecord, Any], dict],
+        evaluate_record: Optional[Callable[["Rule", TxRecord], Any]] = None,
+        window_seconds: Optional[int] = None,
+        min_transactions: int = 1,
+        threshold: Optional[Decimal] = None
+    ):
+        """Declare a rule.
+        
+        Args:
+            code: Reason code reported when the rule triggers
+            kind: STATELESS, WINDOWED or HISTORY
+            evaluate_batch: Returns (position, result) for each record of
+                a RuleBatch that triggered
+            context: Builds the explanation context for a triggered record
+            evaluate_record: Evaluates a single record; required for
+                stateless rules, which streaming and the real-time service
+                evaluate per transaction
+            window_seconds: Window size of a windowed rule
+            min_transactions: Account transactions needed for the rule to
+                possibly trigger; smaller accounts are skipped
+            threshold: Amount threshold, for rules that have one
+            
+        Raises:
+            ValueError: If the declaration is inconsistent
+        """
+        if kind not in _KIND_ORDER:
+            raise ValueError(f"Unknown rule kind for {code.value}: {kind}")
+        if kind == STATELESS and evaluate_record is None:
+            raise ValueError(f"Stateless rule {code.value} needs evaluate_record")
+        if kind == WINDOWED and window_seconds is None:
+            raise ValueError(f"Windowed rule {code.value} needs window_seconds")
+        
+        self.code = code
+        self.kind = kind
+        self.evaluate_batch = evaluate_batch
+        self.context = context
+        self.evaluate_record = evaluate_record
+        self.window_seconds = window_seconds
+        self.min_transactions = min_transactions
+        self.threshold = threshold
+    
+    def __repr__(self) -> str:
+        return f"Rule({self.code.value}, {self.kind})"
+
+
+def _velocity_batch(rule: Rule, batch: RuleBatch) -> Iterator[Tuple[int, int]]:
+    # Batch semantics: every transaction of an account that bursts anywhere
+    # is flagged, with the count of its neighbours within the window
+    window = rule.window_seconds * 1_000_000
+    for account_id, positions in batch.accounts(rule.min_transactions):
+        burst, counts = sliding_window_counts(
+            batch.index.times[account_id], window, rule.min_transactions
+        )
+        if burst:
+            yield from zip(positions, counts)
+
+
+def _reversal_batch(rule: Rule, batch: RuleBatch) -> Iterator[Tuple[int, ReasonCode]]:
+    records = batch.records
+    for _, positions in batch.accounts(rule.min_transactions):
+        for position in positions:
+            result = rules.check_rapid_reversal_indexed(batch.index, records[position], rule.window_seconds)
+            if result:
+                yield position, result
+
+
+def _mask_positions(mask: List[bool]) -> Iterator[Tuple[int, bool]]:
+    return ((position, True) for position, hit in enumerate(mask) if hit)
+
+
+def _new_beneficiary_batch(rule: Rule, batch: RuleBatch) -> Iterator[Tuple[int, bool]]:
+    if batch.new_beneficiary is None:
+        return iter(())
+    return _mask_positions(batch.new_beneficiary)
+
+
+RULES: List[Rule] = [
+    Rule(
+        ReasonCode.HIGH_VELOCITY,
+        WINDOWED,
+        evaluate_batch=_velocity_batch,
+        context=lambda rule, record, count: {"velocity_count": count},
+        window_seconds=VELOCITY_WINDOW_SECONDS,
+        min_transactions=VELOCITY_MIN_COUNT
+    ),
+    Rule(
+        ReasonCode.ROUND_AMOUNT,
+        STATELESS,
+        evaluate_batch=lambda rule, batch: _mask_positions(batch.amounts.round_amount_mask()),
+        context=lambda rule, record, value: {"amount": record.amount_text},
+        evaluate_record=lambda rule, record: columnar.is_round_amount(record)
+    ),
+    Rule(
+        ReasonCode.HIGH_AMOUNT,
+        STATELESS,
+        evaluate_batch=lambda rule, batch: _mask_positions(batch.amounts.threshold_mask(rule.threshold)),
+        context=lambda rule, record, value: {"amount": record.amount_text, "threshold": str(rule.threshold)},
+        evaluate_record=lambda rule, record: columnar.meets_threshold(record, rule.threshold),
+        threshold=HIGH_AMOUNT_THRESHOLD
+    ),
+    Rule(
+        ReasonCode.RAPID_REVERSAL,
+        WINDOWED,
+        evaluate_batch=_reversal_batch,
+        context=lambda rule, record, value: {"window": rule.window_seconds},
+        window_seconds=REVERSAL_WINDOW_SECONDS,
+        # A DEBIT and its reversing CREDIT
+        min_transactions=2
+    ),
+    Rule(
+        ReasonCode.NEW_BENEFICIARY,
+        HISTORY,
+        evaluate_batch=_new_beneficiary_batch,
+        context=lambda rule, record, value: {"beneficiary_id": record.beneficiary_id}
+    ),
+]
+
+
+def register_rule(rule: Rule) -> None:
+    """Add a rule to the registry (after the built-in rules).
+    
+    Args:
+        rule: Rule declaration
+        
+    Raises:
+        ValueError: If a rule for the same reason code is already registered
+    """
+    if any(existing.code == rule.code for existing in RULES):
+        raise ValueError(f"A rule for {rule.code.value} is already registered")
+    RULES.append(rule)
+
+
+# Windowed and history rules the per-transaction engines evaluate themselves
+PER_TRANSACTION_CODES = frozenset({
+    ReasonCode.HIGH_VELOCITY,
+    ReasonCode.RAPID_REVERSAL,
+    ReasonCode.NEW_BENEFICIARY,
+})
+
+
+def require_per_transaction_rules(engine: str, rule_set: Optional[Sequence[Rule]] = None) -> None:
+    """Check that a per-transaction engine can evaluate every rule.
+    
+    Streaming mode, incremental state and the real-time service apply any
+    stateless rule through ``build_alert``, but only compute the built-in
+    windowed and history rules (PER_TRANSACTION_CODES). Any other rule of
+    those kinds would be silently skipped, so it is an error instead.
+    
+    Args:
+        engine: Engine name for the error message
+        rule_set: Rules to check (default: RULES)
+        
+    Raises:
+        ValueError: If a windowed or history rule is not one the engine
+            evaluates
+    """
+    unsupported = [
+        rule.code.value for rule in (RULES if rule_set is None else rule_set)
+        if rule.kind != STATELESS and rule.code not in PER_TRANSACTION_CODES
+    ]
+    if unsupported:
+        raise ValueError(
+            f"{engine} cannot evaluate registered windowed or history rules: "
+            f"{', '.join(unsupported)}. Use the batch pipeline for these rules"
+        )
+
+
+def _triggered(result: Any) -> bool:
+    return result is not None and result is not False
+
+
+def build_alert(
+    record: TxRecord,
+    results: Dict[ReasonCode, Any],
+    rule_set: Optional[Sequence[Rule]] = None
+) -> Optional[Alert]:
+    """Build an Alert from rule results for one record.
+    
+    Stateless rules without a result are evaluated on the record here, so
+    callers only need to supply windowed and history results.
+    
+    Args:
+        record: Transaction record
+        results: Rule result by reason code
+        rule_set: Rules in reporting order (default: RULES)
+        
+    Returns:
+        Alert if any rule triggered, None otherwise
+    """
+    triggered = []
+    for rule in RULES if rule_set is None else rule_set:
+        result = results.get(rule.code)
+        if result is None and rule.kind == STATELESS:
+            result = rule.evaluate_record(rule, record)
+        if _triggered(result):
+            triggered.append((rule, result))
+    
+    return _assemble_alert(record, triggered)
+
+
+def _assemble_alert(record: TxRecord, triggered: List[Tuple[Rule, Any]]) -> Optional[Alert]:
+    """Build the Alert for the rules that triggered, in reporting order."""
+    if not triggered:
+        return None
+    
+    reason_codes = []
+    context = {}
+    for rule, result in triggered:
+        reason_codes.append(rule.code)
+        context.update(rule.context(rule, record, result))
+    
+    # The explanation is rendered from the context when the alert is written
+    return Alert(
+        alert_id=f"ALERT-{record.transaction_id}",
+        transaction=record.to_transaction(),
+        reason_codes=reason_codes,
+        timestamp_detected=datetime.now(),
+        explanation_context=context
+    )
+
+
+def plan(rule_set: Sequence[Rule]) -> List[Tuple[int, Rule]]:
+    """Order rules for evaluation: stateless, then windowed, then history.
+    
+    Returns:
+        (reporting position, rule) pairs in evaluation order
+    """
+    return sorted(enumerate(rule_set), key=lambda item: _KIND_ORDER[item[1].kind])
+
+
+def _evaluations(rule: Rule, batch: RuleBatch) -> int:
+    """Records a rule was evaluated for.
+    
+    Windowed rules skip small accounts; history rules only run when the
+    caller supplied their state (the NEW_BENEFICIARY flags).
+    """
+    if rule.kind == HISTORY and batch.new_beneficiary is None:
+        return 0
+    if rule.kind == WINDOWED:
+        return sum(len(positions) for _, positions in batch.accounts(rule.min_transactions))
+    return len(batch.records)
+
+
+def evaluate_batch(
+    records: Sequence[TxRecord],
+    new_beneficiary: Optional[List[bool]] = None,
+    rule_set: Optional[Sequence[Rule]] = None,
+    perf: Optional[PerfRecorder] = None
+) -> List[Tuple[int, Alert]]:
+    """Evaluate every rule over a batch in one planned pass.
+    
+    Args:
+        records: TxRecord objects sorted by timestamp
+        new_beneficiary: Precomputed NEW_BENEFICIARY flags (optional)
+        rule_set: Rules to evaluate (default: RULES)
+        perf: Recorder for per-rule time, evaluations and hits (optional)
+        
+    Returns:
+        (position, Alert) pairs in input order
+        
+    Example:
+        >>> alerts = evaluate_batch(records)
+        >>> alerts[0]
+        (0, Alert(alert_id='ALERT-TX001', ...))
+    """
+    rule_set = RULES if rule_set is None else rule_set
+    batch = RuleBatch(records, new_beneficiary)
+    
+    # Record position -> result slot per rule (in reporting order); records
+    # that triggered nothing never get an entry
+    empty = [None] * len(rule_set)
+    results: Dict[int, List[Any]] = {}
+    for order, rule in plan(rule_set):
+        with perf.rule(rule.code.value) if perf is not None else nullcontext() as counters:
+            for position, result in rule.evaluate_batch(rule, batch):
+                slots = results.get(position)
+                if slots is None:
+                    slots = results[position] = empty.copy()
+                slots[order] = result
+        if counters is not None:
+            counters["evaluations"] += _evaluations(rule, batch)
+            counters["hits"] += sum(1 for slots in results.values() if _triggered(slots[order]))
+    
+    alerts = []
+    for position in sorted(results):
+        triggered = [
+            (rule, result)
+            for rule, result in zip(rule_set, results[position])
+            if _triggered(result)
+        ]
+        alert = _assemble_alert(records[position], triggered)
+        if alert:
+            alerts.append((position, alert))
+    
+    return alerts
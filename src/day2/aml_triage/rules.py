@@ -5,15 +5,28 @@ suspicious transaction patterns.
 """
 
 from decimal import Decimal
-from typing import List, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Union
 
+from .beneficiaries import BeneficiaryIndex
+from .index import AccountIndex, sliding_window_counts, to_epoch_micros
+from .records import TxRecord
 from .schemas import ReasonCode, Transaction
 
 
+# Rule thresholds and windows, shared by the batch, streaming and real-time
+# engines (see ``registry``)
+VELOCITY_WINDOW_SECONDS = 60
+VELOCITY_MIN_COUNT = 3
+REVERSAL_WINDOW_SECONDS = 300
+REVERSAL_TOLERANCE = Decimal("0.01")
+HIGH_AMOUNT_THRESHOLD = Decimal("10000")
+
+
 def check_high_velocity(
     transactions: List[Transaction],
     target_account: str,
-    window_seconds: int = 60
+    window_seconds: int = VELOCITY_WINDOW_SECONDS
 ) -> Optional[ReasonCode]:
     """Check if account has 3+ transactions within time window.
     
@@ -33,25 +46,21 @@ def check_high_velocity(
         >>> check_high_velocity(txns, "ACC001", window_seconds=60)
         ReasonCode.HIGH_VELOCITY
     """
-    account_txns = [t for t in transactions if t.account_id == target_account]
+    account_times = [
+        to_epoch_micros(t.timestamp)
+        for t in transactions
+        if t.account_id == target_account
+    ]
     
-    if len(account_txns) < 3:
+    if len(account_times) < VELOCITY_MIN_COUNT:
         return None
     
-    # Check each transaction as potential start of window
-    for i in range(len(account_txns) - 2):
-        start_time = account_txns[i].timestamp
-        count = 1
-        
-        for j in range(i + 1, len(account_txns)):
-            time_diff = (account_txns[j].timestamp - start_time).total_seconds()
-            if time_diff <= window_seconds:
-                count += 1
-            else:
-                break
-        
-        if count >= 3:
-            return ReasonCode.HIGH_VELOCITY
+    # Two-pointer sweep: any forward window holding 3+ transactions is a burst
+    burst, _ = sliding_window_counts(
+        account_times, window_seconds * 1_000_000, min_count=VELOCITY_MIN_COUNT
+    )
+    if burst:
+        return ReasonCode.HIGH_VELOCITY
     
     return None
 
@@ -80,7 +89,7 @@ def check_round_amount(transaction: Transaction) -> Optional[ReasonCode]:
 
 def check_high_amount(
     transaction: Transaction,
-    threshold: Decimal = Decimal("10000")
+    threshold: Decimal = HIGH_AMOUNT_THRESHOLD
 ) -> Optional[ReasonCode]:
     """Check if transaction amount exceeds threshold.
     
@@ -106,7 +115,7 @@ def check_high_amount(
 def check_rapid_reversal(
     transactions: List[Transaction],
     target_transaction: Transaction,
-    window_seconds: int = 300
+    window_seconds: int = REVERSAL_WINDOW_SECONDS
 ) -> Optional[ReasonCode]:
     """Check for rapid reversal pattern (debit followed by credit).
     
@@ -143,20 +152,148 @@ def check_rapid_reversal(
             break
         
         # Check if it's a matching reversal
-        if (
-            txn.transaction_type == "CREDIT"
-            and txn.account_id == target_transaction.account_id
-            and txn.beneficiary_id == target_transaction.beneficiary_id
-            and abs(txn.amount - target_transaction.amount) / target_transaction.amount < Decimal("0.01")  # Within 1%
-        ):
+        if is_reversal_match(target_transaction, txn):
             return ReasonCode.RAPID_REVERSAL
     
     return None
 
 
+def check_rapid_reversal_indexed(
+    index: AccountIndex,
+    target: TxRecord,
+    window_seconds: int = REVERSAL_WINDOW_SECONDS
+) -> Optional[ReasonCode]:
+    """Check for rapid reversal using a prebuilt AccountIndex.
+    
+    Same rule as check_rapid_reversal, but candidates are found by binary
+    search over the CREDITs of the (account_id, beneficiary_id) pair, so the
+    cost depends on that pair's activity rather than the whole file.
+    
+    Args:
+        index: AccountIndex built over all transaction records
+        target: The transaction record to check
+        window_seconds: Time window in seconds (default 300 = 5 minutes)
+        
+    Returns:
+        ReasonCode.RAPID_REVERSAL if triggered, None otherwise
+        
+    Example:
+        >>> index = AccountIndex([debit, credit])
+        >>> check_rapid_reversal_indexed(index, debit, 300)
+        ReasonCode.RAPID_REVERSAL
+    """
+    if target.transaction_type != "DEBIT":
+        return None
+    
+    candidates = index.credits_between(
+        target.account_id,
+        target.beneficiary_id,
+        target.timestamp_us,
+        window_seconds
+    )
+    for record in candidates:
+        if is_reversal_match(target, record):
+            return ReasonCode.RAPID_REVERSAL
+    
+    return None
+
+
+def is_reversal_match(
+    debit: Union[Transaction, TxRecord],
+    credit: Union[Transaction, TxRecord]
+) -> bool:
+    """Check whether a CREDIT reverses a DEBIT (same parties, amount within 1%).
+    
+    Accepts Transaction objects or TxRecords; amounts are compared as exact
+    Decimals in both cases.
+    
+    Args:
+        debit: The original DEBIT transaction
+        credit: Candidate CREDIT transaction
+        
+    Returns:
+        True if the credit matches the debit
+    """
+    return (
+        credit.transaction_type == "CREDIT"
+        and credit.account_id == debit.account_id
+        and credit.beneficiary_id == debit.beneficiary_id
+        and abs(credit.amount - debit.amount) / debit.amount < REVERSAL_TOLERANCE  # Within 1%
+    )
+
+
+def check_new_beneficiary(
+    record: TxRecord,
+    index: BeneficiaryIndex
+) -> Optional[ReasonCode]:
+    """Check if a DEBIT is the account's first payment to its beneficiary.
+    
+    The (account_id, beneficiary_id) pair is recorded in the index, so only
+    the first payment triggers. Transactions must be checked in timestamp
+    order. CREDITs are not payments and are ignored.
+    
+    Args:
+        record: Transaction record to check
+        index: Persistent index of pairs already paid
+        
+    Returns:
+        ReasonCode.NEW_BENEFICIARY if triggered, None otherwise
+        
+    Example:
+        >>> with BeneficiaryIndex(Path("state/beneficiaries")) as index:
+        ...     check_new_beneficiary(debit, index)
+        ReasonCode.NEW_BENEFICIARY
+    """
+    if record.transaction_type != "DEBIT":
+        return None
+    
+    if index.check_and_add(record.account_id, record.beneficiary_id):
+        return ReasonCode.NEW_BENEFICIARY
+    
+    return None
+
+
+# Explanation templates, compiled once per reason code: a format string and
+# the context fields it reads, with their defaults
+EXPLANATION_TEMPLATES: Dict[ReasonCode, Tuple[str, Tuple[Tuple[str, Any], ...]]] = {
+    ReasonCode.HIGH_VELOCITY: (
+        "High velocity: {} transactions detected within {} seconds",
+        (("count", "Multiple"), ("window", 60))
+    ),
+    ReasonCode.ROUND_AMOUNT: (
+        "Round amount: Transaction amount {} is a round number (divisible by 100)",
+        (("amount", ""),)
+    ),
+    ReasonCode.HIGH_AMOUNT: (
+        "High amount: Transaction amount {} exceeds threshold of {}",
+        (("amount", ""), ("threshold", 10000))
+    ),
+    ReasonCode.RAPID_REVERSAL: (
+        "Rapid reversal: Debit followed by matching credit within {} seconds",
+        (("window", 300),)
+    ),
+    ReasonCode.NEW_BENEFICIARY: (
+        "New beneficiary: First transaction to beneficiary {}",
+        (("beneficiary_id", "unknown"),)
+    ),
+}
+
+EXPLANATION_CACHE_SIZE = 1 << 16
+
+
+@lru_cache(maxsize=EXPLANATION_CACHE_SIZE)
+def _render_explanation(template: str, values: Tuple[str, ...]) -> str:
+    return template.format(*values)
+
+
 def get_explanation(reason_code: ReasonCode, context: dict) -> str:
     """Generate human-readable explanation for a reason code.
     
+    Only the template of the requested code is rendered. Renderings are
+    cached by their field values, so alerts with identical contexts (the
+    same window, threshold or beneficiary) share one string and skip the
+    formatting.
+    
     Args:
         reason_code: The triggered reason code
         context: Dictionary with contextual information
@@ -168,12 +305,12 @@ def get_explanation(reason_code: ReasonCode, context: dict) -> str:
         >>> get_explanation(ReasonCode.HIGH_VELOCITY, {"count": 4, "window": 60})
         "High velocity: 4 transactions detected within 60 seconds"
     """
-    explanations = {
-        ReasonCode.HIGH_VELOCITY: f"High velocity: {context.get('count', 'Multiple')} transactions detected within {context.get('window', 60)} seconds",
-        ReasonCode.ROUND_AMOUNT: f"Round amount: Transaction amount {context.get('amount', '')} is a round number (divisible by 100)",
-        ReasonCode.HIGH_AMOUNT: f"High amount: Transaction amount {context.get('amount', '')} exceeds threshold of {context.get('threshold', 10000)}",
-        ReasonCode.RAPID_REVERSAL: f"Rapid reversal: Debit followed by matching credit within {context.get('window', 300)} seconds",
-        ReasonCode.NEW_BENEFICIARY: f"New beneficiary: First transaction to beneficiary {context.get('beneficiary_id', 'unknown')}"
-    }
-    
-    return explanations.get(reason_code, f"Alert triggered: {reason_code.value}")
+    compiled = EXPLANATION_TEMPLATES.get(reason_code)
+    if compiled is None:
+        return f"Alert triggered: {reason_code.value}"
+    
+    template, fields = compiled
+    # Key on the formatted values: equal values of different types (10000
+    # and Decimal("10000.00")) must not share a rendering
+    values = tuple([format(context.get(name, default)) for name, default in fields])
+    return _render_explanation(template, values)
@@ -6,9 +6,12 @@ This module defines Pydantic models for type safety and validation.
 from datetime import datetime
 from decimal import Decimal
 from enum import Enum
-from typing import List, Literal
+from functools import cached_property
+from typing import Any, Dict, List, Literal, Optional
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, SerializerFunctionWrapHandler, computed_field, field_validator, model_serializer
+
+from src.common.timestamps import parse_datetime
 
 
 class ReasonCode(str, Enum):
@@ -49,7 +52,7 @@ class Transaction(BaseModel):
     def parse_timestamp(cls, v):
         """Parse ISO format timestamp strings."""
         if isinstance(v, str):
-            return datetime.fromisoformat(v.replace('Z', '+00:00'))
+            return parse_datetime(v)
         return v
     
     @field_validator('amount', mode='before')
@@ -64,21 +67,47 @@ class Transaction(BaseModel):
 class Alert(BaseModel):
     """Represents an AML alert triggered by one or more rules.
     
+    Alerts built by the rules carry the reason codes and the explanation
+    context rather than the explanation text. ``explanation`` renders the
+    text from the per-code templates the first time it is read (or the
+    alert is serialized) and caches it. An explanation passed explicitly
+    takes precedence over the context.
+    
     Example:
         alert = Alert(
             alert_id="ALERT-TX001",
             transaction=transaction_obj,
             reason_codes=[ReasonCode.HIGH_VELOCITY, ReasonCode.ROUND_AMOUNT],
-            explanation="Multiple suspicious patterns detected",
+            explanation_context={"count": 4, "window": 60, "amount": "5000.00"},
             timestamp_detected=datetime.now()
         )
+        alert.explanation  # "High velocity: 4 transactions ...; Round amount: ..."
     """
     
     alert_id: str
     transaction: Transaction
     reason_codes: List[ReasonCode]
-    explanation: str
+    explicit_explanation: Optional[str] = Field(None, alias="explanation", exclude=True, repr=False)
     timestamp_detected: datetime
+    explanation_context: Dict[str, Any] = Field(default_factory=dict, exclude=True, repr=False)
+    
+    @computed_field
+    @cached_property
+    def explanation(self) -> str:
+        """Human-readable explanation of all reason codes, in order."""
+        if self.explicit_explanation is not None:
+            return self.explicit_explanation
+        # Imported here: the templates in rules are keyed by ReasonCode
+        from .rules import get_explanation
+        return "; ".join([get_explanation(code, self.explanation_context) for code in self.reason_codes])
+    
+    @model_serializer(mode='wrap')
+    def serialize_in_field_order(self, handler: SerializerFunctionWrapHandler) -> Dict[str, Any]:
+        """Keep the explanation before timestamp_detected in output."""
+        data = handler(self)
+        if "timestamp_detected" in data:
+            data["timestamp_detected"] = data.pop("timestamp_detected")
+        return data
 
 
 class TriageDecision(BaseModel):
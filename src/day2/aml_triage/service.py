@@ -0,0 +1,443 @@
+"""Real-time AML alert service.
+
+A long-running asyncio server that scores transactions as they arrive and
+answers each one immediately with its reason codes and triage decision.
+
+Protocol: newline-delimited JSON over TCP (or a Unix socket). Each request
+line is one transaction with the same fields as the CSV input; each response
+line is::
+    
+    {"transaction_id": "TX001", "reason_codes": ["ROUND_AMOUNT"], "decision": {...}}
+
+with ``decision`` null when no rule triggered, or ``{"error": "..."}`` for an
+invalid transaction or a request line longer than 64 KiB.
+
+Scoring only looks backwards, since a response cannot wait for future
+transactions:
+- HIGH_VELOCITY flags a transaction that brings its account to 3+
+  transactions within the last 60 seconds
+- RAPID_REVERSAL flags the CREDIT that reverses a DEBIT from the last 300
+  seconds (the batch pipeline flags the DEBIT once the credit is known)
+- ROUND_AMOUNT, HIGH_AMOUNT and NEW_BENEFICIARY are evaluated as in batch
+
+Alerts are handed to a background writer through a bounded queue and
+flushed in batches to the usual aml_alerts.json / triage_queue.csv /
+summary.json outputs; batches are written in a worker thread, off the event
+loop. When the writer falls behind, the queue fills up and
+connections stop being read until it catches up (backpressure).
+
+Usage:
+    python -m src.day2.aml_triage.service --port 8765 --outdir out/day2/service
+"""
+
+import argparse
+import asyncio
+import json
+import signal
+import sys
+from bisect import bisect_left, bisect_right, insort
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from . import io, registry, rules, triage
+from .beneficiaries import BeneficiaryIndex, open_beneficiary_index
+from .pipeline import evaluate_transaction
+from .records import TxRecord
+from .schemas import ReasonCode, TriageDecision
+
+
+DEFAULT_QUEUE_SIZE = 10_000
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_FLUSH_INTERVAL = 0.5
+
+# Longest request line read; longer lines are answered with an error
+_READ_LIMIT = 2 ** 16
+
+
+class RealtimeScorer:
+    """Backward-looking rule evaluation with in-memory per-account windows.
+    
+    Transactions may arrive up to one rule horizon (the largest rule window)
+    late. Each account keeps the transactions that a transaction arriving
+    that late could still need: two horizons behind the newest transaction
+    seen. Accounts that go quiet are swept periodically, so memory is bounded
+    by recent activity.
+    
+    Registered stateless rules are applied as well; creating the scorer
+    raises ValueError if a windowed or history rule it cannot evaluate has
+    been registered (see ``registry.require_per_transaction_rules``).
+    
+    Example:
+        >>> scorer = RealtimeScorer()
+        >>> decision = scorer.score(record)
+        >>> decision.priority if decision else None
+        'P2'
+    """
+    
+    def __init__(
+        self,
+        velocity_window: int = rules.VELOCITY_WINDOW_SECONDS,
+        reversal_window: int = rules.REVERSAL_WINDOW_SECONDS,
+        beneficiaries: Optional[BeneficiaryIndex] = None,
+        sweep_every: int = 10_000
+    ):
+        registry.require_per_transaction_rules("The real-time service")
+        self.velocity_window = velocity_window
+        self.reversal_window = reversal_window
+        self.horizon = max(velocity_window, reversal_window) * 1_000_000
+        self.beneficiaries = beneficiaries
+        self.sweep_every = sweep_every
+        self.windows: Dict[str, List[TxRecord]] = {}
+        self.watermark: Optional[int] = None
+        self.transactions_seen = 0
+    
+    def score(self, record: TxRecord) -> Optional[TriageDecision]:
+        """Score one transaction against the account's recent history.
+        
+        Transactions may arrive out of order by up to the largest rule
+        window; anything later than that is rejected.
+        
+        Args:
+            record: Incoming transaction record
+            
+        Returns:
+            TriageDecision if any rule triggered, None otherwise
+            
+        Raises:
+            ValueError: If the transaction is too late to be scored
+        """
+        micros = record.timestamp_us
+        if self.watermark is not None and micros < self.watermark - self.horizon:
+            raise ValueError(
+                f"Transaction {record.transaction_id} at {record.timestamp_text} "
+                f"is older than the {self.horizon // 1_000_000}s scoring window"
+            )
+        if self.watermark is None or micros > self.watermark:
+            self.watermark = micros
+        
+        window = self.windows.setdefault(record.account_id, [])
+        del window[:bisect_left(window, self.watermark - 2 * self.horizon, key=_timestamp)]
+        insort(window, record, key=_timestamp)
+        
+        # Account transactions in [t - velocity_window, t], this one included
+        velocity_start = bisect_left(window, micros - self.velocity_window * 1_000_000, key=_timestamp)
+        velocity_count = bisect_right(window, micros, key=_timestamp) - velocity_start
+        velocity_result = velocity_count if velocity_count >= rules.VELOCITY_MIN_COUNT else None
+        
+        # A DEBIT in [t - reversal_window, t) that this CREDIT reverses
+        reversal_result = None
+        if record.transaction_type == "CREDIT":
+            reversal_start = bisect_left(window, micros - self.reversal_window * 1_000_000, key=_timestamp)
+            reversal_end = bisect_left(window, micros, key=_timestamp)
+            for other in window[reversal_start:reversal_end]:
+                if other.transaction_type == "DEBIT" and rules.is_reversal_match(other, record):
+                    reversal_result = ReasonCode.RAPID_REVERSAL
+                    break
+        
+        new_beneficiary = (
+            self.beneficiaries is not None
+            and rules.check_new_beneficiary(record, self.beneficiaries) is not None
+        )
+        
+        self.transactions_seen += 1
+        if self.transactions_seen % self.sweep_every == 0:
+            self._sweep()
+        
+        alert = evaluate_transaction(
+            record,
+            velocity_result,
+            reversal_result,
+            new_beneficiary=new_beneficiary
+        )
+        if alert is None:
+            return None
+        return triage.create_triage_decision(alert)
+    
+    def _sweep(self) -> None:
+        """Drop accounts with no transaction that could still be needed."""
+        cutoff = self.watermark - 2 * self.horizon
+        idle = [
+            account_id for account_id, window in self.windows.items()
+            if window[-1].timestamp_us < cutoff
+        ]
+        for account_id in idle:
+            del self.windows[account_id]
+
+
+def _timestamp(record: TxRecord) -> int:
+    return record.timestamp_us
+
+
+async def _respond(writer: asyncio.StreamWriter, response: dict) -> None:
+    """Send one response line."""
+    writer.write(json.dumps(response).encode('utf-8') + b"\n")
+    await writer.drain()
+
+
+async def _skip_line(reader: asyncio.StreamReader) -> None:
+    """Discard input up to and including the next newline (or EOF)."""
+    while True:
+        try:
+            await reader.readuntil(b"\n")
+            return
+        except asyncio.LimitOverrunError as e:
+            await reader.readexactly(e.consumed)
+        except asyncio.IncompleteReadError:
+            return
+
+
+class AlertService:
+    """Asyncio server around a RealtimeScorer with batched alert output.
+    
+    Example:
+        >>> service = AlertService(Path("out/day2/service"))
+        >>> await service.start(port=8765)
+        >>> ...
+        >>> summary = await service.close()
+    """
+    
+    def __init__(
+        self,
+        output_dir: Path,
+        scorer: Optional[RealtimeScorer] = None,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL
+    ):
+        """Create the service (outputs are opened by ``start``).
+        
+        Args:
+            output_dir: Directory for aml_alerts.json, triage_queue.csv and
+                summary.json
+            scorer: Scorer to use (default: a fresh RealtimeScorer)
+            queue_size: Alerts buffered for the writer before connections
+                are throttled
+            batch_size: Maximum alerts written per flush
+            flush_interval: Maximum seconds an alert waits before being
+                flushed to disk
+        """
+        self.output_dir = output_dir
+        self.scorer = scorer if scorer is not None else RealtimeScorer()
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue: Optional[asyncio.Queue] = None
+        self.queue_size = queue_size
+        self.outputs: Optional[io.TriageOutputWriter] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._writer_task: Optional[asyncio.Task] = None
+    
+    async def start(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        unix_socket: Optional[Path] = None
+    ) -> None:
+        """Open the outputs and start listening.
+        
+        Args:
+            host: Interface to bind for TCP
+            port: TCP port (0 picks a free port, see ``port``)
+            unix_socket: Listen on this Unix socket path instead of TCP
+        """
+        self.outputs = io.TriageOutputWriter(self.output_dir)
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        self._writer_task = asyncio.create_task(self._write_alerts())
+        
+        if unix_socket is not None:
+            self._server = await asyncio.start_unix_server(self._handle, path=str(unix_socket), limit=_READ_LIMIT)
+        else:
+            self._server = await asyncio.start_server(self._handle, host, port, limit=_READ_LIMIT)
+    
+    @property
+    def port(self) -> int:
+        """TCP port the server is bound to."""
+        return self._server.sockets[0].getsockname()[1]
+    
+    async def serve_forever(self) -> None:
+        """Serve until the server is closed."""
+        await self._server.serve_forever()
+    
+    async def close(self) -> dict:
+        """Stop accepting connections, flush queued alerts and write all outputs.
+        
+        Returns:
+            The summary written to summary.json
+        """
+        self._server.close()
+        await self._server.wait_closed()
+        
+        await self.queue.put(None)
+        await self._writer_task
+        return await asyncio.to_thread(self.outputs.close)
+    
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Score each request line and answer it on the same connection."""
+        try:
+            while True:
+                try:
+                    line = await reader.readuntil(b"\n")
+                except asyncio.IncompleteReadError as e:
+                    line = e.partial  # last line without a newline, or EOF
+                except asyncio.LimitOverrunError:
+                    # Skip the rest of the line so the next request is read intact
+                    await _skip_line(reader)
+                    await _respond(writer, {"error": f"Request line longer than {_READ_LIMIT} bytes"})
+                    continue
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                
+                await _respond(writer, await self._score_line(line))
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+    
+    async def _score_line(self, line: bytes) -> dict:
+        """Parse, score and enqueue one transaction."""
+        try:
+            # Keep numbers as text so amounts are parsed exactly
+            row = json.loads(line, parse_float=str, parse_int=str)
+            if not isinstance(row, dict):
+                raise ValueError("expected a JSON object")
+            record = TxRecord.from_row(row)
+            decision = self.scorer.score(record)
+        except (ValueError, TypeError) as e:
+            return {"error": f"Invalid transaction: {e}"}
+        
+        if decision is None:
+            return {"transaction_id": record.transaction_id, "reason_codes": [], "decision": None}
+        
+        # Waits here when the writer is behind, which stops this connection
+        # from being read until there is room
+        await self.queue.put(decision)
+        return {
+            "transaction_id": record.transaction_id,
+            "reason_codes": [code.value for code in decision.alert.reason_codes],
+            "decision": decision.model_dump(mode='json')
+        }
+    
+    async def _write_alerts(self) -> None:
+        """Drain the queue into the outputs, flushing once per batch.
+        
+        A batch ends after ``batch_size`` alerts or ``flush_interval``
+        seconds after its first alert, whichever comes first. Each batch is
+        serialized and written in a worker thread so file I/O never blocks
+        scoring on the event loop. None on the queue stops the writer.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            decision = await self.queue.get()
+            if decision is None:
+                return
+            
+            batch = [decision]
+            stopping = False
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    decision = await asyncio.wait_for(self.queue.get(), deadline - loop.time())
+                except asyncio.TimeoutError:
+                    break
+                if decision is None:
+                    stopping = True
+                    break
+                batch.append(decision)
+            
+            await asyncio.to_thread(self._write_batch, batch)
+            if stopping:
+                return
+    
+    def _write_batch(self, batch: List[TriageDecision]) -> None:
+        """Write and flush one batch of alerts (runs in a worker thread)."""
+        for decision in batch:
+            self.outputs.write(decision)
+        self.outputs.flush()
+
+
+def _on_shutdown_signal(stop: asyncio.Event) -> None:
+    """Set ``stop`` on SIGINT/SIGTERM.
+    
+    Event loops without signal handler support (Windows) fall back to
+    ``signal.signal``, waking the loop thread-safely from the handler.
+    """
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):
+            signal.signal(sig, lambda signum, frame: loop.call_soon_threadsafe(stop.set))
+
+
+async def serve(
+    output_dir: Path,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    unix_socket: Optional[Path] = None,
+    beneficiary_index: Optional[Path] = None,
+    queue_size: int = DEFAULT_QUEUE_SIZE
+) -> dict:
+    """Run the service until SIGINT/SIGTERM, then write all outputs.
+    
+    Returns:
+        The summary written to summary.json
+    """
+    with open_beneficiary_index(beneficiary_index) as beneficiaries:
+        service = AlertService(
+            output_dir,
+            scorer=RealtimeScorer(beneficiaries=beneficiaries),
+            queue_size=queue_size
+        )
+        await service.start(host, port, unix_socket)
+        print(f"Listening on {unix_socket or f'{host}:{service.port}'}", flush=True)
+        
+        stop = asyncio.Event()
+        _on_shutdown_signal(stop)
+        await stop.wait()
+        
+        return await service.close()
+
+
+def main():
+    """Service entrypoint."""
+    parser = argparse.ArgumentParser(
+        description="AML Alert Service - Score transactions in real time over NDJSON"
+    )
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to bind (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='TCP port (default: 8765)')
+    parser.add_argument('--unix-socket', type=Path, default=None, help='Listen on a Unix socket instead of TCP')
+    parser.add_argument(
+        '--outdir',
+        type=Path,
+        default=Path('out/day2/service'),
+        help='Output directory for results (default: out/day2/service)'
+    )
+    parser.add_argument(
+        '--beneficiary-index',
+        type=Path,
+        default=None,
+        help='Directory of the persistent beneficiary index; enables the NEW_BENEFICIARY rule'
+    )
+    parser.add_argument(
+        '--queue-size',
+        type=int,
+        default=DEFAULT_QUEUE_SIZE,
+        help=f'Alerts buffered before clients are throttled (default: {DEFAULT_QUEUE_SIZE})'
+    )
+    args = parser.parse_args()
+    
+    summary = asyncio.run(serve(
+        args.outdir,
+        host=args.host,
+        port=args.port,
+        unix_socket=args.unix_socket,
+        beneficiary_index=args.beneficiary_index,
+        queue_size=args.queue_size
+    ))
+    print(f"Wrote {summary['total_alerts']} alerts to {args.outdir}/")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,191 @@
+"""Checkpointed streaming state for incremental AML triage.
+
+Hourly (or other micro-batch) files are processed with the streaming engine,
+whose state is bounded by the rule windows. Saving that state at the end of
+a run and loading it at the start of the next lets a velocity burst or a
+debit/credit reversal that spans two files be detected without re-reading
+the earlier file.
+
+The checkpoint is a small JSON document:
+- watermark: epoch microseconds of the last processed transaction
+- history: per-account tail of transactions still inside a rule window
+- pending: transactions whose windows are not yet closed (alerts for them
+  are emitted by a later run, or when the state is finalized)
+"""
+
+import json
+import os
+from collections import deque
+from pathlib import Path
+from typing import Optional
+
+from . import rules
+from .extsort import DEFAULT_RUN_SIZE
+from .records import TxRecord
+from .streaming import StreamingTriage, run_streaming_pipeline
+
+
+STATE_VERSION = 1
+
+
+def save_state(engine: StreamingTriage, state_path: Path) -> None:
+    """Write the engine's state to a checkpoint file.
+    
+    The file is written to a temporary path and renamed into place, so an
+    interrupted run never leaves a truncated checkpoint behind.
+    
+    Args:
+        engine: Streaming engine to checkpoint
+        state_path: Checkpoint file to write
+        
+    Example:
+        >>> save_state(engine, Path("state/aml_state.json"))
+    """
+    # Every pending transaction is still in its account's history (only
+    # entries older than a finalized transaction are evicted), so pending
+    # entries are stored as positions in the history lists
+    offsets = {
+        id(record): (account_id, position)
+        for account_id, account_history in engine.history.items()
+        for position, record in enumerate(account_history)
+    }
+    
+    state = {
+        "version": STATE_VERSION,
+        "velocity_window": engine.velocity_window,
+        "reversal_window": engine.reversal_window,
+        "watermark": engine.watermark,
+        "history": {
+            account_id: [record.to_row() for record in account_history]
+            for account_id, account_history in engine.history.items()
+        },
+        "pending": [list(offsets[id(record)]) for record in engine.pending]
+    }
+    
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = state_path.with_name(state_path.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+    os.replace(tmp_path, state_path)
+
+
+def load_state(
+    state_path: Path,
+    velocity_window: int = rules.VELOCITY_WINDOW_SECONDS,
+    reversal_window: int = rules.REVERSAL_WINDOW_SECONDS
+) -> StreamingTriage:
+    """Restore a streaming engine from a checkpoint file.
+    
+    A missing file means a first run and yields a fresh engine.
+    
+    Args:
+        state_path: Checkpoint file to read
+        velocity_window: Expected HIGH_VELOCITY window in seconds
+        reversal_window: Expected RAPID_REVERSAL window in seconds
+        
+    Returns:
+        StreamingTriage with the saved watermark, history and pending
+        transactions (transactions_seen starts at 0 for the new run)
+        
+    Raises:
+        ValueError: If the checkpoint is invalid or was written with
+            different rule windows
+            
+    Example:
+        >>> engine = load_state(Path("state/aml_state.json"))
+        >>> engine.watermark
+        1705312800000000
+    """
+    engine = StreamingTriage(velocity_window=velocity_window, reversal_window=reversal_window)
+    if not state_path.exists():
+        return engine
+    
+    try:
+        with open(state_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        
+        if state["version"] != STATE_VERSION:
+            raise ValueError(f"unsupported version {state['version']}")
+        if (state["velocity_window"], state["reversal_window"]) != (velocity_window, reversal_window):
+            raise ValueError(
+                f"saved with windows {state['velocity_window']}s/{state['reversal_window']}s, "
+                f"expected {velocity_window}s/{reversal_window}s"
+            )
+        
+        engine.watermark = state["watermark"]
+        for account_id, rows in state["history"].items():
+            engine.history[account_id] = deque(TxRecord.from_row(row) for row in rows)
+        for account_id, position in state["pending"]:
+            engine.pending.append(engine.history[account_id][position])
+    except (KeyError, IndexError, TypeError, json.JSONDecodeError, ValueError) as e:
+        raise ValueError(f"Invalid AML state checkpoint {state_path}: {e}")
+    
+    return engine
+
+
+def run_incremental_pipeline(
+    input_csv: Path,
+    output_dir: Path,
+    state_path: Path,
+    finalize: bool = False,
+    presorted: bool = True,
+    run_size: int = DEFAULT_RUN_SIZE,
+    tmp_dir: Optional[Path] = None,
+    beneficiary_index: Optional[Path] = None,
+    alerts_format: str = "json",
+    top_k: Optional[int] = None,
+    queue_buckets: bool = False
+) -> dict:
+    """Process one micro-batch file, carrying rule state across runs.
+    
+    Loads the checkpoint (if any), streams the new rows through the engine
+    and saves the checkpoint again. Transactions whose rule windows are still
+    open at the end of the file stay pending, so their alerts appear in the
+    next run's outputs once later rows are known. Pass ``finalize=True`` for
+    the last file of a period to emit them immediately instead.
+    
+    Args:
+        input_csv: Path to the new input CSV file
+        output_dir: Directory for output files
+        state_path: Checkpoint file (created on the first run)
+        finalize: Flush all pending transactions at the end of this run
+        presorted: Input is already sorted by timestamp; if False, it is
+            ordered with an external merge sort first
+        run_size: Rows held in memory per sort run
+        tmp_dir: Directory for sort run files (default: system temp dir)
+        beneficiary_index: Directory of the persistent beneficiary index;
+            enables the NEW_BENEFICIARY rule
+        alerts_format: Format of aml_alerts.json (see ``io.AlertJsonWriter``)
+        top_k: Only write the first top_k rows of triage_queue.csv
+        queue_buckets: Also write one triage queue file per assigned queue
+        
+    Returns:
+        Summary dictionary with statistics (same keys as run_pipeline), plus
+        ``pending_transactions`` carried over to the next run
+        
+    Raises:
+        ValueError: If the input contains transactions older than the
+            checkpoint's watermark, or the checkpoint is invalid
+            
+    Example:
+        >>> run_incremental_pipeline(Path("10h.csv"), Path("out/10h"), Path("state.json"))
+        >>> run_incremental_pipeline(Path("11h.csv"), Path("out/11h"), Path("state.json"))
+    """
+    engine = load_state(state_path)
+    summary = run_streaming_pipeline(
+        input_csv,
+        output_dir,
+        presorted=presorted,
+        run_size=run_size,
+        tmp_dir=tmp_dir,
+        engine=engine,
+        flush=finalize,
+        beneficiary_index=beneficiary_index,
+        alerts_format=alerts_format,
+        top_k=top_k,
+        queue_buckets=queue_buckets
+    )
+    save_state(engine, state_path)
+    
+    summary["pending_transactions"] = len(engine.pending)
+    return summary
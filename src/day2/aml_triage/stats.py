@@ -0,0 +1,119 @@
+"""Incremental summary statistics for triage decisions.
+
+TriageStats is updated once per decision as decisions are created, so the
+batch pipeline, the streaming writer and the alert service all produce
+summary.json without re-scanning their decisions. Stats built on separate
+shards can be merged.
+"""
+
+from typing import Dict, Iterable, Optional, Tuple
+
+from .schemas import TriageDecision
+
+
+class TriageStats:
+    """Running counts by priority, reason code and queue.
+    
+    Keys of by_reason_code and by_queue are reported in order of the first
+    decision that used them, as a single pass over the decisions would.
+    Each decision has a position (by default, the order it was added in);
+    shards that add decisions with their global positions therefore merge
+    into exactly the summary of one pass over all decisions.
+    
+    Example:
+        >>> stats = TriageStats()
+        >>> for decision in decisions:
+        ...     stats.add(decision)
+        >>> stats.to_summary()["total_alerts"]
+        8
+    """
+    
+    def __init__(self):
+        self.total_alerts = 0
+        self.by_priority = {"P1": 0, "P2": 0, "P3": 0}
+        self.by_reason_code: Dict[str, int] = {}
+        self.by_queue: Dict[str, int] = {}
+        # (position, index in reason_codes) of the first decision using a key
+        self._first_code: Dict[str, Tuple[int, int]] = {}
+        self._first_queue: Dict[str, Tuple[int, int]] = {}
+    
+    @classmethod
+    def from_decisions(cls, decisions: Iterable[TriageDecision]) -> "TriageStats":
+        """Build stats from decisions in order."""
+        stats = cls()
+        for decision in decisions:
+            stats.add(decision)
+        return stats
+    
+    def add(self, decision: TriageDecision, position: Optional[int] = None) -> None:
+        """Count one decision.
+        
+        Args:
+            decision: Decision to count
+            position: Order key of the decision across all shards, increasing
+                from one call to the next (default: the number of decisions
+                added so far)
+        """
+        if position is None:
+            position = self.total_alerts
+        self.total_alerts += 1
+        self.by_priority[decision.priority] += 1
+        
+        for index, code in enumerate(decision.alert.reason_codes):
+            value = code.value
+            self.by_reason_code[value] = self.by_reason_code.get(value, 0) + 1
+            if value not in self._first_code:
+                self._first_code[value] = (position, index)
+        
+        queue = decision.assigned_queue
+        self.by_queue[queue] = self.by_queue.get(queue, 0) + 1
+        if queue not in self._first_queue:
+            self._first_queue[queue] = (position, 0)
+    
+    def merge(self, other: "TriageStats") -> "TriageStats":
+        """Add another shard's counts to these stats.
+        
+        Returns:
+            self, for chaining
+        """
+        self.total_alerts += other.total_alerts
+        for priority, count in other.by_priority.items():
+            self.by_priority[priority] = self.by_priority.get(priority, 0) + count
+        for code, count in other.by_reason_code.items():
+            self.by_reason_code[code] = self.by_reason_code.get(code, 0) + count
+            _keep_first(self._first_code, code, other._first_code[code])
+        for queue, count in other.by_queue.items():
+            self.by_queue[queue] = self.by_queue.get(queue, 0) + count
+            _keep_first(self._first_queue, queue, other._first_queue[queue])
+        return self
+    
+    def priority_counts(self) -> Dict[str, int]:
+        """Non-zero priority counts (as returned by the pipelines)."""
+        return {priority: count for priority, count in self.by_priority.items() if count}
+    
+    def to_summary(self) -> dict:
+        """Summary in the summary.json layout.
+        
+        Returns:
+            Dictionary with total_alerts, by_priority, by_reason_code and
+            by_queue
+        """
+        return {
+            "total_alerts": self.total_alerts,
+            "by_priority": dict(self.by_priority),
+            "by_reason_code": {
+                code: self.by_reason_code[code]
+                for code in sorted(self.by_reason_code, key=self._first_code.__getitem__)
+            },
+            "by_queue": {
+                queue: self.by_queue[queue]
+                for queue in sorted(self.by_queue, key=self._first_queue.__getitem__)
+            }
+        }
+
+
+def _keep_first(first_seen: Dict[str, Tuple[int, int]], key: str, order: Tuple[int, int]) -> None:
+    """Record ``order`` for ``key`` unless an earlier one is already known."""
+    current = first_seen.get(key)
+    if current is None or order < current:
+        first_seen[key] = order
@@ -0,0 +1,274 @@
+"""Streaming mode for the AML Triage Pipeline.
+
+The batch pipeline loads and sorts the whole file before evaluating any
+rule. In streaming mode transactions are consumed one at a time from a
+time-ordered input and only the recent history of each account is kept:
+anything older than the largest rule window can no longer influence a
+decision and is evicted.
+
+Input that is not already time-ordered can be passed through an external
+merge sort first (see ``extsort``).
+
+A transaction is finalized once the stream has moved more than the
+largest rule window past it, at which point every rule has seen all the
+transactions it could depend on. Alerts are therefore emitted with a lag of
+at most that window, in the same timestamp order as the batch pipeline.
+
+Note:
+    Because history is bounded, HIGH_VELOCITY is scoped to the burst: a
+    transaction is flagged when it falls inside a window holding 3+
+    transactions for its account. The batch pipeline flags every
+    transaction of an account that bursts anywhere in the file.
+"""
+
+from bisect import bisect_right
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, Iterable, List, Optional
+
+from . import io, registry, rules, triage
+from .beneficiaries import BeneficiaryIndex, open_beneficiary_index
+from .extsort import DEFAULT_RUN_SIZE
+from .pipeline import evaluate_transaction
+from .records import TxRecord
+from .schemas import Alert, ReasonCode
+
+
+class StreamingTriage:
+    """Incremental rule evaluation over a time-ordered transaction stream.
+    
+    State is bounded by the rule windows:
+    - pending: transactions not yet finalized (at most ``horizon`` seconds old)
+    - history: per-account transactions still inside a velocity window of
+      some pending transaction
+      
+    NEW_BENEFICIARY is evaluated when ``beneficiaries`` is set; the index is
+    persistent and not part of this bounded state. Registered stateless
+    rules are applied as well; creating the engine raises ValueError if a
+    windowed or history rule it cannot evaluate has been registered (see
+    ``registry.require_per_transaction_rules``).
+    
+    Example:
+        >>> engine = StreamingTriage()
+        >>> for record in io.iter_records(Path("sample.csv")):
+        ...     for alert in engine.push(record):
+        ...         print(alert.alert_id)
+        >>> for alert in engine.flush():
+        ...     print(alert.alert_id)
+    """
+    
+    def __init__(
+        self,
+        velocity_window: int = rules.VELOCITY_WINDOW_SECONDS,
+        reversal_window: int = rules.REVERSAL_WINDOW_SECONDS,
+        beneficiaries: Optional[BeneficiaryIndex] = None
+    ):
+        registry.require_per_transaction_rules("Streaming mode")
+        self.velocity_window = velocity_window
+        self.reversal_window = reversal_window
+        self.horizon = max(velocity_window, reversal_window) * 1_000_000
+        self.pending: Deque[TxRecord] = deque()
+        self.history: Dict[str, Deque[TxRecord]] = {}
+        self.watermark: Optional[int] = None
+        self.transactions_seen = 0
+        self.beneficiaries = beneficiaries
+    
+    def push(self, record: TxRecord) -> List[Alert]:
+        """Add the next transaction and return alerts that became final.
+        
+        Args:
+            record: Next transaction record in timestamp order
+            
+        Returns:
+            Alerts for transactions finalized by this arrival
+            
+        Raises:
+            ValueError: If the transaction is older than one already seen
+        """
+        micros = record.timestamp_us
+        if self.watermark is not None and micros < self.watermark:
+            raise ValueError(
+                f"Streaming mode requires time-ordered input: transaction "
+                f"{record.transaction_id} at {record.timestamp_text} is out of order"
+            )
+        self.watermark = micros
+        self.transactions_seen += 1
+        
+        self.pending.append(record)
+        self.history.setdefault(record.account_id, deque()).append(record)
+        
+        alerts = []
+        while self.pending and self.pending[0].timestamp_us + self.horizon < micros:
+            alert = self._finalize()
+            if alert:
+                alerts.append(alert)
+        
+        return alerts
+    
+    def flush(self) -> List[Alert]:
+        """Finalize every pending transaction (end of stream).
+        
+        Returns:
+            Alerts for all remaining transactions
+        """
+        alerts = []
+        while self.pending:
+            alert = self._finalize()
+            if alert:
+                alerts.append(alert)
+        
+        return alerts
+    
+    def _finalize(self) -> Optional[Alert]:
+        """Evaluate all rules for the oldest pending transaction."""
+        record = self.pending.popleft()
+        micros = record.timestamp_us
+        account_history = self.history[record.account_id]
+        window = self.velocity_window * 1_000_000
+        
+        # Pending transactions are finalized in time order, so nothing older
+        # than this transaction's velocity window is needed any more
+        while account_history[0].timestamp_us < micros - window:
+            account_history.popleft()
+        
+        velocity_count = self._velocity_count(account_history, micros, window)
+        
+        reversal_result = None
+        if record.transaction_type == "DEBIT":
+            end = micros + self.reversal_window * 1_000_000
+            for other in account_history:
+                if micros < other.timestamp_us <= end and rules.is_reversal_match(record, other):
+                    reversal_result = ReasonCode.RAPID_REVERSAL
+                    break
+        
+        new_beneficiary = (
+            self.beneficiaries is not None
+            and rules.check_new_beneficiary(record, self.beneficiaries) is not None
+        )
+        
+        alert = evaluate_transaction(
+            record,
+            velocity_count,
+            reversal_result,
+            new_beneficiary=new_beneficiary
+        )
+        
+        # Entries are finalized in arrival order, so if this was the account's
+        # latest transaction nothing pending can reach back to its history
+        if account_history[-1] is record:
+            del self.history[record.account_id]
+        
+        return alert
+    
+    @staticmethod
+    def _velocity_count(
+        account_history: Deque[TxRecord],
+        micros: int,
+        window: int
+    ) -> Optional[int]:
+        """Count neighbours within the window if the transaction is in a burst.
+        
+        ``account_history`` is sorted and already starts at or after
+        ``micros - window``. A transaction is in a burst when some window
+        starting at or before it, and reaching it, holds 3+ transactions of
+        the account.
+        """
+        times = [r.timestamp_us for r in account_history]
+        position = bisect_right(times, micros)
+        
+        span = rules.VELOCITY_MIN_COUNT - 1
+        in_burst = any(
+            times[i + span] <= times[i] + window
+            for i in range(min(position, len(times) - span))
+        )
+        if not in_burst:
+            return None
+        
+        return bisect_right(times, micros + window)
+
+
+def run_streaming_pipeline(
+    input_csv: Path,
+    output_dir: Path,
+    presorted: bool = True,
+    run_size: int = DEFAULT_RUN_SIZE,
+    tmp_dir: Optional[Path] = None,
+    engine: Optional[StreamingTriage] = None,
+    flush: bool = True,
+    beneficiary_index: Optional[Path] = None,
+    alerts_format: str = "json",
+    top_k: Optional[int] = None,
+    queue_buckets: bool = False
+) -> dict:
+    """Run the AML triage pipeline in streaming mode.
+    
+    Alerts are appended to aml_alerts.json as soon as they are final. Triage
+    queue rows go through an external sort, so memory stays bounded by
+    ``run_size`` rows plus the rule windows.
+    
+    Args:
+        input_csv: Path to input CSV file
+        output_dir: Directory for output files
+        presorted: Input is already sorted by timestamp; if False, it is
+            ordered with an external merge sort first
+        run_size: Rows held in memory per sort run
+        tmp_dir: Directory for sort run files (default: system temp dir)
+        engine: Engine to continue from (default: a fresh StreamingTriage);
+            see ``state`` for checkpointing it between runs
+        flush: Finalize pending transactions at end of input; if False they
+            are left pending in ``engine``
+        beneficiary_index: Directory of the persistent beneficiary index;
+            enables the NEW_BENEFICIARY rule
+        alerts_format: Format of aml_alerts.json (see ``io.AlertJsonWriter``)
+        top_k: Only write the first top_k rows of triage_queue.csv
+        queue_buckets: Also write one triage queue file per assigned queue
+        
+    Returns:
+        Summary dictionary with statistics (same keys as run_pipeline)
+        
+    Raises:
+        ValueError: If the input is not sorted by timestamp (presorted=True), or
+            is older than the engine's watermark
+            
+    Example:
+        >>> summary = run_streaming_pipeline(
+        ...     Path("sample_transactions.csv"),
+        ...     Path("out/day2/lab3")
+        ... )
+    """
+    if engine is None:
+        engine = StreamingTriage()
+    engine.transactions_seen = 0
+    
+    if presorted:
+        records = io.iter_records(input_csv)
+    else:
+        records = io.iter_sorted_records(input_csv, run_size=run_size, tmp_dir=tmp_dir)
+    
+    outputs = io.TriageOutputWriter(
+        output_dir,
+        run_size=run_size,
+        tmp_dir=tmp_dir,
+        alerts_format=alerts_format,
+        top_k=top_k,
+        queue_buckets=queue_buckets
+    )
+    
+    def emit(alerts: Iterable[Alert]) -> None:
+        for alert in alerts:
+            outputs.write(triage.create_triage_decision(alert))
+    
+    with outputs, open_beneficiary_index(beneficiary_index) as beneficiaries:
+        if beneficiaries is not None:
+            engine.beneficiaries = beneficiaries
+        for record in records:
+            emit(engine.push(record))
+        if flush:
+            emit(engine.flush())
+    
+    return {
+        "total_alerts": outputs.count,
+        "total_transactions": engine.transactions_seen,
+        "by_priority": outputs.stats.priority_counts(),
+        "output_dir": str(output_dir)
+    }
@@ -0,0 +1,164 @@
+"""Synthetic transaction generator for AML benchmarks and load tests.
+
+Produces realistic-looking transaction files of any size in the same layout
+as ``src/samples/sample_transactions_day2.csv``. Background traffic is a
+mix of debits and credits spread over a pool of accounts, each paying a
+growing set of beneficiaries; on top of that the generator injects the
+patterns the AML rules look for, at configurable rates:
+
+- bursts: 3-5 debits from one account within a minute (HIGH_VELOCITY,
+  which flags every transaction of the account, so the alert rate grows
+  with the number of transactions per account)
+- reversals: a debit credited back in full within five minutes
+  (RAPID_REVERSAL)
+- beneficiary churn: payments to beneficiaries the account has never paid
+  (NEW_BENEFICIARY, when a beneficiary index is used)
+- round and high amounts (ROUND_AMOUNT, HIGH_AMOUNT)
+
+Output is deterministic for a given seed and rows are written in timestamp
+order.
+
+Example:
+    >>> write_synthetic_csv(Path("out/day2/bench/100k.csv"), 100_000, accounts=5_000)
+    100000
+"""
+
+import csv
+import heapq
+import random
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+from .records import REQUIRED_FIELDS
+
+
+FIELDS = REQUIRED_FIELDS + ("currency",)
+
+DEFAULT_START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+_CREDIT_RATE = 0.15
+_ROUND_RATE = 0.02
+_HIGH_AMOUNT_RATE = 0.005
+_BURST_SIZES = (3, 4, 5)
+
+
+def generate_transactions(
+    rows: int,
+    accounts: int = 1000,
+    burst_rate: float = 0.001,
+    reversal_rate: float = 0.002,
+    beneficiary_churn: float = 0.05,
+    seed: int = 0,
+    start: datetime = DEFAULT_START
+) -> Iterator[Dict[str, str]]:
+    """Generate synthetic transaction rows in timestamp order.
+    
+    Args:
+        rows: Number of rows to generate
+        accounts: Size of the account pool
+        burst_rate: Probability that an event is a burst of rapid debits
+        reversal_rate: Probability that an event is a debit that is later
+            reversed by a matching credit
+        beneficiary_churn: Probability that a payment goes to a beneficiary
+            the account has not paid before
+        seed: Random seed (same seed, same rows)
+        start: Timestamp of the first event
+        
+    Yields:
+        Row dicts with the CSV column names (values are strings)
+        
+    Raises:
+        ValueError: If rows is negative, accounts is not positive or a rate
+            is outside [0, 1]
+    """
+    if rows < 0 or accounts < 1:
+        raise ValueError("rows must be >= 0 and accounts >= 1")
+    for name, rate in (("burst_rate", burst_rate), ("reversal_rate", reversal_rate),
+                       ("beneficiary_churn", beneficiary_churn)):
+        if not 0 <= rate <= 1:
+            raise ValueError(f"{name} must be between 0 and 1, got {rate}")
+    
+    rng = random.Random(seed)
+    payees: List[List[str]] = [[] for _ in range(accounts)]
+    # Scheduled rows (seconds, sequence, row) not yet due
+    pending: List[Tuple[int, int, Dict[str, str]]] = []
+    sequence = 0
+    clock = 0
+    emitted = 0
+    
+    def beneficiary(account: int) -> str:
+        known = payees[account]
+        if not known or rng.random() < beneficiary_churn:
+            known.append(f"BEN{account:06d}-{len(known):04d}")
+            return known[-1]
+        return rng.choice(known)
+    
+    def amount() -> str:
+        draw = rng.random()
+        if draw < _HIGH_AMOUNT_RATE:
+            return f"{rng.randint(10_000, 50_000)}.{rng.randint(0, 99):02d}"
+        if draw < _HIGH_AMOUNT_RATE + _ROUND_RATE:
+            return f"{rng.randint(1, 99) * 100}.00"
+        return f"{rng.randint(1, 4_999)}.{rng.randint(0, 99):02d}"
+    
+    def schedule(seconds: int, account: int, transaction_type: str, value: str, payee: str) -> None:
+        nonlocal sequence
+        row = {
+            "account_id": f"ACC{account:06d}",
+            "timestamp": seconds,
+            "amount": value,
+            "transaction_type": transaction_type,
+            "beneficiary_id": payee,
+            "currency": "USD",
+        }
+        heapq.heappush(pending, (seconds, sequence, row))
+        sequence += 1
+    
+    while emitted < rows:
+        # Emit everything due before the next event
+        while pending and (pending[0][0] <= clock or emitted + len(pending) >= rows):
+            seconds, _, row = heapq.heappop(pending)
+            row["timestamp"] = (start + timedelta(seconds=seconds)).strftime("%Y-%m-%dT%H:%M:%SZ")
+            emitted += 1
+            yield {"transaction_id": f"TX{emitted:09d}", **row}
+            if emitted == rows:
+                return
+        
+        account = rng.randrange(accounts)
+        draw = rng.random()
+        if draw < burst_rate:
+            offset = 0
+            for _ in range(rng.choice(_BURST_SIZES)):
+                schedule(clock + offset, account, "DEBIT", amount(), beneficiary(account))
+                offset += rng.randint(5, 15)
+        elif draw < burst_rate + reversal_rate:
+            value, payee = amount(), beneficiary(account)
+            schedule(clock, account, "DEBIT", value, payee)
+            schedule(clock + rng.randint(30, 240), account, "CREDIT", value, payee)
+        else:
+            transaction_type = "CREDIT" if rng.random() < _CREDIT_RATE else "DEBIT"
+            schedule(clock, account, transaction_type, amount(), beneficiary(account))
+        clock += rng.randint(0, 2)
+
+
+def write_synthetic_csv(path: Path, rows: int, **options) -> int:
+    """Write a synthetic transaction CSV file.
+    
+    Args:
+        path: Output CSV path (parent directories are created)
+        rows: Number of rows to generate
+        **options: Generator options (see generate_transactions)
+        
+    Returns:
+        Number of rows written
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    written = 0
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        for row in generate_transactions(rows, **options):
+            writer.writerow(row)
+            written += 1
+    return written
@@ -0,0 +1,143 @@
+"""Triage queue ordering without a global sort.
+
+The triage queue is ordered by triage_score descending, then alert_id.
+Scores are sums of a handful of rule weights, so there are only a few
+distinct values: decisions are bucketed by score and only each bucket is
+ordered by alert_id. Since the assigned queue (HIGH_RISK / MEDIUM_RISK /
+LOW_RISK) is a function of the score, the buckets also split cleanly into
+per-queue outputs.
+
+Bucketing only saves work when scores are spread out: when most decisions
+share one score, sorting that bucket by alert_id is effectively the global
+sort. Build the queue once and derive every output from it (see
+``split_by_queue``) rather than sorting per output.
+
+When only the top of the queue is needed, a bounded heap keeps the first
+``k`` entries in O(n log k) time and O(k) memory.
+"""
+
+import heapq
+import itertools
+from typing import Any, Dict, Generic, List, Optional, TypeVar
+
+from .schemas import TriageDecision
+
+
+T = TypeVar("T")
+
+QUEUE_ORDER = ("HIGH_RISK", "MEDIUM_RISK", "LOW_RISK")
+
+
+class _Descending:
+    """Wrap a value so that it orders in reverse."""
+    
+    __slots__ = ("value",)
+    
+    def __init__(self, value: Any):
+        self.value = value
+    
+    def __lt__(self, other: "_Descending") -> bool:
+        return self.value > other.value
+    
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Descending) and self.value == other.value
+
+
+class TopK(Generic[T]):
+    """Keep the first ``k`` items in triage order using a bounded heap.
+    
+    The heap's root is the entry that would be dropped next (lowest score,
+    then largest alert_id), so each add is O(log k).
+    
+    Example:
+        >>> top = TopK(2)
+        >>> for score, alert_id in [(20.0, "A3"), (70.0, "A2"), (20.0, "A1")]:
+        ...     top.add(score, alert_id, alert_id)
+        >>> top.items()
+        ['A2', 'A1']
+    """
+    
+    def __init__(self, k: int):
+        if k < 1:
+            raise ValueError(f"k must be positive, got {k}")
+        self.k = k
+        self._heap: List[tuple] = []
+        self._counter = itertools.count()
+    
+    def add(self, score: float, alert_id: str, item: T) -> None:
+        """Offer one item; it is kept if it ranks among the first k."""
+        entry = (score, _Descending(alert_id), next(self._counter), item)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif self._heap[0][:2] < entry[:2]:
+            heapq.heapreplace(self._heap, entry)
+    
+    def items(self) -> List[T]:
+        """Kept items in triage order."""
+        # Ties keep insertion order, like a stable sort
+        entries = sorted(self._heap, key=lambda e: (-e[0], e[1].value, e[2]))
+        return [entry[3] for entry in entries]
+    
+    def __len__(self) -> int:
+        return len(self._heap)
+
+
+class TriageQueueBuilder:
+    """Collect triage decisions and return them in queue order.
+    
+    Example:
+        >>> builder = TriageQueueBuilder(top_k=1000)
+        >>> for decision in decisions:
+        ...     builder.add(decision)
+        >>> first = builder.ordered()
+    """
+    
+    def __init__(self, top_k: Optional[int] = None):
+        """Create a builder.
+        
+        Args:
+            top_k: Keep only the first top_k decisions (bounded heap);
+                None keeps all of them (score buckets)
+        """
+        self.top_k = top_k
+        self._top: Optional[TopK[TriageDecision]] = TopK(top_k) if top_k is not None else None
+        self._by_score: Dict[float, List[TriageDecision]] = {}
+    
+    def add(self, decision: TriageDecision) -> None:
+        """Add one decision."""
+        if self._top is not None:
+            self._top.add(decision.triage_score, decision.alert.alert_id, decision)
+        else:
+            self._by_score.setdefault(decision.triage_score, []).append(decision)
+    
+    def ordered(self) -> List[TriageDecision]:
+        """Decisions in triage order (score descending, then alert_id)."""
+        if self._top is not None:
+            return self._top.items()
+        
+        ordered = []
+        for score in sorted(self._by_score, reverse=True):
+            ordered.extend(sorted(self._by_score[score], key=lambda d: d.alert.alert_id))
+        return ordered
+    
+    def by_queue(self) -> Dict[str, List[TriageDecision]]:
+        """Decisions split by assigned queue, each in triage order.
+        
+        Returns:
+            Mapping of every queue in QUEUE_ORDER (possibly empty) to its
+            decisions
+        """
+        return split_by_queue(self.ordered())
+
+
+def split_by_queue(ordered: List[TriageDecision]) -> Dict[str, List[TriageDecision]]:
+    """Split decisions already in triage order by assigned queue.
+    
+    Returns:
+        Mapping of every queue in QUEUE_ORDER (possibly empty) to its
+        decisions, in triage order
+    """
+    buckets = {queue: [] for queue in QUEUE_ORDER}
+    for decision in ordered:
+        buckets.setdefault(decision.assigned_queue, []).append(decision)
+    return buckets
@@ -0,0 +1,132 @@
+"""Tests for the shared memory-mapped CSV scanner."""
+
+import csv
+from pathlib import Path
+
+import pytest
+
+from src.common.csvscan import CsvScanner, scan_rows
+
+
+SAMPLE_FILES = [
+    Path("src/samples/sample_transactions.csv"),
+    Path("src/samples/sample_transactions_day2.csv"),
+]
+
+
+def dict_reader_rows(path):
+    with open(path, newline='') as f:
+        reader = csv.DictReader(f)
+        return reader.fieldnames, [[row[name] for name in reader.fieldnames] for row in reader]
+
+
+class TestCsvScanner:
+    """Tests for scanning rows and chunks."""
+    
+    @pytest.mark.parametrize("path", SAMPLE_FILES)
+    def test_rows_match_dict_reader(self, path):
+        """Test rows hold the same values as csv.DictReader."""
+        if not path.exists():
+            pytest.skip("Sample data file not found")
+        
+        columns, expected = dict_reader_rows(path)
+        with CsvScanner(path) as scanner:
+            assert scanner.columns == columns
+            assert list(scanner.rows()) == expected
+    
+    def test_small_blocks_split_on_line_boundaries(self, tmp_path):
+        """Test rows are intact when decoding in blocks smaller than a line."""
+        path = tmp_path / "tx.csv"
+        path.write_text("a,b\n" + "".join(f"{i},{'x' * i}\n" for i in range(50)))
+        
+        with CsvScanner(path, block_size=7) as scanner:
+            assert list(scanner.rows()) == [[str(i), "x" * i] for i in range(50)]
+    
+    @pytest.mark.parametrize("count", [1, 2, 3, 8, 500])
+    def test_chunks_cover_every_row_once(self, tmp_path, count):
+        """Test byte-range chunks together yield each row exactly once."""
+        path = tmp_path / "tx.csv"
+        path.write_text("id,amount\n" + "".join(f"TX{i},{i}.00\n" for i in range(100)))
+        
+        with CsvScanner(path) as scanner:
+            chunks = scanner.chunks(count)
+            assert len(chunks) <= count
+            rows = [row for start, end in chunks for row in scanner.rows(start, end)]
+            assert rows == list(scanner.rows())
+        
+        assert [row for start, end in chunks for row in scan_rows(path, start, end)] == rows
+    
+    def test_crlf_blank_lines_and_short_rows(self, tmp_path):
+        """Test CRLF endings, blank lines and short rows follow csv module rules."""
+        path = tmp_path / "tx.csv"
+        path.write_bytes(b"a,b,c\r\n1,2,3\r\n\r\n4,5\r\n6,,\r\n7,8,9")
+        
+        with CsvScanner(path) as scanner:
+            assert scanner.columns == ["a", "b", "c"]
+            assert list(scanner.rows()) == [["1", "2", "3"], ["4", "5", None], ["6", "", ""], ["7", "8", "9"]]
+    
+    @pytest.mark.parametrize("content", [
+        b"a,b,c\n1,2,3\n4,5,6,7\n",
+        b'a,b,c\n1,"x, y",3\n4,5,6,7\n',
+    ])
+    def test_rows_with_extra_fields_raise(self, tmp_path, content):
+        """Test rows longer than the header raise instead of being truncated."""
+        path = tmp_path / "tx.csv"
+        path.write_bytes(content)
+        
+        with CsvScanner(path) as scanner:
+            with pytest.raises(ValueError, match="4 fields, expected 3"):
+                list(scanner.rows())
+            with pytest.raises(ValueError, match="4 fields, expected 3"):
+                scanner.read_columns()
+    
+    def test_quoted_fields_use_csv_module(self, tmp_path):
+        """Test files with quotes are parsed with the csv module, as one chunk."""
+        path = tmp_path / "tx.csv"
+        path.write_text('id,merchant\nTX1,"Shop, Inc"\nTX2,"Two\nlines"\nTX3,Plain\n')
+        
+        with CsvScanner(path) as scanner:
+            assert not scanner.simple
+            assert scanner.chunks(4) == [(scanner.data_start, scanner.size)]
+            assert list(scanner.rows()) == [["TX1", "Shop, Inc"], ["TX2", "Two\nlines"], ["TX3", "Plain"]]
+    
+    def test_quoted_fields_span_blocks(self, tmp_path):
+        """Test quoted rows are read block by block, with fields crossing block ends."""
+        path = tmp_path / "tx.csv"
+        rows = [[f"TX{i}", f"line one\r\nline, {i}", "x" * i] for i in range(40)]
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["id", "memo", "pad"])
+            writer.writerows(rows)
+        
+        with CsvScanner(path, block_size=16) as scanner:
+            assert list(scanner.rows()) == rows
+    
+    @pytest.mark.parametrize("content", [
+        b"a,b,c\n1,2,3\n4,5,6\n",
+        b"a,b,c\r\n1,2,3\r\n\r\n4,5\r\n6,,\r\n7,8,9",
+        b'a,b,c\n1,"x, y",3\n4,5,6\n',
+    ])
+    def test_read_columns_transposes_rows(self, tmp_path, content):
+        """Test columns hold the rows' values, for regular and irregular rows."""
+        path = tmp_path / "tx.csv"
+        path.write_bytes(content)
+        
+        with CsvScanner(path, block_size=8) as scanner:
+            rows = list(scanner.rows())
+            assert scanner.read_columns() == [list(column) for column in zip(*rows)]
+            start, end = scanner.chunks(2)[-1]
+            assert scanner.read_columns(start, end) == [list(c) for c in zip(*scanner.rows(start, end))]
+    
+    def test_empty_and_header_only_files(self, tmp_path):
+        """Test empty files have no columns, rows or chunks."""
+        empty = tmp_path / "empty.csv"
+        empty.write_bytes(b"")
+        header_only = tmp_path / "header.csv"
+        header_only.write_text("a,b")
+        
+        for path, columns in ((empty, []), (header_only, ["a", "b"])):
+            with CsvScanner(path) as scanner:
+                assert scanner.columns == columns
+                assert list(scanner.rows()) == []
+                assert scanner.chunks(4) == []
@@ -0,0 +1,65 @@
+"""Tests for the shared timestamp parser."""
+
+from datetime import datetime
+
+import pytest
+
+from src.common.timestamps import epoch_micros, is_valid_timestamp, parse_datetime, to_epoch_micros
+
+
+def reference_micros(text):
+    return to_epoch_micros(datetime.fromisoformat(text.replace('Z', '+00:00')))
+
+
+class TestEpochMicros:
+    """Tests for parsing timestamps to epoch microseconds."""
+    
+    @pytest.mark.parametrize("text", [
+        "2024-01-15T10:00:00Z",
+        "1970-01-01T00:00:00Z",
+        "1969-12-31T23:59:59Z",
+        "2024-02-29T23:59:59Z",
+        "2024-01-15T10:00:00+05:30",
+        "2024-01-15T10:00:00.250000Z",
+        "2024-01-15T10:00:00",
+        "2024-01-15 10:00:00Z",
+        "2024-01-15",
+    ])
+    def test_matches_fromisoformat(self, text):
+        """Test fast and slow paths agree with datetime.fromisoformat."""
+        assert epoch_micros(text) == reference_micros(text)
+        assert parse_datetime(text) == datetime.fromisoformat(text.replace('Z', '+00:00'))
+    
+    @pytest.mark.parametrize("text", [
+        "2024-02-30T10:00:00Z",
+        "2023-02-29T10:00:00Z",
+        "2024-01-15T24:00:00Z",
+        "2024-01-15T10:60:00Z",
+        "2024-01-15T10:00:60Z",
+        "2024-01-15T10:00:0xZ",
+        "2024-01-15T1 :00:00Z",
+        "2024-13-01T10:00:00Z",
+        "not-a-timestampZZZZZ",
+        "2024-01-15T10+01:00Z",
+        "2024-01-15T10:00+01Z",
+        "",
+    ])
+    def test_invalid_timestamps_raise(self, text):
+        """Test invalid values raise ValueError, like fromisoformat."""
+        with pytest.raises(ValueError):
+            epoch_micros(text)
+        assert not is_valid_timestamp(text)
+    
+    @pytest.mark.parametrize("text", ["2024-01-15T10:00:00Z", "2024-01-15T10:00:00+01:00"])
+    def test_repeated_values_are_memoized(self, text):
+        """Test repeated values are parsed once."""
+        epoch_micros.cache_clear()
+        for _ in range(3):
+            epoch_micros(text)
+        info = epoch_micros.cache_info()
+        assert (info.misses, info.hits) == (1, 2)
+    
+    def test_non_string_is_invalid(self):
+        """Test non-string values are reported invalid, not raised."""
+        assert not is_valid_timestamp(None)
+        assert not is_valid_timestamp(1705312800)
@@ -0,0 +1,118 @@
+"""Tests for the column-wise data quality engine."""
+
+import pytest
+from pathlib import Path
+from pydantic import ValidationError
+
+from src.day1.data_quality import columnar
+from src.day1.data_quality.columnar import TransactionColumns, validate_columns, validate_csv_columnar
+from src.day1.data_quality.rules import validate_transaction
+from src.day1.data_quality.validator import load_transactions, run_validation
+
+
+HEADER = "transaction_id,account_id,amount,currency,timestamp,merchant_name,category"
+
+EDGE_ROWS = [
+    "TX001,ACC123456,100.00,USD,2024-01-15T10:00:00Z,Coffee Shop,dining",
+    "TX002,,200.00,USD,2024-01-15T11:00:00Z,Restaurant,dining",
+    "TX003,ACC789012,-50.00,usd,invalid-timestamp,,Shopping",
+    "TX004,BANK01,150000.00,XXX,2024-01-15T12:00:00Z,Store,unknown",
+    "TX005,ACC1,0.00,EUR,2024-01-15T12:00:00+02:00,   ,",
+    "TX006, ACC42 ,-0,GBP,,Shop,travel",
+    "TX007,ACC1,100000.00,JPY,2024-01-15,Shop,dining",
+    "TX008,ACC1,100000.0000000000000001,CAD,2024-01-15T12:00:00Z,Shop,dining",
+    "TX009,ACC1,0.0000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000"
+    "000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000"
+    "000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000"
+    "000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000001,AUD,"
+    "2024-01-15T12:00:00Z,Shop,dining",
+    "TX010,ACC1,007.50,CHF,2024-01-15T12:00:00Z,Shop,DINING",
+    "TX011,ACC1,1e6,USD,2024-01-15T12:00:00Z,Shop,dining",
+    "TX012,ACC1, 25 ,USD,2024-01-15T12:00:00Z,Shop,dining",
+    "TX013,ACC1,-.5,USD,2024-01-15T12:00:00Z,,dining",
+    "TX014,ACC1,5.,USD,2024-01-15T12:00:00Z,Shop,dining",
+    "TX015,,,,,,",
+]
+
+
+def row_engine_issues(csv_file):
+    return [issue for transaction in load_transactions(csv_file) for issue in validate_transaction(transaction)]
+
+
+@pytest.fixture
+def edge_file(tmp_path):
+    csv_file = tmp_path / "edge.csv"
+    csv_file.write_text("\n".join([HEADER] + EDGE_ROWS) + "\n")
+    return csv_file
+
+
+class TestColumnarEngine:
+    """Test the columnar engine reports what the row engine reports."""
+    
+    def test_edge_cases_match_row_engine(self, edge_file):
+        """Test every check, boundary amounts and irregular amounts."""
+        total, issues = validate_csv_columnar(edge_file)
+        
+        assert total == len(EDGE_ROWS)
+        assert issues == row_engine_issues(edge_file)
+        assert {issue.rule for issue in issues} == {"completeness", "format", "range"}
+    
+    def test_without_numpy(self, edge_file, monkeypatch):
+        """Test the plain-Python fallback gives the same issues."""
+        monkeypatch.setattr(columnar, "np", None)
+        
+        assert validate_csv_columnar(edge_file)[1] == row_engine_issues(edge_file)
+    
+    def test_sample_file_matches_row_engine(self):
+        """Test the sample data gives identical issues."""
+        sample = Path("src/samples/sample_transactions.csv")
+        if not sample.exists():
+            pytest.skip("Sample data file not found")
+        
+        assert validate_csv_columnar(sample)[1] == row_engine_issues(sample)
+    
+    def test_missing_columns_are_missing_values(self, tmp_path):
+        """Test columns absent from the file are reported like empty values."""
+        csv_file = tmp_path / "narrow.csv"
+        csv_file.write_text("transaction_id,amount\nTX001,10.00\nTX002,-1\n")
+        
+        assert validate_csv_columnar(csv_file)[1] == row_engine_issues(csv_file)
+    
+    def test_unparseable_rows_raise_like_row_engine(self, tmp_path):
+        """Test a missing transaction ID or a non-numeric amount raises."""
+        for row in ("TX001,ACC1,abc,USD,2024-01-15T10:00:00Z,Shop,dining",
+                    ",ACC1,10.00,USD,2024-01-15T10:00:00Z,Shop,dining",
+                    "TX001,ACC1,1.2.3,USD,2024-01-15T10:00:00Z,Shop,dining"):
+            csv_file = tmp_path / "bad.csv"
+            csv_file.write_text(f"{HEADER}\n{row}\n")
+            
+            with pytest.raises(ValidationError):
+                load_transactions(csv_file)
+            with pytest.raises(ValidationError):
+                validate_columns(TransactionColumns.from_csv(csv_file))
+    
+    def test_empty_file(self, tmp_path):
+        """Test a header-only file has no rows or issues."""
+        csv_file = tmp_path / "empty.csv"
+        csv_file.write_text(HEADER + "\n")
+        
+        assert validate_csv_columnar(csv_file) == (0, [])
+
+
+class TestRunValidationEngine:
+    """Test selecting the engine in run_validation."""
+    
+    def test_reports_identical(self, edge_file, tmp_path):
+        """Test both engines write the same report, with and without workers."""
+        rows = run_validation(edge_file, tmp_path / "rows.json")
+        columns = run_validation(edge_file, tmp_path / "columns.json", engine="columnar")
+        parallel = run_validation(edge_file, tmp_path / "parallel.json", workers=2, engine="columnar")
+        
+        expected = rows.model_dump(exclude={"timestamp"})
+        assert columns.model_dump(exclude={"timestamp"}) == expected
+        assert parallel.model_dump(exclude={"timestamp"}) == expected
+    
+    def test_unknown_engine(self, edge_file, tmp_path):
+        """Test an unknown engine is rejected."""
+        with pytest.raises(ValueError, match="Unknown validation engine"):
+            run_validation(edge_file, tmp_path / "report.json", engine="gpu")
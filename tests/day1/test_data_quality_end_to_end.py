@@ -9,7 +9,8 @@ from src.day1.data_quality.validator import (
     load_transactions,
     generate_report,
     write_report,
-    run_validation
+    run_validation,
+    run_streaming_validation
 )
 from src.day1.data_quality.schemas import Transaction, ValidationIssue, Severity
 
@@ -186,3 +187,77 @@ TX002,,200.00,ZZZ,invalid-timestamp
             [(i.transaction_id, i.field, i.rule) for i in report2.issues]
         )
         assert issues1 == issues2
+
+
+class TestStreamingValidation:
+    """Test constant-memory streaming validation."""
+    
+    CSV_CONTENT = """transaction_id,account_id,amount,currency,timestamp,merchant_name,category
+TX001,ACC123456,100.00,USD,2024-01-15T10:00:00Z,Coffee Shop,dining
+TX002,,200.00,USD,2024-01-15T11:00:00Z,Restaurant,dining
+TX003,ACC789012,-50.00,USD,invalid-timestamp,,shopping
+TX004,ACC789012,150000.00,USD,2024-01-15T12:00:00Z,Store,unknown
+"""
+    
+    def test_counters_and_issues_match_batch(self, tmp_path):
+        """Test streaming gives the batch counters and issues, in order."""
+        csv_file = tmp_path / "input.csv"
+        csv_file.write_text(self.CSV_CONTENT)
+        
+        batch = run_validation(csv_file, tmp_path / "batch.json")
+        streamed = run_streaming_validation(csv_file, tmp_path / "stream.json")
+        
+        for field in ("total_transactions", "valid_transactions", "invalid_transactions",
+                      "issues_by_severity", "issues_by_rule"):
+            assert getattr(streamed, field) == getattr(batch, field)
+        
+        lines = (tmp_path / "stream.issues.ndjson").read_text().splitlines()
+        assert [ValidationIssue.model_validate_json(line) for line in lines] == batch.issues
+    
+    def test_report_points_to_sidecar(self, tmp_path):
+        """Test the written report has no embedded issues and names the sidecar."""
+        csv_file = tmp_path / "input.csv"
+        csv_file.write_text(self.CSV_CONTENT)
+        issues_path = tmp_path / "issues" / "dq.ndjson"
+        
+        run_streaming_validation(csv_file, tmp_path / "report.json", issues_path)
+        
+        data = json.loads((tmp_path / "report.json").read_text())
+        assert data["issues"] == []
+        assert data["issues_file"] == str(issues_path)
+        assert issues_path.exists()
+
+
+class TestParallelValidation:
+    """Test chunked validation across worker processes."""
+    
+    def write_input(self, tmp_path):
+        rows = TestStreamingValidation.CSV_CONTENT.splitlines()
+        header, body = rows[0], rows[1:]
+        csv_file = tmp_path / "input.csv"
+        csv_file.write_text("\n".join([header] + [
+            row.replace("TX", f"TX{copy:03d}-", 1) for copy in range(25) for row in body
+        ]) + "\n")
+        return csv_file
+    
+    def test_report_identical_to_sequential(self, tmp_path):
+        """Test the merged report equals the single-process report."""
+        csv_file = self.write_input(tmp_path)
+        
+        sequential = run_validation(csv_file, tmp_path / "one.json")
+        parallel = run_validation(csv_file, tmp_path / "many.json", workers=3)
+        
+        assert parallel.model_dump(exclude={"timestamp"}) == sequential.model_dump(exclude={"timestamp"})
+        assert parallel.total_transactions == 100
+    
+    def test_streaming_sidecar_identical_to_sequential(self, tmp_path):
+        """Test part files are concatenated in file order."""
+        csv_file = self.write_input(tmp_path)
+        
+        sequential = run_streaming_validation(csv_file, tmp_path / "one.json")
+        parallel = run_streaming_validation(csv_file, tmp_path / "many.json", workers=3)
+        
+        assert parallel.issues_by_rule == sequential.issues_by_rule
+        assert parallel.invalid_transactions == sequential.invalid_transactions
+        assert (tmp_path / "many.issues.ndjson").read_text() == (tmp_path / "one.issues.ndjson").read_text()
+        assert sorted(p.name for p in tmp_path.iterdir() if p.is_dir()) == []
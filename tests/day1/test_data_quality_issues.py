@@ -0,0 +1,111 @@
+"""Tests for compact validation issue storage."""
+
+import json
+import pytest
+from decimal import Decimal
+
+from src.day1.data_quality.issues import IssueStore
+from src.day1.data_quality.rules import CHECKS, validate_transaction
+from src.day1.data_quality.schemas import Transaction, ValidationReport
+from src.day1.data_quality.validator import _build_report, _store_report
+
+
+TRANSACTIONS = [
+    Transaction(transaction_id="TX001", account_id="ACC123456", amount=Decimal("100.00"), currency="USD",
+                timestamp="2024-01-15T10:00:00Z", merchant_name="Coffee Shop", category="dining"),
+    Transaction(transaction_id="TX002", amount=Decimal("-5.00"), currency="XXX", timestamp="yesterday",
+                category="Unknown"),
+    Transaction(transaction_id="TX003", account_id="BANK1", amount=Decimal("250000"), currency="EUR",
+                timestamp="2024-01-15T10:00:00Z", merchant_name="   ", category="travel"),
+    Transaction(transaction_id="TX004", account_id="  ", amount=Decimal("0.00"), currency="GBP",
+                timestamp="2024-01-15T10:00:00Z", merchant_name="Shop"),
+]
+
+
+@pytest.fixture
+def store():
+    store = IssueStore()
+    for row, transaction in enumerate(TRANSACTIONS):
+        store.add_transaction(row, transaction)
+    return store
+
+
+def expected_issues():
+    return [issue for transaction in TRANSACTIONS for issue in validate_transaction(transaction)]
+
+
+class TestIssueStore:
+    """Test issues are recorded compactly and materialized on demand."""
+    
+    def test_materialized_issues_match_rules(self, store):
+        """Test iterating, indexing and slicing give the rules' issues."""
+        expected = expected_issues()
+        
+        assert len(store) == len(expected) > 0
+        assert list(store) == expected
+        assert store == expected
+        assert store[3] == expected[3]
+        assert store[-1] == expected[-1]
+        assert store[1:4] == expected[1:4]
+    
+    def test_records_match_model_dump(self, store):
+        """Test records equal model_dump of each issue, in both modes."""
+        expected = expected_issues()
+        
+        assert store.records() == [issue.model_dump() for issue in expected]
+        assert store.records(json=True) == [issue.model_dump(mode='json') for issue in expected]
+    
+    def test_compact_fields(self, store):
+        """Test issues are arrays, with one ID per row and one entry per distinct value."""
+        assert store.rows.typecode == 'q' and store.checks.typecode == 'B'
+        assert list(store.rows)[:2] == [1, 1]
+        assert all(0 <= number < len(CHECKS) for number in store.checks)
+        assert store.transaction_ids == ["TX002", "TX003", "TX004"]
+        assert len(store.values) == len(set(store.value_slots)) < len(store)
+    
+    def test_equal_values_keep_their_text(self):
+        """Test values that compare equal but render differently are not merged."""
+        store = IssueStore()
+        for row, amount in enumerate(["-1E+4", "-10000", "-1E+4"]):
+            store.add_transaction(row, Transaction(transaction_id=f"TX{row}", amount=Decimal(amount)))
+        
+        assert [issue.value for issue in store if issue.field == "amount"] == ["-1E+4", "-10000", "-1E+4"]
+        with pytest.raises(IndexError):
+            store[len(store)]
+    
+    def test_extend_offsets_rows(self, store):
+        """Test appending a chunk's store shifts its row numbers."""
+        merged = IssueStore()
+        merged.extend(store)
+        merged.extend(store, row_offset=10)
+        
+        assert list(merged.rows) == list(store.rows) + [row + 10 for row in store.rows]
+        assert merged == expected_issues() * 2
+        assert merged[len(store)] == store[0]
+        assert merged.values == store.values
+
+
+class TestStoreReport:
+    """Test reports over a store match reports over issue lists."""
+    
+    def test_report_matches_list_report(self, store):
+        """Test counters and serialized JSON equal the list-based report."""
+        from_list = _build_report(len(TRANSACTIONS), expected_issues())
+        from_store = _store_report(len(TRANSACTIONS), store)
+        from_store.timestamp = from_list.timestamp
+        
+        assert isinstance(from_store.issues, IssueStore)
+        assert from_store.model_dump() == from_list.model_dump()
+        assert from_store.model_dump_json() == from_list.model_dump_json()
+        assert json.dumps(from_store.model_dump(mode='json'), default=str) == \
+            json.dumps(from_list.model_dump(mode='json'), default=str)
+    
+    def test_validated_report_keeps_lists(self):
+        """Test reports built from lists still validate and hold lists."""
+        report = ValidationReport(
+            total_transactions=1, valid_transactions=1, invalid_transactions=0,
+            issues=[], issues_by_severity={}, issues_by_rule={}
+        )
+        
+        assert report.issues == []
+        assert report.model_dump(mode='json')["issues"] == []
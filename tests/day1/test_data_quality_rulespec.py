@@ -0,0 +1,216 @@
+"""Tests for declarative data-quality rule specs."""
+
+import json
+import pickle
+import pytest
+from decimal import Decimal
+
+from src.day1.data_quality import rulespec
+from src.day1.data_quality.columnar import validate_csv_columnar
+from src.day1.data_quality.rules import CHECKS, DEFAULT_RULES
+from src.day1.data_quality.rulespec import Check, RuleSet
+from src.day1.data_quality.schemas import Severity, Transaction
+from src.day1.data_quality.validator import load_transactions, run_streaming_validation, run_validation
+
+
+HEADER = "transaction_id,account_id,amount,currency,timestamp,merchant_name,category"
+
+ROWS = [
+    "TX001,ACC123456,100.00,EUR,2024-01-15T10:00:00Z,Coffee Shop,dining",
+    "TX002,ACC12,5000,chf,2024-01-15T11:00:00Z,,dining",
+    "TX003,ACC789012,4999.999999999999999999,USD,2024-01-15T12:00:00Z,Shop,",
+    "TX004,ACC789012,0.1,CHF,2024-01-15T12:00:00Z,Shop,",
+    "TX005,ACC789012,0.1000000000000000000001,CHF,2024-01-15T12:00:00Z,Shop,",
+    "TX006,,1e4,EUR,2024-01-15T12:00:00Z,Shop,",
+    "TX007, ACC000001 ,,GBP,,Shop,",
+]
+
+TENANT_SPEC = {
+    "name": "tenant-eu",
+    "checks": [
+        {"name": "missing_amount", "field": "amount", "kind": "required",
+         "rule": "completeness", "severity": "HIGH", "message": "Amount is required"},
+        {"name": "eu_currency", "field": "currency", "kind": "one_of", "values": ["EUR", "CHF"],
+         "ignore_case": True, "rule": "format", "severity": "MEDIUM", "message": "Currency must be one of {values}"},
+        {"name": "large_amount", "field": "amount", "kind": "compare", "op": ">=", "bound": "5000",
+         "rule": "range", "severity": "HIGH", "message": "Amount needs approval"},
+        {"name": "tiny_amount", "field": "amount", "kind": "compare", "op": "<=", "bound": "0.1",
+         "rule": "range", "severity": "LOW", "message": "Amount is tiny"},
+        {"name": "account_format", "field": "account_id", "kind": "pattern", "pattern": r"ACC\d{6}",
+         "rule": "format", "severity": "MEDIUM", "message": "Account ID must be ACC and six digits"},
+        {"name": "missing_merchant", "field": "merchant_name", "kind": "required", "null_text": "",
+         "rule": "completeness", "severity": "LOW", "message": "Merchant is required"},
+    ],
+}
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    csv_file = tmp_path / "tenant.csv"
+    csv_file.write_text("\n".join([HEADER] + ROWS) + "\n")
+    return csv_file
+
+
+@pytest.fixture
+def tenant_rules():
+    return RuleSet.from_dict(TENANT_SPEC)
+
+
+def row_engine_issues(csv_file, rules):
+    return [issue for transaction in load_transactions(csv_file) for issue in rules.validate(transaction)]
+
+
+class TestDefaultSpec:
+    """Test the built-in rules are declared by the default spec."""
+    
+    def test_checks_in_report_order(self):
+        """Test the check table follows the spec."""
+        assert list(CHECKS)[:4] == ["missing_account_id", "missing_amount", "missing_currency", "missing_timestamp"]
+        assert CHECKS["invalid_currency"].message == \
+            "Invalid currency code. Valid codes: AUD, CAD, CHF, EUR, GBP, JPY, USD"
+        assert CHECKS["amount_over_threshold"].bound == Decimal("100000")
+    
+    def test_compiled_validator_reads_each_field_once(self):
+        """Test the generated function reads fields and parses amounts once."""
+        source = DEFAULT_RULES.source
+        
+        assert source.count("transaction.amount") == 1
+        assert source.count("parse_decimal(") == 1
+        assert "getattr" not in source
+    
+    @pytest.mark.parametrize("account_id, fails", [
+        ("ACC123", False),
+        (" ACC123 ", False),
+        ("ACC\u00b2", False),
+        ("ACC", True),
+        ("ACC1x", True),
+        ("ACC\u00bd", True),
+        ("acc123", True),
+    ])
+    def test_account_id_digits(self, account_id, fails):
+        """Test account IDs are checked with startswith and str.isdigit in both engines."""
+        check = CHECKS["invalid_account_id"]
+        number = DEFAULT_RULES.ids["invalid_account_id"]
+        
+        assert check.fails(account_id) == fails
+        assert (number in DEFAULT_RULES.evaluate(Transaction(transaction_id="TX1", account_id=account_id))) == fails
+    
+    def test_pickled_rules_recompile(self):
+        """Test rule sets survive pickling, e.g. to worker processes."""
+        rules = pickle.loads(pickle.dumps(DEFAULT_RULES))
+        transaction = Transaction(transaction_id="TX1", amount=Decimal("-1"), currency="XXX")
+        
+        assert rules.source == DEFAULT_RULES.source
+        assert rules.validate(transaction) == DEFAULT_RULES.validate(transaction)
+
+
+class TestTenantSpec:
+    """Test custom rule sets in both engines."""
+    
+    def test_row_engine(self, csv_file, tenant_rules):
+        """Test each kind of check and the spec order of issues."""
+        issues = row_engine_issues(csv_file, tenant_rules)
+        by_row = {}
+        for issue in issues:
+            by_row.setdefault(issue.transaction_id, []).append(issue.rule + ":" + issue.value)
+        
+        assert "TX001" not in by_row
+        assert by_row["TX002"] == ["range:5000", "format:ACC12", "completeness:"]
+        assert by_row["TX003"] == ["format:USD"]
+        assert by_row["TX004"] == ["range:0.1"]
+        assert "TX005" not in by_row
+        assert by_row["TX006"] == ["range:1E+4"]
+        assert by_row["TX007"] == ["completeness:null", "format:GBP"]
+        currency = next(issue for issue in issues if issue.transaction_id == "TX003")
+        assert currency.message == "Currency must be one of EUR, CHF"
+        assert currency.severity == Severity.MEDIUM
+    
+    def test_columnar_matches_row_engine(self, csv_file, tenant_rules, monkeypatch):
+        """Test the columnar engine reports the same issues, with and without NumPy."""
+        expected = row_engine_issues(csv_file, tenant_rules)
+        
+        assert validate_csv_columnar(csv_file, rules=tenant_rules)[1] == expected
+        monkeypatch.setattr("src.day1.data_quality.columnar.np", None)
+        assert validate_csv_columnar(csv_file, rules=tenant_rules)[1] == expected
+    
+    def test_run_validation_with_rules(self, csv_file, tenant_rules, tmp_path):
+        """Test reports are identical across engines, workers and streaming."""
+        rows = run_validation(csv_file, tmp_path / "rows.json", rules=tenant_rules)
+        parallel = run_validation(csv_file, tmp_path / "parallel.json", workers=2, engine="columnar",
+                                  rules=tenant_rules)
+        streamed = run_streaming_validation(csv_file, tmp_path / "stream.json", rules=tenant_rules)
+        
+        expected = rows.model_dump(exclude={"timestamp"})
+        assert parallel.model_dump(exclude={"timestamp"}) == expected
+        assert streamed.issues_by_rule == rows.issues_by_rule
+        assert streamed.invalid_transactions == rows.invalid_transactions == 5
+        lines = (tmp_path / "stream.issues.ndjson").read_text().splitlines()
+        assert [json.loads(line) for line in lines] == rows.model_dump(mode='json')["issues"]
+
+
+class TestLoading:
+    """Test reading specs from files and rejecting invalid specs."""
+    
+    def test_json_and_yaml_files(self, tmp_path, tenant_rules):
+        """Test JSON and YAML specs load to the same rule set."""
+        yaml = pytest.importorskip("yaml")
+        json_file = tmp_path / "tenant.json"
+        json_file.write_text(json.dumps(TENANT_SPEC))
+        yaml_file = tmp_path / "tenant.yaml"
+        yaml_file.write_text(yaml.safe_dump(TENANT_SPEC))
+        
+        for path in (json_file, yaml_file):
+            rules = RuleSet.from_file(path)
+            assert rules.name == "tenant-eu"
+            assert rules.source == tenant_rules.source
+    
+    def test_yaml_requires_pyyaml(self, tmp_path, monkeypatch):
+        """Test a clear error when PyYAML is not installed."""
+        monkeypatch.setattr(rulespec, "yaml", None)
+        spec = tmp_path / "tenant.yml"
+        spec.write_text("name: tenant\nchecks: []\n")
+        
+        with pytest.raises(ImportError, match="pip install pyyaml"):
+            RuleSet.from_file(spec)
+    
+    @pytest.mark.parametrize("entry, error", [
+        ({"kind": "between"}, "unknown kind"),
+        ({"field": "iban"}, "unknown field"),
+        ({"kind": "compare", "op": ">"}, "needs an op"),
+        ({"kind": "compare", "op": "~", "bound": 1}, "needs an op"),
+        ({"kind": "compare", "op": ">", "bound": "lots"}, "bound must be a finite number"),
+        ({"kind": "compare", "field": "currency", "op": ">", "bound": 1}, "apply to amount"),
+        ({"kind": "one_of", "field": "currency", "values": "EUR"}, "list of values"),
+        ({"kind": "pattern", "field": "currency", "pattern": "[A-Z"}, "unterminated"),
+        ({"kind": "digits", "prefix": "ACC"}, "apply to text fields"),
+        ({"kind": "digits", "field": "account_id", "prefix": 7}, "prefix must be text"),
+        ({"severity": "URGENT"}, "URGENT"),
+        ({"colour": "red"}, "unknown keys: colour"),
+    ])
+    def test_invalid_checks(self, entry, error):
+        """Test invalid check entries raise ValueError naming the problem."""
+        base = {"name": "custom", "field": "amount", "kind": "required",
+                "rule": "format", "severity": "LOW", "message": "Bad"}
+        
+        with pytest.raises(ValueError, match=error):
+            RuleSet.from_dict({"checks": [{**base, **entry}]})
+    
+    def test_invalid_rule_sets(self):
+        """Test malformed specs and repeated check names are rejected."""
+        check = Check("dup", "amount", "completeness", Severity.HIGH, "Amount is required")
+        
+        with pytest.raises(ValueError, match="list of checks"):
+            RuleSet.from_dict({"name": "empty"})
+        with pytest.raises(ValueError, match="missing field, rule"):
+            RuleSet.from_dict({"checks": [{"name": "x", "severity": "LOW", "message": "m"}]})
+        with pytest.raises(ValueError, match="repeated"):
+            RuleSet("tenant", [check, check])
+    
+    def test_check_names_are_not_code(self):
+        """Test spec text never becomes part of the generated source."""
+        name = "evil\n    import os"
+        rules = RuleSet("tenant", [Check(name, "currency", "format", Severity.LOW, "m", kind="one_of",
+                                         values=["x' or True or '"])])
+        
+        assert "import os" not in rules.source.replace(repr(name), "")
+        assert rules.validate(Transaction(transaction_id="TX1", currency="EUR"))[0].field == "currency"
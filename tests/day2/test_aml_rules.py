@@ -6,6 +6,8 @@ from decimal import Decimal
 
 from src.day2.aml_triage.schemas import Transaction, ReasonCode
 from src.day2.aml_triage import rules
+from src.day2.aml_triage.index import AccountIndex
+from src.day2.aml_triage.records import TxRecord
 
 
 def create_transaction(tx_id, account_id, timestamp, amount, tx_type="DEBIT", beneficiary="BEN001"):
@@ -154,6 +156,71 @@ class TestRapidReversal:
         assert result is None
 
 
+class TestRapidReversalIndexed:
+    """Tests for index-backed rapid reversal rule."""
+    
+    def test_triggers_for_matching_credit_in_window(self):
+        """Test RAPID_REVERSAL triggers when the pair has a matching credit."""
+        base_time = datetime(2024, 1, 15, 10, 0, 0)
+        transactions = [
+            create_transaction("TX1", "ACC001", base_time, 3000, "DEBIT", "BEN123"),
+            create_transaction("TX2", "ACC002", base_time + timedelta(seconds=60), 3000, "CREDIT", "BEN123"),
+            create_transaction("TX3", "ACC001", base_time + timedelta(seconds=120), 2990, "CREDIT", "BEN123"),
+        ]
+        records = [TxRecord.from_transaction(t) for t in transactions]
+        index = AccountIndex(records)
+        
+        result = rules.check_rapid_reversal_indexed(index, records[0], window_seconds=300)
+        assert result == ReasonCode.RAPID_REVERSAL
+    
+    def test_ignores_other_beneficiary_and_amount_mismatch(self):
+        """Test credits from another beneficiary or amount off by 1%+ are ignored."""
+        base_time = datetime(2024, 1, 15, 10, 0, 0)
+        transactions = [
+            create_transaction("TX1", "ACC001", base_time, 3000, "DEBIT", "BEN123"),
+            create_transaction("TX2", "ACC001", base_time + timedelta(seconds=60), 3000, "CREDIT", "BEN999"),
+            create_transaction("TX3", "ACC001", base_time + timedelta(seconds=120), 2970, "CREDIT", "BEN123"),
+        ]
+        records = [TxRecord.from_transaction(t) for t in transactions]
+        index = AccountIndex(records)
+        
+        result = rules.check_rapid_reversal_indexed(index, records[0], window_seconds=300)
+        assert result is None
+    
+    def test_window_excludes_same_timestamp_and_includes_boundary(self):
+        """Test window is (debit, debit + window_seconds]."""
+        base_time = datetime(2024, 1, 15, 10, 0, 0)
+        same_time = [
+            create_transaction("TX1", "ACC001", base_time, 3000, "DEBIT", "BEN123"),
+            create_transaction("TX2", "ACC001", base_time, 3000, "CREDIT", "BEN123"),
+        ]
+        boundary = [
+            create_transaction("TX1", "ACC001", base_time, 3000, "DEBIT", "BEN123"),
+            create_transaction("TX2", "ACC001", base_time + timedelta(seconds=300), 3000, "CREDIT", "BEN123"),
+        ]
+        
+        same_time = [TxRecord.from_transaction(t) for t in same_time]
+        boundary = [TxRecord.from_transaction(t) for t in boundary]
+        
+        assert rules.check_rapid_reversal_indexed(AccountIndex(same_time), same_time[0]) is None
+        assert rules.check_rapid_reversal_indexed(AccountIndex(boundary), boundary[0]) == ReasonCode.RAPID_REVERSAL
+    
+    def test_agrees_with_list_based_rule(self):
+        """Test indexed and list-based rules agree for every transaction."""
+        base_time = datetime(2024, 1, 15, 10, 0, 0)
+        transactions = [
+            create_transaction("TX1", "ACC001", base_time, 3000, "DEBIT", "BEN123"),
+            create_transaction("TX2", "ACC001", base_time + timedelta(seconds=100), 500, "DEBIT", "BEN777"),
+            create_transaction("TX3", "ACC001", base_time + timedelta(seconds=200), 3000, "CREDIT", "BEN123"),
+            create_transaction("TX4", "ACC001", base_time + timedelta(seconds=700), 500, "CREDIT", "BEN777"),
+        ]
+        records = [TxRecord.from_transaction(t) for t in transactions]
+        index = AccountIndex(records)
+        
+        for tx, record in zip(transactions, records):
+            assert rules.check_rapid_reversal_indexed(index, record) == rules.check_rapid_reversal(transactions, tx)
+
+
 class TestGetExplanation:
     """Tests for explanation generation."""
     
@@ -183,3 +250,25 @@ class TestGetExplanation:
         )
         assert "15000" in explanation
         assert "10000" in explanation
+    
+    def test_get_explanation_defaults(self):
+        """Test missing context fields fall back to the template defaults."""
+        assert rules.get_explanation(ReasonCode.HIGH_VELOCITY, {}) == \
+            "High velocity: Multiple transactions detected within 60 seconds"
+        assert rules.get_explanation(ReasonCode.NEW_BENEFICIARY, {}) == \
+            "New beneficiary: First transaction to beneficiary unknown"
+    
+    def test_identical_contexts_share_one_string(self):
+        """Test repeated contexts reuse the cached rendering."""
+        first = rules.get_explanation(ReasonCode.RAPID_REVERSAL, {"window": 300})
+        second = rules.get_explanation(ReasonCode.RAPID_REVERSAL, {"window": 300})
+        assert first is second
+    
+    def test_equal_values_of_different_types_render_separately(self):
+        """Test 10000 and Decimal("10000.00") are not confused by the cache."""
+        as_int = rules.get_explanation(ReasonCode.HIGH_AMOUNT, {"amount": "15000", "threshold": 10000})
+        as_decimal = rules.get_explanation(
+            ReasonCode.HIGH_AMOUNT, {"amount": "15000", "threshold": Decimal("10000.00")}
+        )
+        assert as_int.endswith("threshold of 10000")
+        assert as_decimal.endswith("threshold of 10000.00")
@@ -0,0 +1,133 @@
+"""Tests for the persistent beneficiary index and NEW_BENEFICIARY rule."""
+
+import pytest
+from pathlib import Path
+from datetime import datetime, timedelta
+from decimal import Decimal
+import json
+
+from src.day2.aml_triage import pipeline, rules
+from src.day2.aml_triage.beneficiaries import BeneficiaryIndex
+from src.day2.aml_triage.records import TxRecord
+from src.day2.aml_triage.schemas import Transaction, ReasonCode
+
+
+def create_record(tx_id, account_id, beneficiary, tx_type="DEBIT", seconds=0):
+    """Helper to create test transaction records."""
+    return TxRecord.from_transaction(Transaction(
+        transaction_id=tx_id,
+        account_id=account_id,
+        timestamp=datetime(2024, 1, 15, 10, 0, 0) + timedelta(seconds=seconds),
+        amount=Decimal("123.45"),
+        transaction_type=tx_type,
+        beneficiary_id=beneficiary
+    ))
+
+
+class TestBeneficiaryIndex:
+    """Tests for the on-disk pair index."""
+    
+    def test_check_and_add(self, tmp_path):
+        """Test only the first occurrence of a pair is new."""
+        with BeneficiaryIndex(tmp_path / "idx") as index:
+            assert index.check_and_add("ACC001", "BEN1") is True
+            assert index.check_and_add("ACC001", "BEN1") is False
+            assert index.check_and_add("ACC002", "BEN1") is True
+            assert ("ACC001", "BEN1") in index
+    
+    def test_survives_reopen(self, tmp_path):
+        """Test pairs persist between runs."""
+        with BeneficiaryIndex(tmp_path / "idx") as index:
+            index.add("ACC001", "BEN1")
+        
+        with BeneficiaryIndex(tmp_path / "idx") as index:
+            assert index.check_and_add("ACC001", "BEN1") is False
+            assert len(index) == 1
+    
+    def test_committed_pairs_survive_a_crash(self, tmp_path):
+        """Test pairs committed before an interrupted run are known on the next open."""
+        with BeneficiaryIndex(tmp_path / "idx") as index:
+            index.add("ACC001", "BEN1")
+        
+        index = BeneficiaryIndex(tmp_path / "idx")
+        index.add("ACC001", "BEN2")
+        # Simulate a crash after a commit batch: the connection is never closed
+        index._store.commit()
+        index._store.close()
+        
+        with BeneficiaryIndex(tmp_path / "idx") as reopened:
+            assert ("ACC001", "BEN2") in reopened
+    
+    def test_uncommitted_pairs_are_lost_consistently(self, tmp_path):
+        """Test pairs not yet committed at a crash are new again, not half-known."""
+        with BeneficiaryIndex(tmp_path / "idx") as index:
+            index.add("ACC001", "BEN1")
+        
+        index = BeneficiaryIndex(tmp_path / "idx")
+        index.add("ACC001", "BEN2")
+        index._store.close()
+        
+        with BeneficiaryIndex(tmp_path / "idx") as reopened:
+            assert ("ACC001", "BEN1") in reopened
+            assert reopened.check_and_add("ACC001", "BEN2") is True
+    
+    def test_commits_in_batches(self, tmp_path, monkeypatch):
+        """Test new pairs are committed every commit batch, not per pair."""
+        monkeypatch.setattr("src.day2.aml_triage.beneficiaries._COMMIT_EVERY", 3)
+        index = BeneficiaryIndex(tmp_path / "idx")
+        for i in range(4):
+            index.add("ACC001", f"BEN{i}")
+        index._store.close()
+        
+        with BeneficiaryIndex(tmp_path / "idx") as reopened:
+            assert len(reopened) == 3
+            assert ("ACC001", "BEN3") not in reopened
+
+
+class TestNewBeneficiaryRule:
+    """Tests for NEW_BENEFICIARY detection."""
+    
+    def test_first_debit_to_beneficiary_triggers(self, tmp_path):
+        """Test the rule fires once per pair and ignores credits."""
+        with BeneficiaryIndex(tmp_path / "idx") as index:
+            credit = create_record("TX0", "ACC001", "BEN9", "CREDIT")
+            first = create_record("TX1", "ACC001", "BEN1")
+            repeat = create_record("TX2", "ACC001", "BEN1", seconds=3600)
+            
+            assert rules.check_new_beneficiary(credit, index) is None
+            assert rules.check_new_beneficiary(first, index) == ReasonCode.NEW_BENEFICIARY
+            assert rules.check_new_beneficiary(repeat, index) is None
+    
+    def test_alert_explanation(self, tmp_path):
+        """Test the alert carries the reason code and beneficiary."""
+        records = [create_record("TX1", "ACC001", "BEN1")]
+        
+        with BeneficiaryIndex(tmp_path / "idx") as index:
+            alerts = pipeline.generate_alerts_from_records(records, index)
+        
+        assert alerts[0].reason_codes == [ReasonCode.NEW_BENEFICIARY]
+        assert "BEN1" in alerts[0].explanation
+    
+    def test_second_run_sees_history(self, tmp_path):
+        """Test pairs paid in an earlier run are no longer new."""
+        sample_file = Path("src/samples/sample_transactions_day2.csv")
+        
+        if not sample_file.exists():
+            pytest.skip("Sample data file not found")
+        
+        def count_new(output_dir):
+            with open(output_dir / "aml_alerts.json") as f:
+                return sum("NEW_BENEFICIARY" in a["reason_codes"] for a in json.load(f))
+        
+        index_dir = tmp_path / "beneficiaries"
+        pipeline.run_pipeline(sample_file, tmp_path / "first", beneficiary_index=index_dir)
+        pipeline.run_pipeline(sample_file, tmp_path / "second", beneficiary_index=index_dir)
+        
+        assert count_new(tmp_path / "first") > 0
+        assert count_new(tmp_path / "second") == 0
+    
+    def test_disabled_without_index(self):
+        """Test the rule does not fire when no index is configured."""
+        alerts = pipeline.generate_alerts_from_records([create_record("TX1", "ACC001", "BEN1")])
+        
+        assert alerts == []
@@ -0,0 +1,106 @@
+"""Tests for columnar evaluation of stateless AML rules."""
+
+import pytest
+from datetime import datetime
+from decimal import Decimal
+
+from src.day2.aml_triage import columnar, rules
+from src.day2.aml_triage.records import TxRecord
+from src.day2.aml_triage.schemas import Transaction, ReasonCode
+
+
+AMOUNTS = [
+    "5000.00", "10000", "9999.99", "10000.00", "100", "0", "0.00", "-300.00",
+    "4999.999", "10000.001", "12.345", "1E+4", "0.01", "99999999999999999999.00",
+    "15000.5", "-0.00",
+]
+
+ROW = {
+    "transaction_id": "TX1", "account_id": "ACC001", "timestamp": "2024-01-15T10:00:00Z",
+    "amount": "0", "transaction_type": "DEBIT", "beneficiary_id": "BEN001", "currency": "USD",
+}
+
+
+def decimal_results(amount, threshold=Decimal("10000")):
+    """Evaluate the per-transaction Decimal rules for one amount."""
+    tx = Transaction(
+        transaction_id="TX1",
+        account_id="ACC001",
+        timestamp=datetime(2024, 1, 15, 10, 0, 0),
+        amount=amount,
+        transaction_type="DEBIT",
+        beneficiary_id="BEN001"
+    )
+    return (
+        rules.check_round_amount(tx) == ReasonCode.ROUND_AMOUNT,
+        rules.check_high_amount(tx, threshold) == ReasonCode.HIGH_AMOUNT,
+    )
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    """Run each test with NumPy (if installed) and with the pure-Python path."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(columnar, "np", None)
+    return request.param
+
+
+class TestToCents:
+    """Tests for fixed-point conversion."""
+    
+    def test_exact_amounts(self):
+        """Test amounts with up to two decimals convert exactly."""
+        assert columnar.to_cents(Decimal("5000.00")) == (500000, True)
+        assert columnar.to_cents(Decimal("0.5")) == (50, True)
+        assert columnar.to_cents(Decimal("1E+4")) == (1000000, True)
+    
+    def test_inexact_amounts(self):
+        """Test sub-cent, non-finite and oversized amounts are flagged."""
+        assert columnar.to_cents(Decimal("0.005"))[1] is False
+        assert columnar.to_cents(Decimal("NaN"))[1] is False
+        assert columnar.to_cents(Decimal("1E+30"))[1] is False
+    
+    def test_threshold_rounds_up(self):
+        """Test fractional-cent thresholds round up for >= comparison."""
+        assert columnar.threshold_to_cents(Decimal("10000")) == 1000000
+        assert columnar.threshold_to_cents(Decimal("10000.005")) == 1000001
+
+
+class TestEvaluateStateless:
+    """Tests for batch rule masks."""
+    
+    def test_matches_decimal_rules(self, backend):
+        """Test masks are identical to the Decimal rules for edge amounts."""
+        amounts = [Decimal(a) for a in AMOUNTS]
+        
+        round_mask, high_mask = columnar.evaluate_stateless(amounts)
+        
+        assert list(zip(round_mask, high_mask)) == [decimal_results(a) for a in amounts]
+    
+    def test_custom_threshold(self, backend):
+        """Test threshold_mask with a non-integer threshold."""
+        amounts = [Decimal(a) for a in AMOUNTS]
+        threshold = Decimal("4999.995")
+        
+        mask = columnar.AmountColumn.from_amounts(amounts).threshold_mask(threshold)
+        
+        assert mask == [decimal_results(a, threshold)[1] for a in amounts]
+    
+    def test_empty_batch(self, backend):
+        """Test an empty batch yields empty masks."""
+        assert columnar.evaluate_stateless([]) == ([], [])
+    
+    def test_records_match_decimal_rules(self, backend):
+        """Test record masks and single-record checks match the Decimal rules."""
+        records = [TxRecord.from_row(dict(ROW, amount=a)) for a in AMOUNTS]
+        expected = [decimal_results(Decimal(a)) for a in AMOUNTS]
+        
+        round_mask, high_mask = columnar.evaluate_stateless_records(records)
+        
+        assert list(zip(round_mask, high_mask)) == expected
+        assert [
+            (columnar.is_round_amount(r), columnar.meets_threshold(r, Decimal("10000")))
+            for r in records
+        ] == expected
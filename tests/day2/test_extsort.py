@@ -0,0 +1,143 @@
+"""Tests for the external merge sort."""
+
+import pytest
+import random
+from pathlib import Path
+
+from src.day2.aml_triage import extsort, io
+from src.day2.aml_triage.extsort import ExternalSorter, external_sort
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+
+class TestExternalSort:
+    """Tests for external_sort and ExternalSorter."""
+    
+    @pytest.mark.parametrize("run_size", [1, 3, 10, 1000])
+    def test_matches_builtin_stable_sort(self, run_size, tmp_path):
+        """Test output equals sorted() for any run size, including ties."""
+        rng = random.Random(42)
+        items = [(rng.randint(0, 20), i) for i in range(200)]
+        
+        result = list(external_sort(items, key=lambda x: x[0], run_size=run_size, tmp_dir=tmp_path))
+        
+        assert result == sorted(items, key=lambda x: x[0])
+    
+    def test_run_files_are_removed(self, tmp_path):
+        """Test spilled runs are cleaned up after the merge."""
+        with ExternalSorter(key=lambda x: x, run_size=2, tmp_dir=tmp_path) as sorter:
+            for value in [5, 3, 1, 4, 2]:
+                sorter.add(value)
+            assert list(tmp_path.iterdir())
+            assert list(sorter.sorted()) == [1, 2, 3, 4, 5]
+        
+        assert list(tmp_path.iterdir()) == []
+    
+    def test_small_input_stays_in_memory(self, tmp_path):
+        """Test inputs smaller than a run never touch disk."""
+        with ExternalSorter(key=lambda x: x, run_size=10, tmp_dir=tmp_path) as sorter:
+            for value in [2, 1]:
+                sorter.add(value)
+            assert list(sorter.sorted()) == [1, 2]
+            assert list(tmp_path.iterdir()) == []
+    
+    def test_invalid_run_size(self):
+        """Test run_size must be positive and fan_in at least 2."""
+        with pytest.raises(ValueError):
+            ExternalSorter(key=lambda x: x, run_size=0)
+        with pytest.raises(ValueError):
+            ExternalSorter(key=lambda x: x, fan_in=1)
+    
+    def test_merge_passes_bound_open_runs(self, tmp_path, monkeypatch):
+        """Test more runs than fan_in are merged in passes, never opening more than fan_in."""
+        opened = []
+        open_runs = []
+        read_run = extsort._read_run
+        
+        def counting_read_run(path):
+            open_runs.append(path)
+            opened.append(len(open_runs))
+            try:
+                yield from read_run(path)
+            finally:
+                open_runs.remove(path)
+        
+        monkeypatch.setattr(extsort, "_read_run", counting_read_run)
+        rng = random.Random(3)
+        items = [(rng.randint(0, 50), i) for i in range(500)]
+        
+        with ExternalSorter(key=lambda x: x[0], run_size=2, tmp_dir=tmp_path, fan_in=4) as sorter:
+            for item in items:
+                sorter.add(item)
+            result = list(sorter.sorted())
+            assert len(list(list(tmp_path.iterdir())[0].iterdir())) <= 4
+        
+        assert result == sorted(items, key=lambda x: x[0])
+        assert max(opened) == 4
+        assert len(opened) > 250
+        assert list(tmp_path.iterdir()) == []
+    
+    @pytest.mark.skipif(resource is None, reason="needs the resource module")
+    def test_more_runs_than_open_file_limit(self, tmp_path):
+        """Test sorting with more run files than the process may open at once."""
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (min(512, hard), hard))
+        try:
+            items = list(range(3000, 0, -1))
+            result = list(external_sort(items, key=lambda x: x, run_size=2, tmp_dir=tmp_path))
+        finally:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (soft, hard))
+        
+        assert result == sorted(items)
+
+
+class TestIterSortedTransactions:
+    """Tests for externally sorted transaction loading."""
+    
+    def test_matches_load_transactions_order(self, tmp_path):
+        """Test external sort yields the same order as load_transactions."""
+        sample_file = Path("src/samples/sample_transactions_day2.csv")
+        
+        if not sample_file.exists():
+            pytest.skip("Sample data file not found")
+        
+        lines = sample_file.read_text().splitlines()
+        body = lines[1:]
+        random.Random(7).shuffle(body)
+        shuffled = tmp_path / "shuffled.csv"
+        shuffled.write_text("\n".join([lines[0]] + body) + "\n")
+        
+        expected = [t.transaction_id for t in io.load_transactions(shuffled)]
+        result = [t.transaction_id for t in io.iter_sorted_transactions(shuffled, run_size=4, tmp_dir=tmp_path)]
+        
+        assert result == expected
+    
+    def test_invalid_timestamp_raises(self, tmp_path):
+        """Test rows with unparseable timestamps raise ValueError."""
+        bad = tmp_path / "bad.csv"
+        bad.write_text(
+            "transaction_id,account_id,timestamp,amount,transaction_type,beneficiary_id,currency\n"
+            "TX001,ACC001,not-a-date,100.00,DEBIT,BEN001,USD\n"
+        )
+        
+        with pytest.raises(ValueError):
+            list(io.iter_sorted_transactions(bad))
+    
+    def test_quoted_and_long_rows(self, tmp_path):
+        """Test quoted fields are read like csv.DictReader and long rows raise."""
+        header = "transaction_id,account_id,timestamp,amount,transaction_type,beneficiary_id,currency\n"
+        quoted = tmp_path / "quoted.csv"
+        quoted.write_text(
+            header
+            + 'TX002,ACC001,2024-01-15T11:00:00Z,"200.00",DEBIT,BEN001,USD\n'
+            + 'TX001,"ACC001",2024-01-15T10:00:00Z,100.00,DEBIT,BEN001,USD\n'
+        )
+        assert [t.transaction_id for t in io.iter_sorted_transactions(quoted)] == ["TX001", "TX002"]
+        
+        long_row = tmp_path / "long.csv"
+        long_row.write_text(header + "TX001,ACC001,2024-01-15T10:00:00Z,100.00,DEBIT,BEN001,USD,extra\n")
+        with pytest.raises(ValueError, match="8 fields, expected 7"):
+            list(io.iter_sorted_transactions(long_row))
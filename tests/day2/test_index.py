@@ -0,0 +1,89 @@
+"""Tests for the per-account transaction index."""
+
+import pytest
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from src.day2.aml_triage.schemas import Transaction
+from src.day2.aml_triage.index import AccountIndex, sliding_window_counts, to_epoch_micros
+from src.day2.aml_triage.records import TxRecord
+
+
+def create_transaction(tx_id, account_id, timestamp, amount=1000):
+    """Helper to create test transactions."""
+    return Transaction(
+        transaction_id=tx_id,
+        account_id=account_id,
+        timestamp=timestamp,
+        amount=Decimal(str(amount)),
+        transaction_type="DEBIT",
+        beneficiary_id="BEN001",
+        currency="USD"
+    )
+
+
+class TestSlidingWindowCounts:
+    """Tests for the two-pointer window sweep."""
+    
+    def test_counts_include_both_directions(self):
+        """Test counts cover elements before and after each position."""
+        burst, counts = sliding_window_counts([0, 10, 20, 200], window=60)
+        assert burst is True
+        assert counts == [3, 3, 3, 1]
+    
+    def test_window_boundary_is_inclusive(self):
+        """Test elements exactly window apart are counted."""
+        burst, counts = sliding_window_counts([0, 30, 60], window=60)
+        assert burst is True
+        assert counts == [3, 3, 3]
+    
+    def test_no_burst_when_spread_out(self):
+        """Test no burst is reported for sparse timestamps."""
+        burst, counts = sliding_window_counts([0, 70, 140], window=60)
+        assert burst is False
+        assert counts == [1, 1, 1]
+    
+    def test_empty_array(self):
+        """Test empty input yields no burst."""
+        assert sliding_window_counts([], window=60) == (False, [])
+
+
+class TestAccountIndex:
+    """Tests for AccountIndex."""
+    
+    def test_partitions_by_account(self):
+        """Test positions are grouped per account in input order."""
+        base_time = datetime(2024, 1, 15, 10, 0, 0, tzinfo=timezone.utc)
+        transactions = [
+            create_transaction("TX1", "ACC001", base_time),
+            create_transaction("TX2", "ACC002", base_time + timedelta(seconds=5)),
+            create_transaction("TX3", "ACC001", base_time + timedelta(seconds=10)),
+        ]
+        
+        index = AccountIndex([TxRecord.from_transaction(t) for t in transactions])
+        
+        assert index.positions == {"ACC001": [0, 2], "ACC002": [1]}
+        assert index.times["ACC001"][1] - index.times["ACC001"][0] == 10_000_000
+    
+    def test_velocity_flags_every_transaction_of_bursting_account(self):
+        """Test burst flag applies account-wide, matching check_high_velocity."""
+        base_time = datetime(2024, 1, 15, 10, 0, 0, tzinfo=timezone.utc)
+        transactions = [
+            create_transaction("TX1", "ACC001", base_time),
+            create_transaction("TX2", "ACC001", base_time + timedelta(seconds=10)),
+            create_transaction("TX3", "ACC002", base_time + timedelta(seconds=15)),
+            create_transaction("TX4", "ACC001", base_time + timedelta(seconds=20)),
+            create_transaction("TX5", "ACC001", base_time + timedelta(minutes=15)),
+        ]
+        
+        index = AccountIndex([TxRecord.from_transaction(t) for t in transactions])
+        bursts, counts = index.velocity(window_seconds=60)
+        
+        assert bursts == [True, True, False, True, True]
+        assert counts == [3, 3, 1, 3, 1]
+    
+    def test_to_epoch_micros_naive_and_aware_agree(self):
+        """Test naive timestamps are treated as UTC wall time."""
+        naive = datetime(2024, 1, 15, 10, 0, 0)
+        aware = naive.replace(tzinfo=timezone.utc)
+        assert to_epoch_micros(naive) == to_epoch_micros(aware)
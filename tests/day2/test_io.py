@@ -73,6 +73,77 @@ class TestWriteAlertsJson:
             assert data[0]['alert_id'] == "ALERT-TX001"
 
 
+class TestAlertJsonWriter:
+    """Tests for incremental alert JSON writer."""
+    
+    def _make_alert(self, tx_id):
+        tx = Transaction(
+            transaction_id=tx_id,
+            account_id="ACC001",
+            timestamp=datetime(2024, 1, 15, 10, 0, 0),
+            amount=Decimal("5000"),
+            transaction_type="DEBIT",
+            beneficiary_id="BEN001"
+        )
+        return Alert(
+            alert_id=f"ALERT-{tx_id}",
+            transaction=tx,
+            reason_codes=[ReasonCode.HIGH_VELOCITY, ReasonCode.ROUND_AMOUNT],
+            explanation="Test alert",
+            timestamp_detected=datetime(2024, 1, 15, 10, 5, 0)
+        )
+    
+    def test_output_matches_write_alerts_json(self, tmp_path):
+        """Test incremental output is byte-identical to write_alerts_json."""
+        alerts = [self._make_alert("TX001"), self._make_alert("TX002")]
+        
+        io.write_alerts_json(alerts, tmp_path / "batch.json")
+        with io.AlertJsonWriter(tmp_path / "stream.json") as writer:
+            for alert in alerts:
+                writer.write(alert)
+        
+        assert (tmp_path / "stream.json").read_bytes() == (tmp_path / "batch.json").read_bytes()
+        assert writer.count == 2
+    
+    def test_output_matches_indented_json_dump(self, tmp_path):
+        """Test the default format equals json.dump(indent=2), including non-ASCII text."""
+        alerts = [
+            self._make_alert("TX001"),
+            self._make_alert("TX002").model_copy(update={"explanation": "Bénéficiaire\x7f \u2028"}),
+        ]
+        expected = json.dumps([a.model_dump(mode='json') for a in alerts], indent=2)
+        
+        io.write_alerts_json(alerts, tmp_path / "alerts.json")
+        
+        assert (tmp_path / "alerts.json").read_text(encoding='utf-8') == expected
+    
+    def test_compact_and_ndjson_formats(self, tmp_path):
+        """Test compact arrays and NDJSON hold the same alerts."""
+        alerts = [self._make_alert("TX001"), self._make_alert("TX002")]
+        expected = [a.model_dump(mode='json') for a in alerts]
+        
+        io.write_alerts_json(alerts, tmp_path / "compact.json", format="compact")
+        io.write_alerts_json(alerts, tmp_path / "alerts.ndjson", format="ndjson")
+        
+        compact = (tmp_path / "compact.json").read_text()
+        assert "\n" not in compact and json.loads(compact) == expected
+        lines = (tmp_path / "alerts.ndjson").read_text().splitlines()
+        assert [json.loads(line) for line in lines] == expected
+    
+    def test_unknown_format_raises(self, tmp_path):
+        """Test an unsupported format is rejected."""
+        with pytest.raises(ValueError):
+            io.AlertJsonWriter(tmp_path / "alerts.json", format="xml")
+    
+    def test_empty_output_matches_write_alerts_json(self, tmp_path):
+        """Test an empty writer produces an empty JSON array."""
+        io.write_alerts_json([], tmp_path / "batch.json")
+        with io.AlertJsonWriter(tmp_path / "stream.json"):
+            pass
+        
+        assert (tmp_path / "stream.json").read_bytes() == (tmp_path / "batch.json").read_bytes()
+
+
 class TestWriteTriageQueueCsv:
     """Tests for writing triage queue CSV."""
     
@@ -156,6 +156,54 @@ class TestRunPipeline:
         alert_ids2 = [a['alert_id'] for a in alerts2]
         assert alert_ids1 == alert_ids2
     
+    def test_pipeline_sharded_matches_single_process(self, tmp_path):
+        """Test --workers produces the same alerts and queue as one process."""
+        sample_file = Path("src/samples/sample_transactions_day2.csv")
+        
+        if not sample_file.exists():
+            pytest.skip("Sample data file not found")
+        
+        summary1 = pipeline.run_pipeline(sample_file, tmp_path / "single")
+        summary2 = pipeline.run_pipeline(sample_file, tmp_path / "sharded", workers=3)
+        
+        assert summary1['by_priority'] == summary2['by_priority']
+        
+        with open(tmp_path / "single" / "aml_alerts.json") as f:
+            alerts1 = json.load(f)
+        with open(tmp_path / "sharded" / "aml_alerts.json") as f:
+            alerts2 = json.load(f)
+        
+        assert [a['alert_id'] for a in alerts1] == [a['alert_id'] for a in alerts2]
+        assert [a['explanation'] for a in alerts1] == [a['explanation'] for a in alerts2]
+        assert (
+            (tmp_path / "single" / "triage_queue.csv").read_text()
+            == (tmp_path / "sharded" / "triage_queue.csv").read_text()
+        )
+    
+    def test_pipeline_sharded_with_beneficiary_index(self, tmp_path):
+        """Test NEW_BENEFICIARY flags are identical with --workers."""
+        sample_file = Path("src/samples/sample_transactions_day2.csv")
+        
+        if not sample_file.exists():
+            pytest.skip("Sample data file not found")
+        
+        pipeline.run_pipeline(sample_file, tmp_path / "single", beneficiary_index=tmp_path / "idx1")
+        pipeline.run_pipeline(
+            sample_file, tmp_path / "sharded", workers=3, beneficiary_index=tmp_path / "idx2"
+        )
+        
+        assert (
+            (tmp_path / "single" / "triage_queue.csv").read_text()
+            == (tmp_path / "sharded" / "triage_queue.csv").read_text()
+        )
+    
+    def test_shard_for_account_is_stable(self):
+        """Test account shard assignment is deterministic and in range."""
+        shards = [pipeline.shard_for_account(f"ACC{i:03d}", 4) for i in range(50)]
+        
+        assert shards == [pipeline.shard_for_account(f"ACC{i:03d}", 4) for i in range(50)]
+        assert set(shards) <= {0, 1, 2, 3}
+    
     def test_pipeline_handles_no_alerts(self, tmp_path):
         """Test pipeline handles case with no alerts generated."""
         # Create CSV with transactions that won't trigger any rules
@@ -0,0 +1,79 @@
+"""Tests for opt-in pipeline profiling counters."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from src.day2.aml_triage import pipeline
+from src.day2.aml_triage.profiling import PerfRecorder, stage
+
+
+SAMPLE_FILE = Path("src/samples/sample_transactions_day2.csv")
+
+
+@pytest.fixture
+def sample_file():
+    if not SAMPLE_FILE.exists():
+        pytest.skip("Sample data file not found")
+    return SAMPLE_FILE
+
+
+class TestPerfRecorder:
+    """Tests for the recorder itself."""
+    
+    def test_stage_accumulates(self):
+        """Test repeated stages add up and no-op stages record nothing."""
+        perf = PerfRecorder()
+        for rows in (3, 4):
+            with perf.stage("load") as counters:
+                counters["rows"] += rows
+        with stage(None, "load") as counters:
+            counters["rows"] = 100
+        
+        load = perf.to_dict()["stages"]["load"]
+        assert load["rows"] == 7
+        assert load["wall_seconds"] >= 0 and load["cpu_seconds"] >= 0
+    
+    def test_merge_sums_rule_counters(self):
+        """Test shard recorders merge by summing counters."""
+        first, second = PerfRecorder(), PerfRecorder()
+        with first.rule("HIGH_AMOUNT") as counters:
+            counters["evaluations"] += 10
+            counters["hits"] += 2
+        with second.rule("HIGH_AMOUNT") as counters:
+            counters["evaluations"] += 5
+            counters["hits"] += 1
+        
+        first.merge(second)
+        rule = first.to_dict()["rules"]["HIGH_AMOUNT"]
+        assert (rule["evaluations"], rule["hits"]) == (15, 3)
+
+
+class TestPipelineProfiling:
+    """Tests for profiling in run_pipeline."""
+    
+    def test_summary_has_no_perf_by_default(self, sample_file, tmp_path):
+        """Test profiling is opt-in."""
+        summary = pipeline.run_pipeline(sample_file, tmp_path)
+        
+        assert "perf" not in summary
+        assert "perf" not in json.loads((tmp_path / "summary.json").read_text())
+    
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_perf_in_summary(self, sample_file, tmp_path, workers):
+        """Test stage and rule counters are written to summary.json."""
+        summary = pipeline.run_pipeline(sample_file, tmp_path, workers=workers, profile=True)
+        written = json.loads((tmp_path / "summary.json").read_text())
+        perf = written["perf"]
+        
+        assert summary["perf"]["rules"] == perf["rules"]
+        expected_stages = ["load", "rules", "triage", "write"] if workers == 1 else ["load", "rules", "write"]
+        assert list(perf["stages"]) == expected_stages
+        assert perf["stages"]["load"]["rows"] == summary["total_transactions"]
+        
+        # Hits per rule are the reason code counts
+        hits = {code: counters["hits"] for code, counters in perf["rules"].items() if counters["hits"]}
+        assert hits == written["by_reason_code"]
+        assert perf["rules"]["ROUND_AMOUNT"]["evaluations"] == summary["total_transactions"]
+        assert perf["rules"]["NEW_BENEFICIARY"]["evaluations"] == 0
@@ -0,0 +1,188 @@
+"""Tests for NDJSON/Arrow/Parquet transaction readers."""
+
+import csv
+import json
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+from src.day2.aml_triage import io, pipeline, readers
+
+
+SAMPLE_FILE = Path("src/samples/sample_transactions_day2.csv")
+
+
+def sample_rows():
+    if not SAMPLE_FILE.exists():
+        pytest.skip("Sample data file not found")
+    with open(SAMPLE_FILE, newline='') as f:
+        return list(csv.DictReader(f))
+
+
+def write_ndjson(path, rows, numeric_amounts=True):
+    with open(path, 'w') as f:
+        for row in rows:
+            if numeric_amounts:
+                line = json.dumps({k: v for k, v in row.items() if k != "amount"})
+                line = line[:-1] + f', "amount": {row["amount"]}}}'
+            else:
+                line = json.dumps(row)
+            f.write(line + "\n")
+
+
+def normalized_alerts(output_dir):
+    alerts = json.loads((output_dir / "aml_alerts.json").read_text())
+    for alert in alerts:
+        alert.pop("timestamp_detected")
+    return alerts
+
+
+class TestReaderSelection:
+    """Tests for choosing a reader by extension."""
+    
+    def test_reader_for_extension(self):
+        """Test known extensions map to readers and CSV is the default."""
+        assert readers.reader_for(Path("day.ndjson")) is readers.iter_ndjson_records
+        assert readers.reader_for(Path("day.JSONL")) is readers.iter_ndjson_records
+        assert readers.reader_for(Path("day.feather")) is readers.iter_arrow_records
+        assert readers.reader_for(Path("day.parquet")) is readers.iter_parquet_records
+        assert readers.reader_for(Path("day.csv")) is None
+        assert readers.reader_for(Path("day.txt")) is None
+    
+    def test_arrow_without_pyarrow(self, tmp_path, monkeypatch):
+        """Test a clear error when pyarrow is missing."""
+        path = tmp_path / "day.parquet"
+        path.write_bytes(b"")
+        monkeypatch.setattr(readers, "pyarrow", None)
+        
+        with pytest.raises(ImportError, match="requires pyarrow"):
+            list(io.iter_records(path))
+
+
+class TestNdjsonReader:
+    """Tests for NDJSON input."""
+    
+    @pytest.mark.parametrize("numeric_amounts", [True, False])
+    def test_records_match_csv(self, tmp_path, numeric_amounts):
+        """Test NDJSON records equal CSV records, keeping exact amount text."""
+        path = tmp_path / "sample.ndjson"
+        write_ndjson(path, sample_rows(), numeric_amounts)
+        
+        from_csv = [record.to_row() for record in io.iter_records(SAMPLE_FILE)]
+        from_ndjson = [record.to_row() for record in io.iter_records(path)]
+        assert from_ndjson == from_csv
+    
+    def test_pipeline_outputs_match_csv(self, tmp_path):
+        """Test the pipeline produces the same outputs from NDJSON."""
+        path = tmp_path / "sample.ndjson"
+        write_ndjson(path, sample_rows())
+        
+        pipeline.run_pipeline(SAMPLE_FILE, tmp_path / "csv")
+        pipeline.run_pipeline(path, tmp_path / "ndjson")
+        
+        assert normalized_alerts(tmp_path / "ndjson") == normalized_alerts(tmp_path / "csv")
+        assert (tmp_path / "ndjson" / "triage_queue.csv").read_text() == \
+            (tmp_path / "csv" / "triage_queue.csv").read_text()
+    
+    def test_load_transactions_reads_ndjson(self, tmp_path):
+        """Test the Transaction loaders also accept NDJSON."""
+        path = tmp_path / "sample.ndjson"
+        write_ndjson(path, sample_rows())
+        
+        assert io.load_transactions(path) == io.load_transactions(SAMPLE_FILE)
+    
+    def test_invalid_line_reports_line_number(self, tmp_path):
+        """Test invalid lines are reported with their line number."""
+        path = tmp_path / "bad.ndjson"
+        rows = sample_rows()[:2]
+        rows[1]["transaction_type"] = "REFUND"
+        write_ndjson(path, rows)
+        
+        with pytest.raises(ValueError, match="line 2"):
+            list(io.iter_records(path))
+
+
+class TestArrowReaders:
+    """Tests for Arrow IPC and Parquet input (need pyarrow)."""
+    
+    def sample_table(self):
+        pa = pytest.importorskip("pyarrow")
+        rows = sample_rows()
+        return pa.table({
+            "transaction_id": [row["transaction_id"] for row in rows],
+            "account_id": [row["account_id"] for row in rows],
+            "timestamp": pa.array(
+                [datetime.fromisoformat(row["timestamp"].replace("Z", "+00:00")) for row in rows],
+                type=pa.timestamp("us", tz="UTC")
+            ),
+            "amount": pa.array([Decimal(row["amount"]) for row in rows], type=pa.decimal128(18, 2)),
+            "transaction_type": [row["transaction_type"] for row in rows],
+            "beneficiary_id": [row["beneficiary_id"] for row in rows],
+        })
+    
+    def test_parquet_pipeline_matches_csv(self, tmp_path):
+        """Test Parquet input produces the same alerts as CSV."""
+        table = self.sample_table()
+        import pyarrow.parquet as pq
+        pq.write_table(table, tmp_path / "sample.parquet")
+        
+        pipeline.run_pipeline(SAMPLE_FILE, tmp_path / "csv")
+        pipeline.run_pipeline(tmp_path / "sample.parquet", tmp_path / "parquet")
+        
+        assert normalized_alerts(tmp_path / "parquet") == normalized_alerts(tmp_path / "csv")
+    
+    def test_arrow_ipc_records_match_csv(self, tmp_path):
+        """Test Arrow IPC records carry the same timestamps and amounts."""
+        table = self.sample_table()
+        import pyarrow.feather as feather
+        feather.write_feather(table, tmp_path / "sample.feather")
+        
+        from_csv = list(io.iter_records(SAMPLE_FILE))
+        from_arrow = list(io.iter_records(tmp_path / "sample.feather"))
+        assert [(r.timestamp_us, r.amount_cents, r.amount_text) for r in from_arrow] == \
+            [(r.timestamp_us, r.amount_cents, r.amount_text) for r in from_csv]
+    
+    def test_columnar_records_match_row_parsing(self, tmp_path):
+        """Test column-wise conversion equals per-row parsing, with fallback for other types."""
+        pa = pytest.importorskip("pyarrow")
+        import pyarrow.feather as feather
+        table = self.sample_table()
+        slots = readers.TxRecord.__slots__
+        
+        def as_tuples(records):
+            return [tuple(getattr(record, slot) for slot in slots) for record in records]
+        
+        expected = as_tuples(readers.iter_row_records(table.column_names, zip(*table.to_pydict().values())))
+        for amount_type in (pa.decimal128(38, 2), pa.float64()):
+            variant = table.set_column(3, "amount", table.column("amount").cast(amount_type))
+            feather.write_feather(variant, tmp_path / "variant.feather")
+            records = list(readers.iter_arrow_records(tmp_path / "variant.feather"))
+            assert as_tuples(records)[0][:8] == expected[0][:8]
+        
+        feather.write_feather(table, tmp_path / "sample.feather")
+        assert as_tuples(readers.iter_arrow_records(tmp_path / "sample.feather")) == expected
+    
+    def test_sub_cent_amounts_stay_inexact(self, tmp_path):
+        """Test amounts finer than cents take the row path and keep their text."""
+        pa = pytest.importorskip("pyarrow")
+        import pyarrow.feather as feather
+        table = self.sample_table()
+        amounts = pa.array([Decimal("1.005")] * table.num_rows, type=pa.decimal128(18, 3))
+        feather.write_feather(table.set_column(3, "amount", amounts), tmp_path / "fine.feather")
+        
+        record = next(readers.iter_arrow_records(tmp_path / "fine.feather"))
+        assert (record.amount_text, record.cents_exact) == ("1.005", False)
+    
+    def test_invalid_column_values_name_the_row(self, tmp_path):
+        """Test nulls and bad transaction types raise ValueError naming the row."""
+        pa = pytest.importorskip("pyarrow")
+        import pyarrow.feather as feather
+        table = self.sample_table()
+        types = table.column("transaction_type").to_pylist()
+        for bad in ("REFUND", None):
+            column = pa.array(types[:-1] + [bad], type=pa.string())
+            feather.write_feather(table.set_column(4, "transaction_type", column), tmp_path / "bad.feather")
+            with pytest.raises(ValueError, match="Invalid transaction data in row"):
+                list(readers.iter_arrow_records(tmp_path / "bad.feather"))
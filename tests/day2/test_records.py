@@ -0,0 +1,111 @@
+"""Tests for compact transaction records."""
+
+import pytest
+from datetime import datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+
+from src.day2.aml_triage import io
+from src.day2.aml_triage.records import TxRecord
+from src.day2.aml_triage.schemas import Transaction
+
+
+def create_row(**overrides):
+    """Helper to create a raw CSV row."""
+    row = {
+        "transaction_id": "TX001",
+        "account_id": "ACC001",
+        "timestamp": "2024-01-15T10:00:00Z",
+        "amount": "5000.00",
+        "transaction_type": "DEBIT",
+        "beneficiary_id": "BEN123",
+        "currency": "USD",
+    }
+    row.update(overrides)
+    return row
+
+
+class TestTxRecord:
+    """Tests for TxRecord parsing and conversion."""
+    
+    def test_from_row_primitives(self):
+        """Test timestamps and amounts are stored as integers."""
+        record = TxRecord.from_row(create_row())
+        
+        assert record.timestamp_us == 1705312800000000
+        assert record.amount_cents == 500000
+        assert record.cents_exact is True
+        assert record.amount == Decimal("5000.00")
+    
+    def test_to_transaction_matches_direct_parse(self):
+        """Test the output Transaction equals one built from the row directly."""
+        row = create_row(amount="1234.5", timestamp="2024-01-15 10:00:00")
+        
+        assert TxRecord.from_row(row).to_transaction() == Transaction(**row)
+    
+    def test_from_transaction_round_trip(self):
+        """Test records built from Transactions convert back unchanged."""
+        transaction = Transaction(
+            transaction_id="TX001",
+            account_id="ACC001",
+            timestamp=datetime(2024, 1, 15, 10, 0, 0, tzinfo=timezone.utc),
+            amount=Decimal("99.999"),
+            transaction_type="CREDIT",
+            beneficiary_id="BEN123"
+        )
+        record = TxRecord.from_transaction(transaction)
+        
+        assert record.cents_exact is False
+        assert record.to_transaction() == transaction
+    
+    def test_strings_are_interned(self):
+        """Test repeated account ids share one string object."""
+        first = TxRecord.from_row(create_row(account_id="".join(["ACC", "777"])))
+        second = TxRecord.from_row(create_row(account_id="".join(["ACC", "777"])))
+        
+        assert first.account_id is second.account_id
+    
+    def test_currency_defaults_to_usd(self):
+        """Test a missing currency column defaults like Transaction."""
+        row = create_row()
+        del row["currency"]
+        
+        assert TxRecord.from_row(row).currency == "USD"
+    
+    @pytest.mark.parametrize("overrides", [
+        {"transaction_type": "TRANSFER"},
+        {"amount": "abc"},
+        {"amount": "NaN"},
+        {"timestamp": "not-a-date"},
+        {"beneficiary_id": None},
+    ])
+    def test_invalid_rows_raise(self, overrides):
+        """Test invalid rows are rejected like Transaction validation."""
+        with pytest.raises(ValueError):
+            TxRecord.from_row(create_row(**overrides))
+
+
+class TestLoadRecords:
+    """Tests for record loaders."""
+    
+    def test_same_order_as_load_transactions(self):
+        """Test load_records yields the same transactions in the same order."""
+        sample_file = Path("src/samples/sample_transactions_day2.csv")
+        
+        if not sample_file.exists():
+            pytest.skip("Sample data file not found")
+        
+        records = io.load_records(sample_file)
+        
+        assert [r.to_transaction() for r in records] == io.load_transactions(sample_file)
+    
+    def test_invalid_row_reports_row(self, tmp_path):
+        """Test parse failures are wrapped with the offending row."""
+        bad = tmp_path / "bad.csv"
+        bad.write_text(
+            "transaction_id,account_id,timestamp,amount,transaction_type,beneficiary_id,currency\n"
+            "TX1,ACC001,2024-01-15T10:00:00Z,abc,DEBIT,BEN1,USD\n"
+        )
+        
+        with pytest.raises(ValueError, match="Invalid transaction data in row"):
+            io.load_records(bad)
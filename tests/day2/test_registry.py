@@ -0,0 +1,145 @@
+"""Tests for the declarative AML rule registry."""
+
+import pytest
+from decimal import Decimal
+from pathlib import Path
+
+from src.day2.aml_triage import io, registry
+from src.day2.aml_triage.records import TxRecord
+from src.day2.aml_triage.registry import RULES, STATELESS, WINDOWED, Rule, RuleBatch
+from src.day2.aml_triage.schemas import ReasonCode
+from src.day2.aml_triage.service import RealtimeScorer
+from src.day2.aml_triage.streaming import StreamingTriage
+
+
+def create_record(transaction_id, account_id, timestamp, amount, transaction_type="DEBIT"):
+    """Helper to create a transaction record."""
+    return TxRecord.from_row({
+        "transaction_id": transaction_id,
+        "account_id": account_id,
+        "timestamp": timestamp,
+        "amount": amount,
+        "transaction_type": transaction_type,
+        "beneficiary_id": "BEN001",
+        "currency": "USD",
+    })
+
+
+def near_threshold_rule():
+    """A custom stateless typology: amounts just under 10000."""
+    return Rule(
+        ReasonCode.HIGH_AMOUNT,
+        STATELESS,
+        evaluate_batch=lambda rule, batch: (
+            (position, True)
+            for position, record in enumerate(batch.records)
+            if rule.evaluate_record(rule, record)
+        ),
+        context=lambda rule, record, result: {"amount": record.amount_text, "threshold": str(rule.threshold)},
+        evaluate_record=lambda rule, record: rule.threshold <= record.amount < Decimal("10000"),
+        threshold=Decimal("9000")
+    )
+
+
+class TestRegistry:
+    """Tests for rule declarations."""
+    
+    def test_builtin_rules_in_reporting_order(self):
+        """Test the registry lists rules in reason code order."""
+        assert [rule.code for rule in RULES] == [
+            ReasonCode.HIGH_VELOCITY,
+            ReasonCode.ROUND_AMOUNT,
+            ReasonCode.HIGH_AMOUNT,
+            ReasonCode.RAPID_REVERSAL,
+            ReasonCode.NEW_BENEFICIARY,
+        ]
+        windows = {rule.code: rule.window_seconds for rule in RULES if rule.kind == WINDOWED}
+        assert windows == {ReasonCode.HIGH_VELOCITY: 60, ReasonCode.RAPID_REVERSAL: 300}
+    
+    def test_register_duplicate_code_rejected(self):
+        """Test a second rule for a registered code is rejected."""
+        with pytest.raises(ValueError, match="already registered"):
+            registry.register_rule(near_threshold_rule())
+    
+    def test_inconsistent_declaration_rejected(self):
+        """Test stateless rules need a per-record evaluator."""
+        with pytest.raises(ValueError, match="needs evaluate_record"):
+            Rule(ReasonCode.ROUND_AMOUNT, STATELESS, evaluate_batch=None, context=None)
+    
+    def test_per_transaction_engines_reject_unknown_windowed_rules(self, monkeypatch):
+        """Test streaming and the service refuse rules they would silently skip."""
+        windowed = Rule(
+            ReasonCode.ROUND_AMOUNT,
+            WINDOWED,
+            evaluate_batch=lambda rule, batch: iter(()),
+            context=lambda rule, record, result: {},
+            window_seconds=600
+        )
+        registry.require_per_transaction_rules("Streaming mode")
+        monkeypatch.setattr(registry, "RULES", RULES + [windowed])
+        
+        with pytest.raises(ValueError, match="Streaming mode cannot evaluate .*ROUND_AMOUNT"):
+            StreamingTriage()
+        with pytest.raises(ValueError, match="real-time service cannot evaluate"):
+            RealtimeScorer()
+    
+    def test_plan_evaluates_stateless_first(self):
+        """Test planning orders rules by kind, keeping reporting positions."""
+        kinds = [rule.kind for _, rule in registry.plan(RULES)]
+        assert kinds == sorted(kinds, key=[STATELESS, WINDOWED, registry.HISTORY].index)
+        assert sorted(order for order, _ in registry.plan(RULES)) == list(range(len(RULES)))
+
+
+class TestEvaluateBatch:
+    """Tests for the batch engine."""
+    
+    def test_stateless_only_rule_set_skips_account_index(self):
+        """Test the account index is only built for windowed rules."""
+        records = [create_record("TX1", "ACC1", "2024-01-15T10:00:00Z", "9500.00")]
+        batch = RuleBatch(records)
+        
+        stateless = [rule for rule in RULES if rule.kind == STATELESS]
+        for rule in stateless:
+            list(rule.evaluate_batch(rule, batch))
+        
+        assert batch._index is None
+    
+    def test_small_accounts_skipped_by_windowed_rules(self):
+        """Test accounts below min_transactions are not scanned."""
+        records = [
+            create_record("TX1", "ACC1", "2024-01-15T10:00:00Z", "10.00"),
+            create_record("TX2", "ACC2", "2024-01-15T10:00:10Z", "10.00"),
+            create_record("TX3", "ACC2", "2024-01-15T10:00:20Z", "10.00", "CREDIT"),
+        ]
+        batch = RuleBatch(records)
+        
+        assert [account for account, _ in batch.accounts(2)] == ["ACC2"]
+    
+    def test_custom_rule_set(self):
+        """Test a custom typology is evaluated in the same pass."""
+        records = [
+            create_record("TX1", "ACC1", "2024-01-15T10:00:00Z", "9500.00"),
+            create_record("TX2", "ACC2", "2024-01-15T10:00:10Z", "12.34"),
+        ]
+        alerts = registry.evaluate_batch(records, rule_set=[near_threshold_rule()])
+        
+        assert [(position, alert.alert_id) for position, alert in alerts] == [(0, "ALERT-TX1")]
+        assert "threshold of 9000" in alerts[0][1].explanation
+    
+    def test_stateless_alerts_match_per_record_evaluation(self):
+        """Test batch masks and per-record evaluation agree for stateless rules."""
+        sample_file = Path("src/samples/sample_transactions_day2.csv")
+        if not sample_file.exists():
+            pytest.skip("Sample data file not found")
+        
+        records = io.load_records(sample_file)
+        stateless = [rule for rule in RULES if rule.kind == STATELESS]
+        batch_alerts = dict(registry.evaluate_batch(records, rule_set=stateless))
+        
+        for position, record in enumerate(records):
+            alert = registry.build_alert(record, {}, stateless)
+            expected = batch_alerts.get(position)
+            assert (alert is None) == (expected is None)
+            if alert is not None:
+                assert alert.reason_codes == expected.reason_codes
+                assert alert.explanation == expected.explanation
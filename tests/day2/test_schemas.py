@@ -108,3 +108,37 @@ def test_triage_decision_creation():
     assert decision.priority == "P1"
     assert decision.triage_score == 80.0
     assert decision.assigned_queue == "HIGH_RISK"
+
+
+def test_alert_explanation_rendered_at_output():
+    """Test alerts keep the explanation context and render the text on first use."""
+    tx = Transaction(
+        transaction_id="TX001",
+        account_id="ACC001",
+        timestamp="2024-01-15T10:00:00Z",
+        amount="5000.00",
+        transaction_type="DEBIT",
+        beneficiary_id="BEN123"
+    )
+    
+    alert = Alert(
+        alert_id="ALERT-TX001",
+        transaction=tx,
+        reason_codes=[ReasonCode.HIGH_VELOCITY, ReasonCode.ROUND_AMOUNT],
+        timestamp_detected=datetime.now(),
+        explanation_context={"count": 4, "window": 60, "amount": "5000.00"}
+    )
+    expected = ("High velocity: 4 transactions detected within 60 seconds; "
+                "Round amount: Transaction amount 5000.00 is a round number (divisible by 100)")
+    
+    assert "explanation" not in alert.__dict__
+    assert alert.explanation == expected
+    assert list(alert.model_dump(mode='json')) == [
+        "alert_id", "transaction", "reason_codes", "explanation", "timestamp_detected"
+    ]
+    assert alert.model_dump(mode='json')["explanation"] == expected
+    assert "explanation_context" not in alert.model_dump_json()
+    
+    reviewed = Alert(**{**alert.model_dump(), "explanation": "Reviewed"})
+    assert reviewed.explanation == "Reviewed"
+    assert reviewed == Alert.model_validate_json(reviewed.model_dump_json())
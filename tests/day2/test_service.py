@@ -0,0 +1,220 @@
+"""Tests for the real-time AML alert service."""
+
+import pytest
+import asyncio
+import json
+import os
+import signal
+import threading
+
+from src.day2.aml_triage.records import TxRecord
+from src.day2.aml_triage.schemas import ReasonCode
+from src.day2.aml_triage import service as service_module
+from src.day2.aml_triage.service import AlertService, RealtimeScorer
+
+
+def create_row(tx_id, account_id, timestamp, amount, tx_type="DEBIT", beneficiary="BEN001"):
+    """Helper to create a raw transaction row."""
+    return {
+        "transaction_id": tx_id,
+        "account_id": account_id,
+        "timestamp": timestamp,
+        "amount": amount,
+        "transaction_type": tx_type,
+        "beneficiary_id": beneficiary,
+        "currency": "USD",
+    }
+
+
+def score(scorer, *args, **kwargs):
+    """Score one transaction built from create_row arguments."""
+    return scorer.score(TxRecord.from_row(create_row(*args, **kwargs)))
+
+
+class TestRealtimeScorer:
+    """Tests for backward-looking scoring."""
+    
+    def test_velocity_flags_third_transaction(self):
+        """Test HIGH_VELOCITY fires once the account reaches 3 in 60s."""
+        scorer = RealtimeScorer()
+        
+        assert score(scorer, "TX1", "ACC001", "2024-01-15T10:00:00Z", "10.50") is None
+        assert score(scorer, "TX2", "ACC001", "2024-01-15T10:00:20Z", "10.50") is None
+        decision = score(scorer, "TX3", "ACC001", "2024-01-15T10:00:40Z", "10.50")
+        
+        assert decision.alert.reason_codes == [ReasonCode.HIGH_VELOCITY]
+        assert score(scorer, "TX4", "ACC001", "2024-01-15T10:02:00Z", "10.50") is None
+    
+    def test_reversal_flags_completing_credit(self):
+        """Test RAPID_REVERSAL is reported on the credit that reverses a debit."""
+        scorer = RealtimeScorer()
+        
+        assert score(scorer, "TX1", "ACC001", "2024-01-15T10:00:00Z", "3000.50", "DEBIT", "BEN9") is None
+        decision = score(scorer, "TX2", "ACC001", "2024-01-15T10:04:00Z", "2999.00", "CREDIT", "BEN9")
+        
+        assert decision.alert.alert_id == "ALERT-TX2"
+        assert decision.alert.reason_codes == [ReasonCode.RAPID_REVERSAL]
+    
+    def test_stateless_rules(self):
+        """Test amount rules are evaluated per transaction."""
+        decision = score(RealtimeScorer(), "TX1", "ACC001", "2024-01-15T10:00:00Z", "15000.00")
+        
+        assert decision.alert.reason_codes == [ReasonCode.ROUND_AMOUNT, ReasonCode.HIGH_AMOUNT]
+        assert decision.priority == "P2"
+    
+    def test_late_arrivals(self):
+        """Test slightly late transactions are scored, very late ones rejected."""
+        scorer = RealtimeScorer()
+        score(scorer, "TX1", "ACC001", "2024-01-15T10:08:50Z", "10.50")
+        score(scorer, "TX2", "ACC001", "2024-01-15T10:09:00Z", "10.50")
+        score(scorer, "TX3", "ACC001", "2024-01-15T10:10:00Z", "10.50")
+        
+        # Late, but its own 60s window (TX1, TX2, TX4) is complete
+        decision = score(scorer, "TX4", "ACC001", "2024-01-15T10:09:30Z", "10.50")
+        assert decision.alert.reason_codes == [ReasonCode.HIGH_VELOCITY]
+        
+        with pytest.raises(ValueError):
+            score(scorer, "TX5", "ACC001", "2024-01-15T10:04:00Z", "10.50")
+    
+    def test_idle_accounts_are_swept(self):
+        """Test per-account windows are dropped once they can no longer matter."""
+        scorer = RealtimeScorer(sweep_every=1)
+        score(scorer, "TX1", "ACC001", "2024-01-15T10:00:00Z", "10.50")
+        score(scorer, "TX2", "ACC002", "2024-01-15T11:00:00Z", "10.50")
+        
+        assert list(scorer.windows) == ["ACC002"]
+
+
+class TestAlertService:
+    """Tests for the NDJSON server."""
+    
+    def test_round_trip_and_outputs(self, tmp_path):
+        """Test responses per line and alerts flushed to the output files."""
+        rows = [
+            create_row("TX1", "ACC001", "2024-01-15T10:00:00Z", 5000.00),
+            create_row("TX2", "ACC002", "2024-01-15T10:00:05Z", "12.34"),
+        ]
+        
+        async def scenario():
+            service = AlertService(tmp_path, flush_interval=0.01)
+            await service.start(port=0)
+            reader, writer = await asyncio.open_connection("127.0.0.1", service.port)
+            
+            responses = []
+            for line in [json.dumps(r) for r in rows] + ["{not json"]:
+                writer.write(line.encode() + b"\n")
+                await writer.drain()
+                responses.append(json.loads(await reader.readline()))
+            
+            writer.close()
+            await writer.wait_closed()
+            summary = await service.close()
+            return responses, summary
+        
+        responses, summary = asyncio.run(scenario())
+        
+        assert responses[0]["reason_codes"] == ["ROUND_AMOUNT"]
+        assert responses[0]["decision"]["priority"] == "P3"
+        assert responses[1] == {"transaction_id": "TX2", "reason_codes": [], "decision": None}
+        assert "error" in responses[2]
+        
+        assert summary["total_alerts"] == 1
+        with open(tmp_path / "aml_alerts.json") as f:
+            assert [a["alert_id"] for a in json.load(f)] == ["ALERT-TX1"]
+        assert "ALERT-TX1" in (tmp_path / "triage_queue.csv").read_text()
+    
+    def test_backpressure_bounds_queue(self, tmp_path):
+        """Test a full alert queue throttles clients without losing alerts."""
+        rows = [
+            create_row(f"TX{i}", f"ACC{i:03d}", "2024-01-15T10:00:00Z", "500.00")
+            for i in range(50)
+        ]
+        
+        async def scenario():
+            service = AlertService(tmp_path, queue_size=2, batch_size=3)
+            await service.start(port=0)
+            reader, writer = await asyncio.open_connection("127.0.0.1", service.port)
+            
+            writer.write(b"".join(json.dumps(r).encode() + b"\n" for r in rows))
+            await writer.drain()
+            for _ in rows:
+                await reader.readline()
+                assert service.queue.qsize() <= 2
+            
+            writer.close()
+            await writer.wait_closed()
+            return await service.close()
+        
+        summary = asyncio.run(scenario())
+        
+        assert summary["total_alerts"] == 50
+    
+    def test_alerts_written_off_the_event_loop(self, tmp_path):
+        """Test batches are serialized and written outside the loop thread."""
+        threads = set()
+        
+        async def scenario():
+            service = AlertService(tmp_path, flush_interval=0.01)
+            await service.start(port=0)
+            write = service.outputs.write
+            
+            def recording_write(decision):
+                threads.add(threading.current_thread())
+                write(decision)
+            service.outputs.write = recording_write
+            
+            reader, writer = await asyncio.open_connection("127.0.0.1", service.port)
+            writer.write(json.dumps(create_row("TX1", "ACC001", "2024-01-15T10:00:00Z", "500.00")).encode() + b"\n")
+            await writer.drain()
+            await reader.readline()
+            writer.close()
+            await writer.wait_closed()
+            return await service.close()
+        
+        summary = asyncio.run(scenario())
+        
+        assert summary["total_alerts"] == 1
+        assert threads and threading.main_thread() not in threads
+    
+    def test_overlong_line_gets_error_response(self, tmp_path):
+        """Test a line over the reader limit is answered with an error, not dropped."""
+        async def scenario():
+            service = AlertService(tmp_path)
+            await service.start(port=0)
+            reader, writer = await asyncio.open_connection("127.0.0.1", service.port)
+            
+            valid = json.dumps(create_row("TX1", "ACC001", "2024-01-15T10:00:00Z", "12.34")).encode()
+            writer.write(b'{"transaction_id": "' + b"X" * (1 << 17) + b'"}\n' + valid + b"\n")
+            await writer.drain()
+            responses = [json.loads(await reader.readline()) for _ in range(2)]
+            
+            writer.close()
+            await writer.wait_closed()
+            await service.close()
+            return responses
+        
+        too_long, next_line = asyncio.run(scenario())
+        
+        assert too_long["error"].startswith("Request line longer than")
+        assert next_line["transaction_id"] == "TX1"
+    
+    def test_shutdown_signal_without_loop_signal_handlers(self, tmp_path, monkeypatch):
+        """Test serve stops on SIGINT where the loop can't install handlers (Windows)."""
+        def unsupported(self, sig, callback, *args):
+            raise NotImplementedError
+        monkeypatch.setattr(asyncio.SelectorEventLoop, "add_signal_handler", unsupported)
+        previous = signal.getsignal(signal.SIGINT), signal.getsignal(signal.SIGTERM)
+        
+        async def scenario():
+            loop = asyncio.get_running_loop()
+            loop.call_later(0.2, os.kill, os.getpid(), signal.SIGINT)
+            return await service_module.serve(tmp_path, port=0)
+        
+        try:
+            summary = asyncio.run(scenario())
+        finally:
+            signal.signal(signal.SIGINT, previous[0])
+            signal.signal(signal.SIGTERM, previous[1])
+        
+        assert summary["total_alerts"] == 0
+        assert (tmp_path / "summary.json").exists()
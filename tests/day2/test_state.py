@@ -0,0 +1,135 @@
+"""Tests for checkpointed incremental AML triage."""
+
+import pytest
+from pathlib import Path
+import json
+
+from src.day2.aml_triage import pipeline
+from src.day2.aml_triage.state import load_state, run_incremental_pipeline, save_state
+from src.day2.aml_triage.streaming import StreamingTriage, run_streaming_pipeline
+
+
+HEADER = "transaction_id,account_id,timestamp,amount,transaction_type,beneficiary_id,currency"
+
+
+def write_csv(path, rows):
+    """Helper to write a transaction CSV."""
+    path.write_text("\n".join([HEADER] + rows) + "\n")
+    return path
+
+
+def alert_ids(output_dir):
+    """Read alert ids and reason codes from an output directory."""
+    with open(output_dir / "aml_alerts.json") as f:
+        return [(a["alert_id"], a["reason_codes"]) for a in json.load(f)]
+
+
+class TestCheckpoint:
+    """Tests for saving and loading engine state."""
+    
+    def test_missing_file_gives_fresh_engine(self, tmp_path):
+        """Test the first run starts from an empty engine."""
+        engine = load_state(tmp_path / "state.json")
+        
+        assert engine.watermark is None
+        assert not engine.pending and not engine.history
+    
+    def test_round_trip_preserves_pending_identity(self, tmp_path):
+        """Test pending entries are restored as the same objects as history entries."""
+        path = write_csv(tmp_path / "in.csv", [
+            "TX1,ACC001,2024-01-15T10:00:00Z,3000.00,DEBIT,BEN1,USD",
+            "TX2,ACC001,2024-01-15T10:00:30Z,50.00,DEBIT,BEN2,USD",
+        ])
+        engine = StreamingTriage()
+        run_streaming_pipeline(path, tmp_path / "out", engine=engine, flush=False)
+        
+        save_state(engine, tmp_path / "state.json")
+        restored = load_state(tmp_path / "state.json")
+        
+        assert restored.watermark == engine.watermark
+        assert [r.transaction_id for r in restored.pending] == ["TX1", "TX2"]
+        assert all(r is h for r, h in zip(restored.pending, restored.history["ACC001"]))
+    
+    def test_window_mismatch_raises(self, tmp_path):
+        """Test a checkpoint saved with other rule windows is rejected."""
+        save_state(StreamingTriage(velocity_window=120), tmp_path / "state.json")
+        
+        with pytest.raises(ValueError, match="windows"):
+            load_state(tmp_path / "state.json")
+    
+    def test_corrupt_file_raises(self, tmp_path):
+        """Test an unreadable checkpoint raises ValueError."""
+        (tmp_path / "state.json").write_text("{not json")
+        
+        with pytest.raises(ValueError, match="Invalid AML state checkpoint"):
+            load_state(tmp_path / "state.json")
+
+
+class TestIncrementalPipeline:
+    """Tests for cross-file detection."""
+    
+    def test_reversal_across_files(self, tmp_path):
+        """Test a debit and its reversal in consecutive files are matched."""
+        first = write_csv(tmp_path / "10h.csv", [
+            "TX1,ACC001,2024-01-15T10:59:00Z,3000.50,DEBIT,BEN1,USD",
+        ])
+        second = write_csv(tmp_path / "11h.csv", [
+            "TX2,ACC001,2024-01-15T11:01:00Z,3000.50,CREDIT,BEN1,USD",
+        ])
+        state_path = tmp_path / "state.json"
+        
+        summary = run_incremental_pipeline(first, tmp_path / "o1", state_path)
+        assert summary["total_alerts"] == 0
+        assert summary["pending_transactions"] == 1
+        
+        run_incremental_pipeline(second, tmp_path / "o2", state_path, finalize=True)
+        assert alert_ids(tmp_path / "o2") == [("ALERT-TX1", ["RAPID_REVERSAL"])]
+    
+    def test_velocity_across_files(self, tmp_path):
+        """Test a burst split over two files is flagged."""
+        first = write_csv(tmp_path / "a.csv", [
+            "TX1,ACC001,2024-01-15T10:59:40Z,10.50,DEBIT,BEN1,USD",
+            "TX2,ACC001,2024-01-15T10:59:50Z,10.50,DEBIT,BEN2,USD",
+        ])
+        second = write_csv(tmp_path / "b.csv", [
+            "TX3,ACC001,2024-01-15T11:00:05Z,10.50,DEBIT,BEN3,USD",
+        ])
+        state_path = tmp_path / "state.json"
+        
+        run_incremental_pipeline(first, tmp_path / "o1", state_path)
+        pipeline.run_pipeline(second, tmp_path / "o2", state_path=state_path, finalize_state=True)
+        
+        assert [code for _, code in alert_ids(tmp_path / "o2")] == [["HIGH_VELOCITY"]] * 3
+    
+    def test_split_sample_matches_single_stream(self, tmp_path):
+        """Test splitting the sample between TX008 and its reversal equals one run."""
+        sample_file = Path("src/samples/sample_transactions_day2.csv")
+        
+        if not sample_file.exists():
+            pytest.skip("Sample data file not found")
+        
+        lines = sample_file.read_text().splitlines()
+        first = write_csv(tmp_path / "first.csv", lines[1:9])
+        second = write_csv(tmp_path / "second.csv", lines[9:])
+        state_path = tmp_path / "state.json"
+        
+        run_streaming_pipeline(sample_file, tmp_path / "full")
+        run_incremental_pipeline(first, tmp_path / "o1", state_path)
+        run_incremental_pipeline(second, tmp_path / "o2", state_path, finalize=True)
+        
+        combined = alert_ids(tmp_path / "o1") + alert_ids(tmp_path / "o2")
+        assert combined == alert_ids(tmp_path / "full")
+    
+    def test_older_rows_than_checkpoint_raise(self, tmp_path):
+        """Test a file older than the checkpoint watermark is rejected."""
+        late = write_csv(tmp_path / "late.csv", [
+            "TX9,ACC001,2024-01-15T12:00:00Z,10.50,DEBIT,BEN1,USD",
+        ])
+        early = write_csv(tmp_path / "early.csv", [
+            "TX1,ACC001,2024-01-15T10:00:00Z,10.50,DEBIT,BEN1,USD",
+        ])
+        state_path = tmp_path / "state.json"
+        
+        run_incremental_pipeline(late, tmp_path / "o1", state_path)
+        with pytest.raises(ValueError):
+            run_incremental_pipeline(early, tmp_path / "o2", state_path)
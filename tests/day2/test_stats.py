@@ -0,0 +1,92 @@
+"""Tests for incremental triage summary statistics."""
+
+import json
+import random
+from datetime import datetime
+from decimal import Decimal
+
+from src.day2.aml_triage import io, triage
+from src.day2.aml_triage.schemas import Alert, ReasonCode, Transaction
+from src.day2.aml_triage.stats import TriageStats
+
+
+def create_decision(alert_id, reason_codes):
+    """Helper to create a triage decision."""
+    tx = Transaction(
+        transaction_id=alert_id,
+        account_id="ACC001",
+        timestamp=datetime(2024, 1, 15, 10, 0, 0),
+        amount=Decimal("5000"),
+        transaction_type="DEBIT",
+        beneficiary_id="BEN001"
+    )
+    alert = Alert(
+        alert_id=alert_id,
+        transaction=tx,
+        reason_codes=reason_codes,
+        explanation="Test alert",
+        timestamp_detected=datetime(2024, 1, 15, 10, 0, 0)
+    )
+    return triage.create_triage_decision(alert)
+
+
+def random_decisions(count, seed=11):
+    rng = random.Random(seed)
+    codes = list(ReasonCode)
+    return [
+        create_decision(f"ALERT-TX{i:04d}", rng.sample(codes, rng.randint(1, 3)))
+        for i in range(count)
+    ]
+
+
+class TestTriageStats:
+    """Tests for TriageStats."""
+    
+    def test_counts(self):
+        """Test counts by priority, reason code and queue."""
+        decisions = [
+            create_decision("A1", [ReasonCode.HIGH_VELOCITY, ReasonCode.ROUND_AMOUNT]),
+            create_decision("A2", [ReasonCode.ROUND_AMOUNT]),
+            create_decision("A3", [ReasonCode.HIGH_AMOUNT])
+        ]
+        summary = TriageStats.from_decisions(decisions).to_summary()
+        
+        assert summary == {
+            "total_alerts": 3,
+            "by_priority": {"P1": 1, "P2": 0, "P3": 2},
+            "by_reason_code": {"HIGH_VELOCITY": 1, "ROUND_AMOUNT": 2, "HIGH_AMOUNT": 1},
+            "by_queue": {"HIGH_RISK": 1, "LOW_RISK": 2}
+        }
+        assert list(summary["by_reason_code"]) == ["HIGH_VELOCITY", "ROUND_AMOUNT", "HIGH_AMOUNT"]
+    
+    def test_merged_shards_match_single_pass(self):
+        """Test merging shard stats reproduces one pass, including key order."""
+        decisions = random_decisions(200)
+        expected = TriageStats.from_decisions(decisions).to_summary()
+        
+        shards = [TriageStats() for _ in range(4)]
+        for position, decision in enumerate(decisions):
+            shards[hash(decision.alert.alert_id) % 4].add(decision, position)
+        
+        merged = TriageStats()
+        for shard in reversed(shards):
+            merged.merge(shard)
+        summary = merged.to_summary()
+        
+        assert summary == expected
+        assert list(summary["by_reason_code"]) == list(expected["by_reason_code"])
+        assert list(summary["by_queue"]) == list(expected["by_queue"])
+    
+    def test_priority_counts_skip_zero(self):
+        """Test priority_counts only reports priorities that occurred."""
+        stats = TriageStats.from_decisions([create_decision("A1", [ReasonCode.ROUND_AMOUNT])])
+        assert stats.priority_counts() == {"P3": 1}
+    
+    def test_write_stats_summary_matches_write_summary(self, tmp_path):
+        """Test the accumulated summary file equals the one built from decisions."""
+        decisions = random_decisions(50)
+        io.write_summary(decisions, tmp_path / "a.json")
+        returned = io.write_stats_summary(TriageStats.from_decisions(decisions), tmp_path / "b.json")
+        
+        assert (tmp_path / "a.json").read_text() == (tmp_path / "b.json").read_text()
+        assert returned == json.loads((tmp_path / "b.json").read_text())
@@ -0,0 +1,164 @@
+"""Tests for streaming AML triage mode."""
+
+import pytest
+from pathlib import Path
+from datetime import datetime, timedelta
+from decimal import Decimal
+import csv
+import json
+
+from src.day2.aml_triage import io, pipeline
+from src.day2.aml_triage.records import TxRecord
+from src.day2.aml_triage.schemas import Transaction, ReasonCode
+from src.day2.aml_triage.streaming import StreamingTriage, run_streaming_pipeline
+
+
+def create_transaction(tx_id, account_id, timestamp, amount, tx_type="DEBIT", beneficiary="BEN001"):
+    """Helper to create test transaction records."""
+    return TxRecord.from_transaction(Transaction(
+        transaction_id=tx_id,
+        account_id=account_id,
+        timestamp=timestamp,
+        amount=Decimal(str(amount)),
+        transaction_type=tx_type,
+        beneficiary_id=beneficiary,
+        currency="USD"
+    ))
+
+
+def run_engine(transactions):
+    """Push all transactions through a fresh engine and collect alerts."""
+    engine = StreamingTriage()
+    alerts = []
+    for transaction in transactions:
+        alerts.extend(engine.push(transaction))
+    alerts.extend(engine.flush())
+    return alerts
+
+
+class TestStreamingTriage:
+    """Tests for the StreamingTriage engine."""
+    
+    def test_velocity_burst_is_flagged(self):
+        """Test transactions inside a 3+ burst get HIGH_VELOCITY."""
+        base_time = datetime(2024, 1, 15, 10, 0, 0)
+        transactions = [
+            create_transaction("TX1", "ACC001", base_time, 1001),
+            create_transaction("TX2", "ACC001", base_time + timedelta(seconds=20), 1001),
+            create_transaction("TX3", "ACC001", base_time + timedelta(seconds=40), 1001),
+        ]
+        
+        alerts = run_engine(transactions)
+        
+        assert [a.alert_id for a in alerts] == ["ALERT-TX1", "ALERT-TX2", "ALERT-TX3"]
+        assert all(a.reason_codes == [ReasonCode.HIGH_VELOCITY] for a in alerts)
+    
+    def test_velocity_is_scoped_to_burst_window(self):
+        """Test a transaction far from the burst is not flagged."""
+        base_time = datetime(2024, 1, 15, 10, 0, 0)
+        transactions = [
+            create_transaction("TX1", "ACC001", base_time, 1001),
+            create_transaction("TX2", "ACC001", base_time + timedelta(seconds=20), 1001),
+            create_transaction("TX3", "ACC001", base_time + timedelta(seconds=40), 1001),
+            create_transaction("TX4", "ACC001", base_time + timedelta(minutes=15), 1001),
+        ]
+        
+        alerts = run_engine(transactions)
+        
+        assert "ALERT-TX4" not in [a.alert_id for a in alerts]
+    
+    def test_rapid_reversal_is_detected(self):
+        """Test a debit reversed within 5 minutes is flagged."""
+        base_time = datetime(2024, 1, 15, 10, 0, 0)
+        transactions = [
+            create_transaction("TX1", "ACC001", base_time, 3001, "DEBIT", "BEN123"),
+            create_transaction("TX2", "ACC001", base_time + timedelta(seconds=120), 3001, "CREDIT", "BEN123"),
+        ]
+        
+        alerts = run_engine(transactions)
+        
+        assert len(alerts) == 1
+        assert alerts[0].reason_codes == [ReasonCode.RAPID_REVERSAL]
+    
+    def test_state_is_bounded_by_rule_window(self):
+        """Test finalized transactions are evicted once the stream moves on."""
+        base_time = datetime(2024, 1, 15, 10, 0, 0)
+        engine = StreamingTriage()
+        
+        for i in range(50):
+            engine.push(create_transaction(f"TX{i}", f"ACC{i:03d}", base_time + timedelta(minutes=i), 101))
+        
+        # Only transactions within the 300s horizon are still pending
+        assert len(engine.pending) <= 6
+        assert len(engine.history) <= 6
+    
+    def test_out_of_order_input_raises(self):
+        """Test streaming mode rejects unsorted input."""
+        base_time = datetime(2024, 1, 15, 10, 0, 0)
+        engine = StreamingTriage()
+        engine.push(create_transaction("TX1", "ACC001", base_time, 100))
+        
+        with pytest.raises(ValueError):
+            engine.push(create_transaction("TX2", "ACC001", base_time - timedelta(seconds=1), 100))
+
+
+class TestRunStreamingPipeline:
+    """Tests for the streaming pipeline entrypoint."""
+    
+    def test_streaming_outputs_on_sample(self, tmp_path):
+        """Test streaming mode writes the same output files as batch mode."""
+        sample_file = Path("src/samples/sample_transactions_day2.csv")
+        
+        if not sample_file.exists():
+            pytest.skip("Sample data file not found")
+        
+        summary = run_streaming_pipeline(sample_file, tmp_path)
+        
+        assert summary['total_transactions'] == 20
+        with open(tmp_path / "aml_alerts.json") as f:
+            alerts = json.load(f)
+        with open(tmp_path / "triage_queue.csv") as f:
+            rows = list(csv.DictReader(f))
+        with open(tmp_path / "summary.json") as f:
+            summary_data = json.load(f)
+        
+        assert len(alerts) == len(rows) == summary['total_alerts'] == summary_data['total_alerts']
+        scores = [float(row['triage_score']) for row in rows]
+        assert scores == sorted(scores, reverse=True)
+    
+    def test_streaming_matches_batch_except_distant_velocity(self, tmp_path):
+        """Test streaming differs from batch only for velocity outside the burst."""
+        sample_file = Path("src/samples/sample_transactions_day2.csv")
+        
+        if not sample_file.exists():
+            pytest.skip("Sample data file not found")
+        
+        batch_alerts = pipeline.generate_alerts(io.load_transactions(sample_file))
+        stream_alerts = run_engine(io.iter_records(sample_file))
+        
+        batch = {a.alert_id: a.reason_codes for a in batch_alerts}
+        stream = {a.alert_id: a.reason_codes for a in stream_alerts}
+        
+        # TX007 is 14 minutes after ACC001's burst: flagged only by batch mode
+        assert batch.pop("ALERT-TX007") == [ReasonCode.HIGH_VELOCITY]
+        assert stream == batch
+    
+    def test_unsorted_input_with_external_sort(self, tmp_path):
+        """Test presorted=False orders the input before streaming."""
+        sample_file = Path("src/samples/sample_transactions_day2.csv")
+        
+        if not sample_file.exists():
+            pytest.skip("Sample data file not found")
+        
+        lines = sample_file.read_text().splitlines()
+        shuffled = tmp_path / "shuffled.csv"
+        shuffled.write_text("\n".join([lines[0]] + lines[:0:-1]) + "\n")
+        
+        with pytest.raises(ValueError):
+            run_streaming_pipeline(shuffled, tmp_path / "sorted_required")
+        
+        run_streaming_pipeline(sample_file, tmp_path / "expected")
+        run_streaming_pipeline(shuffled, tmp_path / "actual", presorted=False, run_size=3)
+        
+        expected = (tmp_path / "expected" / "triage_queue.csv").read_text()
+        assert (tmp_path / "actual" / "triage_queue.csv").read_text() == expected
@@ -0,0 +1,63 @@
+"""Tests for the synthetic transaction generator."""
+
+import pytest
+
+from src.day2.aml_triage import io, pipeline
+from src.day2.aml_triage.records import TxRecord
+from src.day2.aml_triage.schemas import ReasonCode
+from src.day2.aml_triage.synthetic import FIELDS, generate_transactions, write_synthetic_csv
+
+
+def reason_counts(rows):
+    records = [TxRecord.from_row(row) for row in rows]
+    counts = {}
+    for alert in pipeline.generate_alerts_from_records(records):
+        for code in alert.reason_codes:
+            counts[code] = counts.get(code, 0) + 1
+    return counts
+
+
+class TestGenerateTransactions:
+    """Tests for generated rows."""
+    
+    def test_deterministic_for_seed(self):
+        """Test the same seed gives the same rows and another seed does not."""
+        assert list(generate_transactions(500, seed=7)) == list(generate_transactions(500, seed=7))
+        assert list(generate_transactions(500, seed=7)) != list(generate_transactions(500, seed=8))
+    
+    def test_rows_valid_and_in_timestamp_order(self):
+        """Test exactly the requested rows are produced, valid and time ordered."""
+        rows = list(generate_transactions(2000, accounts=50, burst_rate=0.05, reversal_rate=0.05))
+        
+        assert len(rows) == 2000
+        assert len({row["transaction_id"] for row in rows}) == 2000
+        records = [TxRecord.from_row(row) for row in rows]
+        times = [record.timestamp_us for record in records]
+        assert times == sorted(times)
+    
+    def test_injected_patterns_trigger_rules(self):
+        """Test bursts and reversals trigger their rules; none without them."""
+        rows = list(generate_transactions(3000, accounts=5000, burst_rate=0.05, reversal_rate=0.05))
+        counts = reason_counts(rows)
+        assert counts[ReasonCode.HIGH_VELOCITY] > 0
+        assert counts[ReasonCode.RAPID_REVERSAL] > 0
+        
+        quiet = reason_counts(generate_transactions(3000, accounts=5000, burst_rate=0, reversal_rate=0))
+        assert ReasonCode.RAPID_REVERSAL not in quiet
+    
+    def test_invalid_rate_rejected(self):
+        """Test rates outside [0, 1] are rejected."""
+        with pytest.raises(ValueError, match="burst_rate"):
+            list(generate_transactions(10, burst_rate=1.5))
+
+
+class TestWriteSyntheticCsv:
+    """Tests for writing generated files."""
+    
+    def test_written_file_loads(self, tmp_path):
+        """Test the written CSV has the sample layout and loads."""
+        path = tmp_path / "nested" / "synthetic.csv"
+        assert write_synthetic_csv(path, 300, seed=1) == 300
+        
+        assert path.read_text().splitlines()[0] == ",".join(FIELDS)
+        assert len(io.load_records(path)) == 300
@@ -0,0 +1,152 @@
+"""Tests for top-k and bucketed triage queue ordering."""
+
+import csv
+import random
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+from src.day2.aml_triage import io, pipeline, streaming, triage
+from src.day2.aml_triage.schemas import Alert, ReasonCode, Transaction
+from src.day2.aml_triage.triage_queue import TopK, TriageQueueBuilder
+
+
+SAMPLE_FILE = Path("src/samples/sample_transactions_day2.csv")
+
+
+def create_decision(alert_id, reason_codes):
+    """Helper to create a triage decision."""
+    tx = Transaction(
+        transaction_id=alert_id,
+        account_id="ACC001",
+        timestamp=datetime(2024, 1, 15, 10, 0, 0),
+        amount=Decimal("5000"),
+        transaction_type="DEBIT",
+        beneficiary_id="BEN001"
+    )
+    alert = Alert(
+        alert_id=alert_id,
+        transaction=tx,
+        reason_codes=reason_codes,
+        explanation="Test alert",
+        timestamp_detected=datetime(2024, 1, 15, 10, 0, 0)
+    )
+    return triage.create_triage_decision(alert)
+
+
+def random_decisions(count, seed=7):
+    """Decisions with many score ties and shuffled alert ids."""
+    rng = random.Random(seed)
+    codes = list(ReasonCode)
+    decisions = []
+    for i in range(count):
+        reason_codes = rng.sample(codes, rng.randint(1, 3))
+        decisions.append(create_decision(f"ALERT-TX{rng.randint(0, 10 * count):05d}", reason_codes))
+    return decisions
+
+
+def full_sort(decisions):
+    return sorted(decisions, key=lambda d: (-d.triage_score, d.alert.alert_id))
+
+
+def read_rows(path):
+    with open(path, newline='') as f:
+        return list(csv.reader(f))
+
+
+class TestTopK:
+    """Tests for the bounded heap."""
+    
+    @pytest.mark.parametrize("k", [1, 5, 50, 500])
+    def test_matches_head_of_full_sort(self, k):
+        """Test top-k equals the first k of a stable full sort."""
+        decisions = random_decisions(200)
+        top = TopK(k)
+        for decision in decisions:
+            top.add(decision.triage_score, decision.alert.alert_id, decision)
+        
+        assert top.items() == full_sort(decisions)[:k]
+        assert len(top) == min(k, len(decisions))
+    
+    def test_rejects_non_positive_k(self):
+        """Test k must be at least 1."""
+        with pytest.raises(ValueError, match="k must be positive"):
+            TopK(0)
+
+
+class TestTriageQueueBuilder:
+    """Tests for bucketed ordering."""
+    
+    def test_ordered_matches_full_sort(self):
+        """Test score buckets reproduce the full sort."""
+        decisions = random_decisions(300)
+        builder = TriageQueueBuilder()
+        for decision in decisions:
+            builder.add(decision)
+        
+        assert builder.ordered() == full_sort(decisions)
+    
+    def test_by_queue_splits_in_order(self):
+        """Test each queue holds its decisions in triage order."""
+        decisions = random_decisions(300)
+        builder = TriageQueueBuilder()
+        for decision in decisions:
+            builder.add(decision)
+        
+        buckets = builder.by_queue()
+        assert list(buckets) == ["HIGH_RISK", "MEDIUM_RISK", "LOW_RISK"]
+        for queue, bucket in buckets.items():
+            assert bucket == [d for d in full_sort(decisions) if d.assigned_queue == queue]
+
+
+class TestQueueOutputs:
+    """Tests for top-k and per-queue files from the pipelines."""
+    
+    def test_write_triage_queue_csv_top_k(self, tmp_path):
+        """Test top_k writes the head of the full queue."""
+        decisions = random_decisions(100)
+        io.write_triage_queue_csv(decisions, tmp_path / "full.csv")
+        io.write_triage_queue_csv(decisions, tmp_path / "top.csv", top_k=10)
+        
+        assert read_rows(tmp_path / "top.csv") == read_rows(tmp_path / "full.csv")[:11]
+    
+    def test_empty_buckets_have_header(self, tmp_path):
+        """Test all three queue files are written even when a queue is empty."""
+        io.write_triage_queue_buckets([create_decision("A1", [ReasonCode.ROUND_AMOUNT])], tmp_path)
+        
+        assert read_rows(tmp_path / "triage_queue_high_risk.csv") == [io.QUEUE_FIELDS]
+        assert len(read_rows(tmp_path / "triage_queue_low_risk.csv")) == 2
+    
+    def test_write_triage_queues_orders_once(self, tmp_path, monkeypatch):
+        """Test the queue file and bucket files come from a single ordering."""
+        decisions = random_decisions(100)
+        io.write_triage_queue_csv(decisions, tmp_path / "full.csv")
+        io.write_triage_queue_buckets(decisions, tmp_path / "separate")
+        orderings = []
+        ordered = TriageQueueBuilder.ordered
+        monkeypatch.setattr(TriageQueueBuilder, "ordered", lambda self: orderings.append(self) or ordered(self))
+        
+        io.write_triage_queues(decisions, tmp_path / "once", top_k=10, queue_buckets=True)
+        
+        assert len(orderings) == 1
+        assert read_rows(tmp_path / "once" / "triage_queue.csv") == read_rows(tmp_path / "full.csv")[:11]
+        for filename in io.QUEUE_BUCKET_FILES.values():
+            assert read_rows(tmp_path / "once" / filename) == read_rows(tmp_path / "separate" / filename)
+    
+    @pytest.mark.parametrize("run", [pipeline.run_pipeline, streaming.run_streaming_pipeline])
+    def test_pipeline_top_k_and_buckets(self, tmp_path, run):
+        """Test top-k queue and bucket files agree with the full queue."""
+        if not SAMPLE_FILE.exists():
+            pytest.skip("Sample data file not found")
+        
+        kwargs = {"presorted": False} if run is streaming.run_streaming_pipeline else {}
+        run(SAMPLE_FILE, tmp_path / "full", **kwargs)
+        run(SAMPLE_FILE, tmp_path / "top", top_k=3, queue_buckets=True, **kwargs)
+        
+        full = read_rows(tmp_path / "full" / "triage_queue.csv")
+        assert read_rows(tmp_path / "top" / "triage_queue.csv") == full[:4]
+        for queue, filename in io.QUEUE_BUCKET_FILES.items():
+            expected = [full[0]] + [row for row in full[1:] if row[-1] == queue]
+            assert read_rows(tmp_path / "top" / filename) == expected